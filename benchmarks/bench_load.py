@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""End-to-end load test: HeliumCoordinator against the local mock server.
+
+example usage:
+  python3 benchmarks/bench_load.py --hotspots 1000 --cycles 3
+  python3 benchmarks/bench_load.py --hotspots 5000 --concurrency 32 --rps 500 --latency-ms 200 --jitter-ms 80
+  python3 benchmarks/bench_load.py --hotspots 2000 --throttle-rate 0.02 --error-rate 0.01 --page-kb 512 --streaming
+  python3 benchmarks/bench_load.py --url http://127.0.0.1:8099 --hotspots 500   # external mock_server.py
+
+Needs Home Assistant installed (`pip install homeassistant`), like the integration itself.
+The mock server runs in a child process so it does not compete for the coordinator's event loop.
+Every cycle makes all hotspots due and runs one coordinator refresh; reported per cycle:
+wall time, refreshes/s and failures; at the end, peak RSS (and peak Python heap with --tracemalloc).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+import mock_server
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+
+def _serve(config: mock_server.ServerConfig, queue: multiprocessing.Queue, stop) -> None:
+    async def run():
+        server = mock_server.MockHeliumServer(config)
+        queue.put(await server.start())
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+        await server.stop()
+        queue.put(dict(config.stats))
+
+    asyncio.run(run())
+
+
+async def _create_hass(config_dir: str):
+    from homeassistant.core import HomeAssistant
+
+    try:
+        return HomeAssistant(config_dir)
+    except TypeError:  # older cores take the config dir as an attribute
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+        return hass
+
+
+async def run_load(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    from custom_components.helium_hotspot.client import async_get_client, async_release_client
+    from custom_components.helium_hotspot.const import (
+        CONF_MAX_CONCURRENT_REQUESTS,
+        CONF_REQUESTS_PER_SECOND,
+        CONF_STREAMING_FETCH,
+    )
+    from custom_components.helium_hotspot.coordinator import HeliumCoordinator
+    from custom_components.helium_hotspot.parse_pool import (
+        ParsePool,
+        async_get_parse_executor,
+        async_release_parse_executor,
+    )
+
+    entry_id = "bench_load"
+    hotspots = [str(args.first_id + i) for i in range(args.hotspots)]
+    options = {
+        CONF_MAX_CONCURRENT_REQUESTS: args.concurrency,
+        CONF_REQUESTS_PER_SECOND: args.rps,
+        CONF_STREAMING_FETCH: args.streaming,
+    }
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _create_hass(config_dir)
+        client = await async_get_client(hass, entry_id)
+        executor = await async_get_parse_executor(hass, entry_id, args.parser_mode)
+        coordinator = HeliumCoordinator(
+            hass, client, ParsePool(hass, executor), hotspots, args.interval_minutes,
+            options=options, url_template=base_url.rstrip("/") + mock_server.PATH_PREFIX + "{hotspot}",
+        )
+        cycles: List[Dict[str, float]] = []
+        try:
+            for n in range(args.cycles):
+                coordinator.mark_all_due()
+                t0 = time.perf_counter()
+                await coordinator.async_refresh()
+                wall = time.perf_counter() - t0
+                fleet = coordinator.fleet_metrics()
+                cycles.append({
+                    "cycle": n + 1,
+                    "wall_s": round(wall, 3),
+                    "refreshes_per_s": round(args.hotspots / wall, 1) if wall else None,
+                    "failed": fleet.get("last_cycle_failed"),
+                    "p50_ms": fleet.get("refresh_p50_ms"),
+                    "p95_ms": fleet.get("refresh_p95_ms"),
+                })
+                print("cycle {cycle}: {wall_s:.2f}s, {refreshes_per_s}/s, {failed} failed, "
+                      "p50 {p50_ms} ms, p95 {p95_ms} ms".format(**cycles[-1]), flush=True)
+        finally:
+            await async_release_client(hass, entry_id)
+            await async_release_parse_executor(hass, entry_id)
+            await hass.async_stop(force=True)
+    return {"cycles": cycles, "hotspots": args.hotspots}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load-test HeliumCoordinator against a local mock server.")
+    ap.add_argument("--hotspots", type=int, default=1000, help="Number of synthetic hotspot ids")
+    ap.add_argument("--first-id", type=int, default=10000, help="First synthetic id")
+    ap.add_argument("--cycles", type=int, default=3, help="Full fleet refresh cycles")
+    ap.add_argument("--concurrency", type=int, default=16, help="max_concurrent_requests option")
+    ap.add_argument("--rps", type=float, default=200.0, help="requests_per_second option")
+    ap.add_argument("--streaming", action="store_true", help="streaming_fetch option")
+    ap.add_argument("--parser-mode", choices=("thread", "process"), default="thread", help="parser_mode option")
+    ap.add_argument("--interval-minutes", type=int, default=60, help="update interval (only affects scheduling)")
+    ap.add_argument("--url", help="Use an already running mock_server.py instead of starting one")
+    ap.add_argument("--tracemalloc", action="store_true", help="Also report the peak Python heap (slower)")
+    ap.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    mock_server.add_server_arguments(ap)
+    args = ap.parse_args()
+
+    proc = stop = queue = None
+    base_url = args.url
+    if base_url is None:
+        ctx = multiprocessing.get_context("spawn")
+        queue, stop = ctx.Queue(), ctx.Event()
+        proc = ctx.Process(target=_serve, args=(mock_server.config_from_args(args), queue, stop), daemon=True)
+        proc.start()
+        base_url = f"http://127.0.0.1:{queue.get(timeout=30)}"
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    try:
+        summary = asyncio.run(run_load(args, base_url))
+    finally:
+        if proc is not None:
+            stop.set()
+            server_stats = queue.get(timeout=30)
+            proc.join(timeout=10)
+    summary["peak_rss_mib"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # KiB on Linux
+    if args.tracemalloc:
+        summary["peak_heap_mib"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        tracemalloc.stop()
+    if proc is not None:
+        summary["server_responses"] = {str(k): v for k, v in sorted(server_stats.items())}
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    walls = [c["wall_s"] for c in summary["cycles"]]
+    print(f"\n{args.hotspots} hotspots, {len(walls)} cycle(s): best {min(walls):.2f}s "
+          f"({args.hotspots / min(walls):.1f} refreshes/s), worst {max(walls):.2f}s")
+    print(f"peak RSS {summary['peak_rss_mib']} MiB"
+          + (f", peak Python heap {summary['peak_heap_mib']} MiB" if args.tracemalloc else ""))
+    if "server_responses" in summary:
+        print("server responses: " + ", ".join(f"{k}={v}" for k, v in summary["server_responses"].items()))
+
+
+if __name__ == "__main__":
+    main()
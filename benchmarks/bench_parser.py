@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark parser.py against recorded, scaled and pathological hotspot pages.
+
+example usage:
+  python3 benchmarks/bench_parser.py
+  python3 benchmarks/bench_parser.py --save-baseline benchmarks/baseline.json
+  python3 benchmarks/bench_parser.py --baseline benchmarks/baseline.json --tolerance 1.5
+
+Recorded pages are any *.html files in benchmarks/fixtures (save one with
+`curl -A "Mozilla/5.0" https://world.helium.com/en/network/mobile/hotspot/9982`).
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import pages
+
+ROOT = Path(__file__).resolve().parent
+PARSER_PATH = ROOT.parent / "custom_components" / "helium_hotspot" / "parser.py"
+
+
+def load_parser():
+    # parser.py has no Home Assistant imports; load it without the integration package
+    spec = importlib.util.spec_from_file_location("helium_hotspot_parser", PARSER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def collect_pages(scales_mb: List[float], adversarial: int) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for path in sorted((ROOT / "fixtures").glob("*.html")):
+        out[f"fixture:{path.stem}"] = path.read_text(encoding="utf-8", errors="ignore")
+    for mb in scales_mb:
+        out[f"synthetic:{mb:g}MB"] = pages.hotspot_page("9982", pad_bytes=int(mb * 1024 * 1024))
+    if adversarial:
+        out["adversarial:tokens_display"] = pages.tokens_backtrack_page(8 * adversarial)
+        out["adversarial:location_global"] = pages.location_scan_page(400 * adversarial)
+    return out
+
+
+def field_benchmarks(p) -> List[Tuple[str, Callable[[str, object], object]]]:
+    """(field, fn(raw, corpora)); extractors get a pre-built corpus so build_corpus is timed on its own."""
+    return [
+        ("anchored", lambda raw, c: p.extract_anchored_fields(raw)),
+        ("flight", lambda raw, c: p.extract_flight_fields(raw)),
+        ("build_corpus", lambda raw, c: list(p.build_corpus(raw))),  # force every variant
+        ("tokens_hnt", lambda raw, c: p.extract_tokens_hnt(c)),
+        ("data_amounts", lambda raw, c: p.extract_data_amounts(c)),
+        ("avg_daily", lambda raw, c: p.extract_avg_daily(c)),
+        ("hotspot_name", lambda raw, c: p.extract_hotspot_name(c)),
+        ("hotspot_location", lambda raw, c: p.extract_hotspot_location(c)),
+        ("parse_hotspot_html", lambda raw, c: p.parse_hotspot_html(raw)),
+    ]
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def peak_kib(fn: Callable[[], object]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+
+def run(repeat: int, scales_mb: List[float], adversarial: int = 1) -> Dict[str, dict]:
+    p = load_parser()
+    results: Dict[str, dict] = {}
+    for name, raw in collect_pages(scales_mb, adversarial).items():
+        corpora = p.build_corpus(raw)
+        list(corpora)  # materialize once so extractor timings exclude variant building
+        entry = {"bytes": len(raw.encode("utf-8")), "ms": {}, "peak_kib": None}
+        for field, fn in field_benchmarks(p):
+            entry["ms"][field] = round(time_call(lambda: fn(raw, corpora), repeat), 3)
+        entry["peak_kib"] = round(peak_kib(lambda: p.parse_hotspot_html(raw)), 1)
+        results[name] = entry
+    return results
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    fields = next(iter(results.values()))["ms"].keys() if results else []
+    header = ["page", "KiB"] + list(fields) + ["peak KiB"]
+    print("\t".join(header))
+    for name, entry in results.items():
+        row = [name, f"{entry['bytes'] / 1024:.0f}"]
+        row += [f"{entry['ms'][f]:.3f}" for f in fields]
+        row.append(f"{entry['peak_kib']:.0f}")
+        print("\t".join(row))
+    print("(times are median ms per call)")
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float, floor_ms: float) -> List[str]:
+    """Return regressions: timings or peak memory more than `tolerance` x the baseline."""
+    problems = []
+    for name, entry in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for field, ms in entry["ms"].items():
+            base_ms = base.get("ms", {}).get(field)
+            if base_ms is None or max(ms, base_ms) < floor_ms:
+                continue
+            if ms > base_ms * tolerance:
+                problems.append(f"{name} {field}: {ms:.3f} ms vs baseline {base_ms:.3f} ms")
+        base_peak = base.get("peak_kib")
+        if base_peak and entry["peak_kib"] > base_peak * tolerance:
+            problems.append(f"{name} peak: {entry['peak_kib']:.0f} KiB vs baseline {base_peak:.0f} KiB")
+    return problems
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the Helium hotspot page parser.")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed runs per field (median is reported)")
+    ap.add_argument("--scale-mb", type=float, action="append", help="Synthetic page size in MB (repeatable)")
+    ap.add_argument("--adversarial", type=int, default=1, help="Pathological page scale (0 to skip)")
+    ap.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+    ap.add_argument("--save-baseline", metavar="FILE", help="Write results to FILE")
+    ap.add_argument("--baseline", metavar="FILE", help="Fail if results regress past FILE")
+    ap.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor vs baseline")
+    ap.add_argument("--floor-ms", type=float, default=0.5, help="Ignore timings below this in comparisons")
+    args = ap.parse_args()
+
+    results = run(args.repeat, args.scale_mb or [1.0, 4.0], args.adversarial)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        problems = compare(results, baseline, args.tolerance, args.floor_ms)
+        for line in problems:
+            print("REGRESSION " + line, file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
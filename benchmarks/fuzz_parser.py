@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Fuzz parser.py for worst-case parse time and check it stays linear and within budget.
+
+example usage:
+  python3 benchmarks/fuzz_parser.py                        # 200 families x 3 sizes
+  python3 benchmarks/fuzz_parser.py --families 1000 --sizes-kb 64 256 1024 --seed 3
+  python3 benchmarks/fuzz_parser.py --save-worst /tmp/worst  # keep the slowest page of each size
+
+A "family" is a random mix of markup fragments (mostly broken versions of what the
+extractors look for: unclosed svg children, lineItems without `]`, divs that never
+close, escaped quotes, long whitespace runs) repeated up to each size, or a mutated
+realistic page. Every page is parsed once; the run fails (exit 1) if
+  * any extractor ran longer than its budget plus --slack-ms, or
+  * a family got more than --max-growth times slower per byte from the smallest to the largest size.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pages
+from bench_parser import load_parser
+
+FRAGMENTS = [
+    '"Tokens Earned"', '"children":[["$","svg",', '"children": [ [ "$" , "svg"', '{"viewBox":"0 0 24 24"}',
+    ']', '],"12.5"]', ',', '"x",', ' ' * 64, '\n', '\\n', '\\"', '&quot;', '&amp;', '\\\\',
+    '"lineItems":[', '{"label":"Carrier Offload","value":"', '{"label":"Helium Mobile",', '"value":"3.5 MB"}',
+    '{"label":"Proof Of Coverage","value":', '"label":"Data Transfer"', '1.5', '"', '{', '}',
+    '<div class="', 'font-semibold text-3xl', '">', '<div>', '</div>', '<span>', '<div class="x">',
+    'Houston, Texas', 'Lorem ipsum dolor ', ', ', 'Québec ', 'ÀÉÎ ', '<meta property="og:description" content="',
+    'Avg Daily Stats | ', '1.2 GB | ', '4 users', 'self.__next_f.push([1,"', '"])', '1:', '2:T1a,',
+]
+
+
+def family_page(rnd: random.Random, size: int) -> Tuple[str, str]:
+    if rnd.random() < 0.2:
+        return "mutated", mutate(rnd, pages.hotspot_page(str(rnd.randint(1, 99999)), size), size)
+    unit = "".join(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(2, 12)))
+    return "mix", (unit * (size // len(unit) + 1))[:size]
+
+
+def mutate(rnd: random.Random, page: str, size: int) -> str:
+    chars = list(page[:size])
+    for _ in range(rnd.randint(1, 50)):
+        op = rnd.random()
+        i = rnd.randrange(len(chars))
+        if op < 0.4:
+            del chars[i:i + rnd.randint(1, 200)]
+        elif op < 0.7:
+            chars[i:i] = list(rnd.choice(FRAGMENTS) * rnd.randint(1, 100))
+        else:
+            chars[i] = rnd.choice('"[]{}<>\\,')
+    return "".join(chars)[:size]
+
+
+def run(families: int, sizes_kb: List[int], seed: int, budget_ms: float) -> Dict[str, object]:
+    p = load_parser()
+    sizes = sorted(k * 1024 for k in sizes_kb)
+    worst: Dict[int, dict] = {}
+    growth: List[Tuple[float, int, str]] = []
+    overruns: List[dict] = []
+    for fam in range(families):
+        per_byte = []
+        for size in sizes:
+            # same seed for every size: the same family, just longer
+            kind, raw = family_page(random.Random(f"{seed}/{fam}"), size)
+            stats: dict = {}
+            t0 = time.perf_counter()
+            p.parse_hotspot_html(raw, stats, budget_ms)
+            ms = (time.perf_counter() - t0) * 1000
+            per_byte.append(ms / max(1, len(raw)))
+            for name, spent in stats["parse_ms"].items():
+                if spent > budget_ms:
+                    overruns.append({"family": fam, "size": size, "extractor": name, "ms": spent})
+            if size not in worst or ms > worst[size]["ms"]:
+                worst[size] = {"ms": round(ms, 2), "family": fam, "kind": kind, "page": raw,
+                               "abandoned": stats["abandoned_fields"]}
+        if per_byte[0] > 0:
+            growth.append((per_byte[-1] / per_byte[0], fam, kind))
+    growth.sort(reverse=True)
+    return {"worst": worst, "growth": growth[:5], "overruns": overruns}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fuzz the hotspot parser for worst-case parse time.")
+    ap.add_argument("--families", type=int, default=200, help="Random page families")
+    ap.add_argument("--sizes-kb", type=int, nargs="+", default=[32, 128, 512], help="Page sizes per family")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--budget-ms", type=float, help="Per-extractor budget (default: parser.FIELD_BUDGET_MS)")
+    ap.add_argument("--slack-ms", type=float, default=25.0, help="Allowed overrun of the budget")
+    ap.add_argument("--max-growth", type=float, default=4.0,
+                    help="Allowed per-byte slowdown from the smallest to the largest size")
+    ap.add_argument("--save-worst", metavar="DIR", help="Write the slowest page of each size to DIR")
+    ap.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = ap.parse_args()
+
+    budget_ms = args.budget_ms if args.budget_ms is not None else load_parser().FIELD_BUDGET_MS
+    result = run(args.families, args.sizes_kb, args.seed, budget_ms)
+    overruns = [o for o in result["overruns"] if o["ms"] > budget_ms + args.slack_ms]
+    too_slow = [g for g in result["growth"] if g[0] > args.max_growth]
+
+    if args.save_worst:
+        out = Path(args.save_worst)
+        out.mkdir(parents=True, exist_ok=True)
+        for size, w in result["worst"].items():
+            (out / f"worst_{size // 1024}kb_family{w['family']}.html").write_text(w["page"], encoding="utf-8")
+
+    summary = {
+        "budget_ms": budget_ms,
+        "worst": {f"{size // 1024}KB": {k: v for k, v in w.items() if k != "page"}
+                  for size, w in sorted(result["worst"].items())},
+        "max_growth": [{"ratio": round(r, 2), "family": fam, "kind": kind} for r, fam, kind in result["growth"]],
+        "budget_overruns": overruns,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{'size':>8} {'worst ms':>9}  family  kind     abandoned")
+        for size, w in summary["worst"].items():
+            print(f"{size:>8} {w['ms']:>9.2f}  {w['family']:>6}  {w['kind']:<8} {w['abandoned'] or '-'}")
+        print("largest per-byte growth: " + ", ".join(
+            f"{g['ratio']}x (family {g['family']})" for g in summary["max_growth"]))
+    for o in overruns:
+        print(f"BUDGET {o['extractor']} took {o['ms']} ms on family {o['family']} ({o['size']} bytes)", file=sys.stderr)
+    for ratio, fam, kind in too_slow:
+        print(f"NONLINEAR family {fam} ({kind}) is {ratio:.1f}x slower per byte at the largest size", file=sys.stderr)
+    if overruns or too_slow:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
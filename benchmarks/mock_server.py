@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Local stand-in for world.helium.com serving synthetic hotspot pages.
+
+example usage:
+  python3 benchmarks/mock_server.py --port 8099 --latency-ms 150 --jitter-ms 50 --error-rate 0.01
+  curl -i http://127.0.0.1:8099/en/network/mobile/hotspot/10042
+
+Any hotspot id is served (values are deterministic per id, see pages.py). Pages carry an
+ETag and answer If-None-Match with 304; with --change-every, each hotspot's values move on
+at its own phase so conditional requests see a realistic mix of 200 and 304.
+Plain asyncio HTTP/1.1 with keep-alive; no third-party dependencies.
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import pages
+
+PATH_PREFIX = "/en/network/mobile/hotspot/"
+WRITE_CHUNK = 16 * 1024
+
+
+@dataclass
+class ServerConfig:
+    latency_ms: float = 0.0  # time to first byte
+    jitter_ms: float = 0.0  # stddev around latency_ms
+    error_rate: float = 0.0  # fraction answered with 500
+    throttle_rate: float = 0.0  # fraction answered with 429
+    retry_after: Optional[float] = 1.0  # Retry-After on 429s; None omits the header
+    page_kb: int = 0  # padding added to every page
+    change_every: float = 0.0  # seconds between value changes per hotspot; 0 = never
+    kbps: float = 0.0  # per-connection body bandwidth; 0 = unlimited
+    seed: Optional[int] = None
+    stats: Counter = field(default_factory=Counter)
+
+
+@lru_cache(maxsize=4096)
+def _render(hotspot: str, version: int, pad_bytes: int) -> Tuple[bytes, str]:
+    values = pages.hotspot_values(hotspot)
+    if version:
+        rnd = random.Random(f"{hotspot}/{version}")
+        values["proof_of_coverage_30d"] = round(values["proof_of_coverage_30d"] + rnd.uniform(0, 1), 3)
+        values["tokens_earned_30d_hnt"] = round(values["proof_of_coverage_30d"] + values["data_transfer_30d"], 3)
+        values["avg_daily_users"] = str(rnd.randint(1, 90))
+    body = pages.hotspot_page(hotspot, pad_bytes, values).encode("utf-8")
+    return body, '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+class MockHeliumServer:
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self._rnd = random.Random(config.seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _version(self, hotspot: str) -> int:
+        if not self.config.change_every:
+            return 0
+        # every hotspot changes on its own phase
+        phase = (zlib.crc32(hotspot.encode()) % 1000) / 1000 * self.config.change_every
+        return int((time.time() + phase) // self.config.change_every)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode("latin-1").split()
+                path = parts[1] if len(parts) > 1 else "/"
+                await self._respond(writer, path, headers)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, path: str, headers: Dict[str, str]) -> None:
+        cfg = self.config
+        delay = max(0.0, self._rnd.gauss(cfg.latency_ms, cfg.jitter_ms)) / 1000 if cfg.latency_ms or cfg.jitter_ms else 0
+        if delay:
+            await asyncio.sleep(delay)
+
+        hotspot = path.split("?", 1)[0][len(PATH_PREFIX):] if path.startswith(PATH_PREFIX) else ""
+        roll = self._rnd.random()
+        if not hotspot or "/" in hotspot:
+            status, extra, body = 404, {}, b"not found"
+        elif roll < cfg.throttle_rate:
+            status, body = 429, b"slow down"
+            extra = {"Retry-After": f"{cfg.retry_after:g}"} if cfg.retry_after is not None else {}
+        elif roll < cfg.throttle_rate + cfg.error_rate:
+            status, extra, body = 500, {}, b"internal error"
+        else:
+            body, etag = _render(hotspot, self._version(hotspot), cfg.page_kb * 1024)
+            if headers.get("if-none-match") == etag:
+                status, extra, body = 304, {"ETag": etag}, b""
+            else:
+                status, extra = 200, {"ETag": etag, "Cache-Control": "private, no-cache"}
+        cfg.stats[status] += 1
+
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+                "Content-Type: text/html; charset=utf-8",
+                f"Content-Length: {len(body)}"]
+        head += [f"{k}: {v}" for k, v in extra.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        for i in range(0, len(body), WRITE_CHUNK):
+            writer.write(body[i:i + WRITE_CHUNK])
+            await writer.drain()
+            if cfg.kbps:
+                await asyncio.sleep(WRITE_CHUNK / 1024 / cfg.kbps)
+        await writer.drain()
+
+
+_REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+def add_server_arguments(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Mean time to first byte")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="Stddev of the time to first byte")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    ap.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429 (negative omits it)")
+    ap.add_argument("--page-kb", type=int, default=0, help="Padding added to every page")
+    ap.add_argument("--change-every", type=float, default=0.0, help="Seconds between value changes per hotspot")
+    ap.add_argument("--kbps", type=float, default=0.0, help="Per-connection body bandwidth (0 = unlimited)")
+    ap.add_argument("--seed", type=int, help="Seed for latency and error draws")
+
+
+def config_from_args(args: argparse.Namespace) -> ServerConfig:
+    return ServerConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after if args.retry_after >= 0 else None,
+        page_kb=args.page_kb,
+        change_every=args.change_every,
+        kbps=args.kbps,
+        seed=args.seed,
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = MockHeliumServer(config_from_args(args))
+    port = await server.start(args.host, args.port)
+    print(f"serving http://{args.host}:{port}{PATH_PREFIX}<id>", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        print("responses: " + ", ".join(f"{k}={v}" for k, v in sorted(server.config.stats.items())))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve synthetic world.helium.com hotspot pages.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8099)
+    add_server_arguments(ap)
+    try:
+        asyncio.run(_main(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
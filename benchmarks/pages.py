@@ -0,0 +1,120 @@
+"""Synthetic world.helium.com hotspot pages for benchmarks and load tests.
+
+Pages mimic the live markup: a server-rendered title/location block, the
+og:description meta and the React tree streamed as `self.__next_f.push` chunks.
+"""
+import json
+import random
+from typing import Optional
+
+ADJECTIVES = ["Raspy", "Tame", "Brisk", "Quiet", "Jolly", "Sunny", "Odd", "Fuzzy"]
+TREES = ["Cedar", "Maple", "Birch", "Willow", "Pine", "Aspen", "Oak", "Elm"]
+ANIMALS = ["Parakeet", "Otter", "Badger", "Falcon", "Lynx", "Heron", "Moose", "Gecko"]
+PLACES = [
+    ("Houston", "Texas"), ("Austin", "Texas"), ("Miami", "Florida"),
+    ("Denver", "Colorado"), ("Seattle", "Washington"), ("Québec", "Québec"),
+]
+
+CHUNK_SIZE = 2048
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _push(payload: str) -> str:
+    # Next escapes "<" so a chunk can never close its own <script>
+    return "<script>self.__next_f.push(%s)</script>" % _dumps([1, payload]).replace("<", "\\u003c")
+
+
+def hotspot_values(hotspot: str) -> dict:
+    """Deterministic per-hotspot values so pages and expectations line up."""
+    rnd = random.Random(hotspot)
+    city, state = rnd.choice(PLACES)
+    poc = round(rnd.uniform(0, 40), 3)
+    dt = round(rnd.uniform(0, 5), 3)
+    return {
+        "hotspot_name": f"{rnd.choice(ADJECTIVES)} {rnd.choice(TREES)} {rnd.choice(ANIMALS)}",
+        "hotspot_location": f"{city}, {state}, United States",
+        "proof_of_coverage_30d": poc,
+        "data_transfer_30d": dt,
+        "tokens_earned_30d_hnt": round(poc + dt, 3),
+        "carrier_offload": f"{rnd.uniform(1, 900):.2f} MB",
+        "helium_mobile": f"{rnd.uniform(1, 900):.2f} kB",
+        "avg_daily_data": f"{rnd.uniform(0.1, 9):.2f} GB",
+        "avg_daily_users": str(rnd.randint(1, 90)),
+    }
+
+
+def hotspot_page(hotspot: str = "9982", pad_bytes: int = 0, values: Optional[dict] = None) -> str:
+    """A realistic page; `pad_bytes` adds filler markup and flight rows to reach several MB."""
+    v = values or hotspot_values(hotspot)
+    avg_num, avg_unit = v["avg_daily_data"].split()
+    tree = ["$", "div", None, {"className": "flex flex-col gap-4", "children": [
+        ["$", "div", None, {"className": "font-semibold text-3xl text-white", "children": v["hotspot_name"]}],
+        ["$", "div", None, {"className": "text-sm text-gray-400", "children": v["hotspot_location"]}],
+        ["$", "div", None, {"className": "card", "children": [
+            ["$", "h3", None, {"children": "Tokens Earned"}],
+            ["$", "span", None, {"children": [["$", "svg", None, {"viewBox": "0 0 24 24"}],
+                                              str(v["tokens_earned_30d_hnt"])]}],
+            ["$", "$L7", None, {"lineItems": [
+                {"label": "Proof Of Coverage", "value": v["proof_of_coverage_30d"]},
+                {"label": "Data Transfer", "value": v["data_transfer_30d"]},
+            ]}],
+        ]}],
+        ["$", "div", None, {"className": "card", "children": [
+            ["$", "h3", None, {"children": "Data Transferred"}],
+            ["$", "$L8", None, {"lineItems": [
+                {"label": "Carrier Offload", "value": v["carrier_offload"]},
+                {"label": "Helium Mobile", "value": v["helium_mobile"]},
+            ]}],
+        ]}],
+    ]}]
+
+    rows = [
+        '1:HL["/_next/static/css/app.css","style"]',
+        '2:I[5847,["static/chunks/app.js"],"default"]',
+        "3:" + _dumps(["$", "meta", "og", {"property": "og:description", "content":
+                      f"Avg Daily Stats | {avg_num} {avg_unit} | {v['avg_daily_users']} users"}]),
+    ]
+    filler_html = []
+    if pad_bytes:
+        # half of the padding goes into the flight stream, half into plain markup
+        row = _dumps(["$", "div", None, {"className": "grid grid-cols-2", "children": [
+            ["$", "span", None, {"children": "Coverage hex"}], ["$", "span", None, {"children": "8c2ab2d9a1c3fff"}],
+        ]}])
+        i = 16
+        while sum(len(r) for r in rows) < pad_bytes // 2:
+            rows.append("%x:%s" % (i, row))
+            i += 1
+        block = '<div class="grid grid-cols-2"><span>Coverage hex</span><span>8c2ab2d9a1c3fff</span></div>'
+        filler_html = [block] * max(1, (pad_bytes // 2) // len(block))
+    rows.append("4:" + _dumps(tree))
+    stream = "\n".join(rows) + "\n"
+    chunks = "".join(_push(stream[i:i + CHUNK_SIZE]) for i in range(0, len(stream), CHUNK_SIZE))
+
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charSet=\"utf-8\"/>"
+        f"<title>Hotspot {hotspot} | Helium World</title>"
+        f"<meta property=\"og:description\" content=\"Avg Daily Stats | {avg_num} {avg_unit} | "
+        f"{v['avg_daily_users']} users\"/></head><body><main>"
+        f"<div class=\"font-semibold text-3xl text-white\">{v['hotspot_name']}</div>"
+        f"<div class=\"text-sm text-gray-400\">{v['hotspot_location']}</div>"
+        + "".join(filler_html)
+        + "</main><script>self.__next_f.push([0])</script>" + chunks + "</body></html>"
+    )
+
+
+def tokens_backtrack_page(blocks: int = 8) -> str:
+    """No flight payload; "Tokens Earned" cards whose svg children never close.
+
+    Cost grows roughly quadratically with `blocks`; 8 already takes ~0.5 s on the regex path.
+    """
+    block = '"Tokens Earned"' + ('"children":[["$","svg",' + '"x",' * 40) * 60
+    return "<html><body>" + block * blocks + "</body></html>"
+
+
+def location_scan_page(divs: int = 400) -> str:
+    """No flight payload; many classed divs holding long comma-separated text that never closes."""
+    text = "Lorem ipsum dolor " * 20 + ", " + "sit amet consectetur " * 20
+    return "<html><body>" + ('<div class="x">' + text + "<span>") * divs + "</body></html>"
@@ -4,33 +4,90 @@ from typing import Final
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, CONF_HOTSPOTS, CONF_UPDATE_INTERVAL_MINUTES
-from .coordinator import HeliumCoordinator
+from .client import async_get_client, async_release_client
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    CONF_HOTSPOTS,
+    CONF_UPDATE_INTERVAL_MINUTES,
+    CONF_PARSER_MODE,
+    DEFAULT_PARSER_MODE,
+)
+from .coordinator import HeliumCoordinator, history_path, storage_key
+from .fetcher import async_get_fetch_hub, async_release_fetch_hub
+from .history import HotspotHistory
+from .parse_pool import ParsePool, async_get_parse_executor, async_release_parse_executor
+from .services import async_setup_services
 
 PLATFORMS: Final = [Platform.SENSOR]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     hotspots_raw: str = entry.data.get(CONF_HOTSPOTS, "")
     hotspots = [h.strip() for h in hotspots_raw.split(",") if h.strip()]
     update_minutes = entry.options.get(CONF_UPDATE_INTERVAL_MINUTES) if entry.options else None
 
-    coordinator = HeliumCoordinator(hass, hotspots, update_minutes)
-    await coordinator.async_config_entry_first_refresh()
+    client = await async_get_client(hass, entry.entry_id)
+    executor = await async_get_parse_executor(
+        hass, entry.entry_id, entry.options.get(CONF_PARSER_MODE, DEFAULT_PARSER_MODE)
+    )
+    coordinator = HeliumCoordinator(
+        hass, client, ParsePool(hass, executor), hotspots, update_minutes,
+        options=entry.options, entry_id=entry.entry_id,
+        fetch_hub=async_get_fetch_hub(hass, entry.entry_id),
+    )
+    try:
+        restored = await coordinator.async_restore()
+        if not restored:
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await _async_release_shared(hass, entry.entry_id)
+        raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await coordinator.async_close_history()
+        await _async_release_shared(hass, entry.entry_id)
+        raise
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if restored:
+        # entities came up with cached values; the network refresh must not hold up startup
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} refresh {entry.entry_id}"
+        )
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    coord: HeliumCoordinator = hass.data[DOMAIN][entry.entry_id]
-    await coord.async_close()
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        coordinator: HeliumCoordinator | None = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.async_close_history()  # async_remove_entry deletes the files next
+        await _async_release_shared(hass, entry.entry_id)
     return unload_ok
 
+async def _async_release_shared(hass: HomeAssistant, entry_id: str) -> None:
+    """Drop this entry's hold on the domain-wide client, parser pool and fetch hub."""
+    await async_release_client(hass, entry_id)
+    await async_release_parse_executor(hass, entry_id)
+    async_release_fetch_hub(hass, entry_id)
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    await Store(hass, STORAGE_VERSION, storage_key(entry.entry_id)).async_remove()
+    # <config>/helium_hotspot/history/<entry_id>, and the two directories above it once empty
+    await hass.async_add_executor_job(HotspotHistory(history_path(hass, entry.entry_id), 0).remove_files, 2)
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+HOURS = 24
+_HOUR = timedelta(hours=1)
+_DAY = timedelta(days=1)
+_DECAY = 0.97  # per observed change (per day for the fleet), so old epochs fade after a few weeks
+MIN_CHANGES = 3.0  # decayed change count before a histogram is trusted
+HOT_MASS = 0.8  # hot hours = fewest hours holding this share of observed changes
+_MAX_SPAN = timedelta(hours=12)  # a change seen after a longer gap says little about its hour
+
+
+def _informative(since: datetime, until: datetime) -> bool:
+    return timedelta(0) < until - since <= _MAX_SPAN
+
+
+def values_changed(old: Optional[Mapping[str, Any]], new: Optional[Mapping[str, Any]]) -> bool:
+    if old is None or new is None or old is new:
+        return False
+    # only fields parsed both times: a field appears or goes with the entities that read it
+    return any(old[k] != new[k] for k in old.keys() & new.keys())
+
+
+class ChangeModel:
+    """Decayed histogram over UTC hour-of-day of when a hotspot's values were seen to change."""
+    __slots__ = ("weights", "changes", "last_change")
+
+    def __init__(self, weights: Optional[List[float]] = None, changes: float = 0.0,
+                 last_change: Optional[datetime] = None):
+        self.weights = list(weights) if weights and len(weights) == HOURS else [0.0] * HOURS
+        self.changes = changes
+        self.last_change = last_change
+
+    def observe(self, since: datetime, until: datetime) -> None:
+        """A change happened somewhere in (since, until]: spread one unit over the hours it spans."""
+        self.last_change = until
+        if _informative(since, until):
+            self._fade(_DECAY)
+            self._spread(since, until, 1.0)
+
+    def _fade(self, factor: float) -> None:
+        self.weights = [w * factor for w in self.weights]
+        self.changes *= factor
+
+    def _spread(self, since: datetime, until: datetime, amount: float) -> None:
+        self.changes += amount
+        total = (until - since).total_seconds()
+        start = since
+        while start < until:
+            end = min(until, start.replace(minute=0, second=0, microsecond=0) + _HOUR)
+            self.weights[start.hour] += amount * (end - start).total_seconds() / total
+            start = end
+
+    @property
+    def confident(self) -> bool:
+        return self.changes >= MIN_CHANGES
+
+    def hot_hours(self) -> Set[int]:
+        total = sum(self.weights)
+        hot: Set[int] = set()
+        mass = 0.0
+        for hour in sorted(range(HOURS), key=lambda h: -self.weights[h]):
+            if mass >= HOT_MASS * total:
+                break
+            hot.add(hour)
+            mass += self.weights[hour]
+        return hot
+
+    def as_stored(self) -> dict:
+        return {
+            "weights": [round(w, 4) for w in self.weights],
+            "changes": round(self.changes, 4),
+            "last_change": self.last_change.isoformat() if self.last_change else None,
+        }
+
+    @classmethod
+    def from_stored(cls, stored: Mapping[str, Any]) -> "ChangeModel":
+        last = stored.get("last_change")
+        return cls(stored.get("weights"), float(stored.get("changes") or 0.0),
+                   datetime.fromisoformat(last) if last else None)
+
+
+class FleetChangeModel(ChangeModel):
+    """
+    The fleet-wide histogram. A hotspot's change adds its share of the fleet (1 / fleet size)
+    and old weights fade by _DECAY per elapsed day, so N hotspots changing in one epoch count
+    as one epoch, as they do for a single hotspot's model.
+    """
+    __slots__ = ()
+
+    def observe(self, since: datetime, until: datetime, share: float = 1.0) -> None:
+        if self.last_change is None or until > self.last_change:
+            if self.last_change is not None:
+                self._fade(_DECAY ** ((until - self.last_change) / _DAY))
+            self.last_change = until
+        if _informative(since, until):
+            self._spread(since, until, share)
+
+
+class AdaptivePolicy:
+    """
+    Picks each hotspot's next poll from when its data has changed before: every `min_interval`
+    inside the learned hot hours (until this window's change has been seen), otherwise sleep until
+    the next hot hour, never longer than `max_interval`. Hotspots without enough history use the
+    fleet-wide histogram, and the plain base interval until that is trusted too.
+    """
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta, base_interval: timedelta,
+                 fleet_size: int = 1):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.base_interval = min(self.max_interval, max(self.min_interval, base_interval))
+        self.fleet_size = max(1, fleet_size)
+        self.fleet = FleetChangeModel()
+        self.models: Dict[str, ChangeModel] = {}
+
+    def observe(self, hotspot: str, since: datetime, until: datetime, changed: bool) -> None:
+        if not changed:
+            return
+        self.models.setdefault(hotspot, ChangeModel()).observe(since, until)
+        self.fleet.observe(since, until, 1.0 / self.fleet_size)
+
+    def _model(self, hotspot: str) -> Optional[ChangeModel]:
+        model = self.models.get(hotspot)
+        if model is not None and model.confident:
+            return model
+        return self.fleet if self.fleet.confident else None
+
+    def next_due(self, hotspot: str, now: datetime) -> datetime:
+        model = self._model(hotspot)
+        if model is None:
+            return now + self.base_interval
+        hot = model.hot_hours()
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        if now.hour in hot:
+            # start of the current run of hot hours; once its change is seen, wait for the next run
+            run_start = hour_start
+            for _ in range(HOURS - 1):
+                if (run_start - _HOUR).hour not in hot:
+                    break
+                run_start -= _HOUR
+            own = self.models.get(hotspot)
+            if own is None or own.last_change is None or own.last_change < run_start:
+                return now + self.min_interval
+        candidate = hour_start + _HOUR
+        for _ in range(HOURS):
+            if candidate.hour in hot and (candidate - _HOUR).hour not in hot:
+                break
+            candidate += _HOUR
+        return min(now + self.max_interval, max(now + self.min_interval, candidate))
+
+    def describe(self, hotspot: str) -> dict:
+        model = self._model(hotspot)
+        own = self.models.get(hotspot)
+        return {
+            "model": "none" if model is None else ("fleet" if model is self.fleet else "hotspot"),
+            "hot_hours_utc": sorted(model.hot_hours()) if model else [],
+            "changes": round(own.changes, 2) if own else 0,
+            "last_change": own.last_change.isoformat() if own and own.last_change else None,
+        }
+
+    def as_stored(self) -> dict:
+        return {"fleet": self.fleet.as_stored(), "hotspots": {h: m.as_stored() for h, m in self.models.items()}}
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        if stored.get("fleet"):
+            self.fleet = FleetChangeModel.from_stored(stored["fleet"])
+        for hotspot, item in (stored.get("hotspots") or {}).items():
+            self.models[hotspot] = ChangeModel.from_stored(item)
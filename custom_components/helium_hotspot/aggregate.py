@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+# parsed fields that are summed/averaged across the fleet
+AGGREGATE_FIELDS = (
+    "tokens_earned_30d_hnt",
+    "proof_of_coverage_30d",
+    "data_transfer_30d",
+    "avg_daily_users",
+)
+TOP_FIELD = "tokens_earned_30d_hnt"
+TOP_KEY = "top"  # aggregate key reported when the top-N list changes
+DEFAULT_TOP_N = 5
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        try:
+            number = float(str(value).replace(",", ""))
+        except (TypeError, ValueError):
+            return None
+    # one NaN or inf in a running sum would stay there for good
+    return number if math.isfinite(number) else None
+
+
+class FleetAggregate:
+    """
+    Fleet totals, means and top earners kept up to date from per-hotspot changes.
+    Each update costs O(fields) plus O(log n) for the ranking; nothing rescans the fleet.
+    """
+
+    def __init__(self, top_n: int = DEFAULT_TOP_N):
+        self.top_n = top_n
+        self._values: Dict[str, Dict[str, float]] = {f: {} for f in AGGREGATE_FIELDS}
+        self._sums: Dict[str, float] = dict.fromkeys(AGGREGATE_FIELDS, 0.0)
+        self._ranking: List[Tuple[float, str]] = []  # (-value, hotspot), ascending = best first
+
+    def update(self, hotspot: str, data: Optional[Mapping[str, Any]]) -> Set[str]:
+        """Apply one hotspot's latest data; returns the aggregate keys (fields, TOP_KEY) that changed."""
+        changed: Set[str] = set()
+        top_before = self._ranking[:self.top_n]
+        for name in AGGREGATE_FIELDS:
+            values = self._values[name]
+            old = values.get(hotspot)
+            new = _number(data.get(name)) if data else None
+            if old == new:
+                continue
+            changed.add(name)
+            if old is not None:
+                self._sums[name] -= old
+                del values[hotspot]
+            if new is not None:
+                self._sums[name] += new
+                values[hotspot] = new
+            if name == TOP_FIELD:
+                if old is not None:
+                    del self._ranking[bisect_left(self._ranking, (-old, hotspot))]
+                if new is not None:
+                    insort(self._ranking, (-new, hotspot))
+        if TOP_FIELD in changed and self._ranking[:self.top_n] != top_before:
+            changed.add(TOP_KEY)
+        return changed
+
+    def remove(self, hotspot: str) -> Set[str]:
+        return self.update(hotspot, None)
+
+    def count(self, name: str) -> int:
+        return len(self._values[name])
+
+    def total(self, name: str) -> Optional[float]:
+        if not self._values[name]:
+            return None
+        # running sums drift by float rounding; page values have at most 3 decimals
+        return round(self._sums[name], 6)
+
+    def mean(self, name: str) -> Optional[float]:
+        count = len(self._values[name])
+        return round(self._sums[name] / count, 6) if count else None
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        return [(hotspot, -neg) for neg, hotspot in self._ranking[:n or self.top_n]]
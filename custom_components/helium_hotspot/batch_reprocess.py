@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# example usage:
+#   python3 batch_reprocess.py archive/                      # every *.html / *.html.gz below archive/
+#   python3 batch_reprocess.py pages-2024-05.tar.gz -o out.ndjson --workers 8
+#   python3 batch_reprocess.py archive/ --pattern "9982*.html" --progress 5
+#
+# Re-parses saved hotspot pages with parser.py (no Home Assistant needed) across a process pool.
+# One JSON object per page is written as soon as it is parsed (completion order, not input order);
+# throughput is reported on stderr. The hotspot id is taken from the first number in the file name.
+import argparse
+import gzip
+import importlib.util
+import json
+import os
+import re
+import sys
+import tarfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterator, List, Set, Tuple, Union
+
+PARSER_PATH = Path(__file__).resolve().parent / "parser.py"
+HOTSPOT_ID_RE = re.compile(r"\d+")
+
+# (source name, file path to read or the page bytes themselves)
+Item = Tuple[str, Union[str, bytes]]
+
+_parser = None
+
+
+def load_parser():
+    # parser.py has no Home Assistant imports; load it without the integration package
+    spec = importlib.util.spec_from_file_location("helium_hotspot_parser", PARSER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _init_worker() -> None:
+    global _parser
+    _parser = load_parser()
+
+
+def _decode(name: str, data: bytes) -> str:
+    if name.endswith(".gz"):
+        data = gzip.decompress(data)
+    return data.decode("utf-8", errors="replace")
+
+
+def _parse_chunk(items: List[Item]) -> Tuple[List[dict], int]:
+    """Runs in a worker: read + parse a chunk of pages; returns NDJSON records and bytes processed."""
+    names, pages, records = [], [], []
+    nbytes = 0
+    for name, src in items:
+        try:
+            data = Path(src).read_bytes() if isinstance(src, str) else src
+            nbytes += len(data)
+            pages.append(_decode(name, data))
+            names.append(name)
+        except (OSError, EOFError, gzip.BadGzipFile) as err:
+            records.append({"source": name, "error": f"{type(err).__name__}: {err}"})
+    for name, page in zip(names, pages):
+        m = HOTSPOT_ID_RE.search(Path(name).name)
+        try:
+            parsed, stats = _parser.parse_batch([page])[0]
+        except Exception as err:  # keep going; one broken page must not stop a month of archives
+            records.append({"source": name, "hotspot": m.group(0) if m else None,
+                            "error": f"{type(err).__name__}: {err}"})
+            continue
+        records.append({"source": name, "hotspot": m.group(0) if m else None,
+                        **parsed, "parse_ms": stats.get("total_ms")})
+    return records, nbytes
+
+
+def _wanted(name: str, pattern: str) -> bool:
+    return fnmatch(Path(name).name, pattern)
+
+
+def iter_items(source: Path, pattern: str) -> Iterator[Item]:
+    """Pages from a directory (paths; workers read them) or a tarball (bytes, read sequentially here)."""
+    if source.is_dir():
+        for path in sorted(source.rglob("*")):
+            if path.is_file() and _wanted(path.name, pattern):
+                yield str(path.relative_to(source)), str(path)
+        return
+    with tarfile.open(source, "r:*") as tar:  # streams .tar, .tar.gz, .tar.bz2, .tar.xz
+        for member in tar:
+            if member.isfile() and _wanted(member.name, pattern):
+                fh = tar.extractfile(member)
+                if fh is not None:
+                    yield member.name, fh.read()
+
+
+def _chunks(items: Iterator[Item], size: int) -> Iterator[List[Item]]:
+    chunk: List[Item] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(source: Path, out, workers: int, chunk_size: int, pattern: str, progress: float) -> dict:
+    started = last_report = time.perf_counter()
+    pages = errors = nbytes = 0
+    chunks = _chunks(iter_items(source, pattern), chunk_size)
+    in_flight: Set[Future] = set()
+    max_in_flight = workers * 2  # bounds memory when reading a tarball faster than it parses
+
+    def report(final: bool = False) -> dict:
+        elapsed = time.perf_counter() - started
+        stats = {
+            "pages": pages,
+            "errors": errors,
+            "mb": round(nbytes / 1e6, 1),
+            "seconds": round(elapsed, 2),
+            "pages_per_s": round(pages / elapsed, 1) if elapsed else None,
+            "mb_per_s": round(nbytes / 1e6 / elapsed, 1) if elapsed else None,
+        }
+        print(("done: " if final else "progress: ") + json.dumps(stats), file=sys.stderr, flush=True)
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    in_flight.add(pool.submit(_parse_chunk, chunk))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                records, size = fut.result()
+                nbytes += size
+                for record in records:
+                    pages += 1
+                    errors += "error" in record
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if progress and time.perf_counter() - last_report >= progress:
+                out.flush()
+                report()
+                last_report = time.perf_counter()
+    out.flush()
+    return report(final=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Re-parse archived Helium hotspot pages to NDJSON.")
+    ap.add_argument("source", help="Directory of saved pages or a tarball")
+    ap.add_argument("-o", "--output", help="NDJSON output file (default: stdout)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser processes")
+    ap.add_argument("--chunk-size", type=int, default=16, help="Pages sent to a worker at once")
+    ap.add_argument("--pattern", default="*.html*", help="File name glob (default: *.html*)")
+    ap.add_argument("--progress", type=float, default=0, help="Report throughput every N seconds")
+    args = ap.parse_args()
+
+    source = Path(args.source)
+    if not source.exists():
+        sys.exit(f"{source} does not exist")
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = run(source, out, max(1, args.workers), max(1, args.chunk_size), args.pattern, args.progress)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if stats["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+import httpx
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_CLIENT, USER_AGENT
+from .parser import HOTSPOT_PAGE_MARKERS, StreamScanner
+
+_LOGGER = logging.getLogger(__name__)
+
+# one pool for every config entry; sized above the per-entry concurrency limit
+_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=16, keepalive_expiry=60.0)
+
+# a probe reads a page only until it shows hotspot data (the og:description is in the <head>)
+PROBE_MAX_BYTES = 256 * 1024
+PROBE_TIMEOUT = httpx.Timeout(10.0)
+_PROBE_MARKERS = tuple(marker.encode() for marker in HOTSPOT_PAGE_MARKERS)
+_PROBE_OVERLAP = max(len(marker) for marker in _PROBE_MARKERS)
+
+
+class FetchTracer:
+    """
+    httpcore `trace` extension hook: remembers when each connection/request phase happened.
+    DNS resolution is part of connect_tcp; reused connections have no connect/TLS phase.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    async def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        # "connection.connect_tcp.started", "http11.receive_response_headers.complete", ...
+        self.marks[event.split(".", 1)[-1]] = time.perf_counter()
+
+    def _span(self, start: str, end: str) -> Optional[float]:
+        if start in self.marks and end in self.marks:
+            return round((self.marks[end] - self.marks[start]) * 1000, 1)
+        return None
+
+    def timings(self, end: float) -> Dict[str, Optional[float]]:
+        headers_done = self.marks.get("receive_response_headers.complete")
+        return {
+            "connect_ms": self._span("connect_tcp.started", "connect_tcp.complete"),
+            "tls_ms": self._span("start_tls.started", "start_tls.complete"),
+            "ttfb_ms": self._span("send_request_headers.started", "receive_response_headers.complete"),
+            "download_ms": round((end - headers_done) * 1000, 1) if headers_done else None,
+            "total_ms": round((end - self.start) * 1000, 1),
+        }
+
+
+@dataclass
+class FetchedPage:
+    """A fetched hotspot page; `truncated` when streaming stopped once every marker was seen."""
+    response: httpx.Response
+    content: bytes = b""
+    truncated: bool = False
+    timings: Dict[str, Optional[float]] = field(default_factory=dict)
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self.response.headers
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.response.encoding or "utf-8", errors="replace")
+
+
+@dataclass
+class SharedClient:
+    client: httpx.AsyncClient
+    users: Set[str] = field(default_factory=set)
+
+
+def _create_client() -> httpx.AsyncClient:
+    """Build the client; runs in the executor because the SSL context loads CA certificates from disk."""
+    try:
+        import h2  # noqa: F401  (httpx[http2])
+        http2 = True
+    except ImportError:
+        http2 = False
+    # httpx already advertises every Accept-Encoding it can decode (gzip, deflate, br/zstd if installed)
+    return httpx.AsyncClient(
+        headers={
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        },
+        timeout=httpx.Timeout(20.0),
+        follow_redirects=True,
+        http2=http2,
+        limits=_LIMITS,
+    )
+
+
+async def async_get_client(hass: HomeAssistant, entry_id: str) -> httpx.AsyncClient:
+    """Return the domain-wide client, creating it for the first config entry."""
+    lock: asyncio.Lock = hass.data.setdefault(f"{DATA_CLIENT}_lock", asyncio.Lock())
+    async with lock:
+        shared: SharedClient | None = hass.data.get(DATA_CLIENT)
+        if shared is None:
+            shared = SharedClient(await hass.async_add_executor_job(_create_client))
+            hass.data[DATA_CLIENT] = shared
+            _LOGGER.debug("Created shared HTTP client")
+        shared.users.add(entry_id)
+        return shared.client
+
+
+async def async_release_client(hass: HomeAssistant, entry_id: str) -> None:
+    """Drop one config entry's claim; the last one out closes the client."""
+    shared: SharedClient | None = hass.data.get(DATA_CLIENT)
+    if shared is None:
+        return
+    shared.users.discard(entry_id)
+    if not shared.users:
+        hass.data.pop(DATA_CLIENT, None)
+        await shared.client.aclose()
+        _LOGGER.debug("Closed shared HTTP client")
+
+
+async def async_fetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    streaming: bool = False,
+) -> FetchedPage:
+    """
+    GET a hotspot page. With `streaming`, the body is read in chunks and the connection
+    is closed as soon as the parser's markers (plus a safety margin) have been received.
+    """
+    tracer = FetchTracer()
+    extensions = {"trace": tracer}
+    if not streaming:
+        r = await client.get(url, headers=headers, extensions=extensions)
+        return FetchedPage(r, r.content, timings=tracer.timings(time.perf_counter()))
+
+    async with client.stream("GET", url, headers=headers, extensions=extensions) as r:
+        if r.status_code != 200:
+            await r.aread()
+            return FetchedPage(r, r.content, timings=tracer.timings(time.perf_counter()))
+        scanner = StreamScanner()
+        parts = []
+        truncated = False
+        async for chunk in r.aiter_bytes():
+            parts.append(chunk)
+            if scanner.feed(chunk):
+                truncated = True
+                break
+        content = b"".join(parts)
+        if truncated:
+            _LOGGER.debug("Stopped reading %s after %s bytes", url, len(content))
+        return FetchedPage(r, content, truncated, tracer.timings(time.perf_counter()))
+
+
+@dataclass
+class ProbeResult:
+    """
+    Status of a page and whether its start carries hotspot data (parser.HOTSPOT_PAGE_MARKERS);
+    `headers` lets FetchScheduler honour Retry-After.
+    """
+    status_code: int
+    headers: httpx.Headers
+    has_data: bool = False
+
+
+async def async_probe_page(client: httpx.AsyncClient, url: str, max_bytes: int = PROBE_MAX_BYTES) -> ProbeResult:
+    """
+    Cheap existence check: stream a page until one of the hotspot data markers (or `max_bytes`)
+    has arrived and close the connection, instead of downloading and parsing the whole page.
+    """
+    async with client.stream("GET", url, timeout=PROBE_TIMEOUT) as r:
+        if r.status_code != 200:
+            return ProbeResult(r.status_code, r.headers)
+        head = bytearray()
+        async for chunk in r.aiter_bytes():
+            start = max(0, len(head) - _PROBE_OVERLAP)
+            head += chunk
+            if any(head.find(marker, start) >= 0 for marker in _PROBE_MARKERS):
+                return ProbeResult(r.status_code, r.headers, True)
+            if len(head) >= max_bytes:
+                break
+        return ProbeResult(r.status_code, r.headers)
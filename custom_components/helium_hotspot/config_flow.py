@@ -1,57 +1,227 @@
 from __future__ import annotations
 
 import voluptuous as vol
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, List
 
 from homeassistant import config_entries
+from homeassistant.components.file_upload import process_uploaded_file
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.selector import (
+    FileSelector,
+    FileSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 
+from .client import async_get_client, async_release_client
 from .const import (
     DOMAIN,
     CONF_HOTSPOTS,
+    CONF_HOTSPOT_LIST,
+    CONF_HOTSPOT_CSV,
+    CONF_SKIP_UNRESOLVED,
     CONF_UPDATE_INTERVAL_MINUTES,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUESTS_PER_SECOND,
+    CONF_POLL_SHARDS,
+    CONF_STREAMING_FETCH,
+    CONF_PARSER_MODE,
+    CONF_HISTORY_DAYS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_UPDATE_INTERVAL_MINUTES,
+    CONF_MAX_UPDATE_INTERVAL_MINUTES,
+    PARSER_MODES,
     DEFAULT_UPDATE_INTERVAL_MINUTES,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_POLL_SHARDS,
+    DEFAULT_STREAMING_FETCH,
+    DEFAULT_PARSER_MODE,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_UPDATE_INTERVAL_MINUTES,
+    DEFAULT_MAX_UPDATE_INTERVAL_MINUTES,
+)
+from .coordinator import HOTSPOT_URL_TMPL
+from .validation import (
+    NOT_AN_ID,
+    NOT_FOUND,
+    async_validate_hotspots,
+    describe_unresolved,
+    read_hotspot_csv,
+    split_hotspot_list,
 )
 
 HOTSPOT_SCHEMA = vol.Schema({
     vol.Required(CONF_HOTSPOTS): str,  # comma-separated: e.g. "9982 # ,123456"
+    vol.Optional(CONF_SKIP_UNRESOLVED, default=False): bool,
 })
 
-OPTIONS_SCHEMA = vol.Schema({
-    vol.Optional(CONF_UPDATE_INTERVAL_MINUTES, default=DEFAULT_UPDATE_INTERVAL_MINUTES): vol.All(int, vol.Clamp(min=5, max=1440)),
+BULK_SCHEMA = vol.Schema({
+    vol.Optional(CONF_HOTSPOT_LIST): TextSelector(TextSelectorConfig(multiline=True)),
+    vol.Optional(CONF_HOTSPOT_CSV): FileSelector(FileSelectorConfig(accept=".csv,.txt,text/csv,text/plain")),
+    vol.Optional(CONF_SKIP_UNRESOLVED, default=False): bool,
 })
 
+# entry titles list the hotspots up to this many
+_TITLE_MAX_HOTSPOTS = 5
+
+def _options_schema(options: Dict[str, Any]) -> vol.Schema:
+    return vol.Schema({
+        vol.Optional(
+            CONF_UPDATE_INTERVAL_MINUTES,
+            default=options.get(CONF_UPDATE_INTERVAL_MINUTES, DEFAULT_UPDATE_INTERVAL_MINUTES)
+        ): vol.All(int, vol.Clamp(min=5, max=1440)),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS,
+            default=options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+        ): vol.All(int, vol.Clamp(min=1, max=64)),
+        vol.Optional(
+            CONF_REQUESTS_PER_SECOND,
+            default=options.get(CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND)
+        ): vol.All(vol.Coerce(float), vol.Clamp(min=0.1, max=50)),
+        vol.Optional(
+            CONF_POLL_SHARDS,
+            default=options.get(CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS)
+        ): vol.All(int, vol.Clamp(min=1, max=60)),
+        vol.Optional(
+            CONF_STREAMING_FETCH,
+            default=options.get(CONF_STREAMING_FETCH, DEFAULT_STREAMING_FETCH)
+        ): bool,
+        vol.Optional(
+            CONF_PARSER_MODE,
+            default=options.get(CONF_PARSER_MODE, DEFAULT_PARSER_MODE)
+        ): vol.In(PARSER_MODES),
+        vol.Optional(
+            CONF_HISTORY_DAYS,
+            default=options.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS)
+        ): vol.All(int, vol.Clamp(min=0, max=90)),
+        vol.Optional(
+            CONF_ADAPTIVE_POLLING,
+            default=options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        ): bool,
+        vol.Optional(
+            CONF_MIN_UPDATE_INTERVAL_MINUTES,
+            default=options.get(CONF_MIN_UPDATE_INTERVAL_MINUTES, DEFAULT_MIN_UPDATE_INTERVAL_MINUTES)
+        ): vol.All(int, vol.Clamp(min=5, max=1440)),
+        vol.Optional(
+            CONF_MAX_UPDATE_INTERVAL_MINUTES,
+            default=options.get(CONF_MAX_UPDATE_INTERVAL_MINUTES, DEFAULT_MAX_UPDATE_INTERVAL_MINUTES)
+        ): vol.All(int, vol.Clamp(min=5, max=1440)),
+    })
+
 def _normalize_hotspots(s: str) -> str:
     # keep only digits and commas/spaces, collapse
     parts = [p.strip() for p in s.split(",") if p.strip().isdigit()]
     return ",".join(parts)
 
+def _read_upload(hass: HomeAssistant, file_id: str) -> str:
+    with process_uploaded_file(hass, file_id) as path:
+        return Path(path).read_text(encoding="utf-8-sig", errors="replace")
+
 class HeliumConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return HeliumOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
+        return self.async_show_menu(step_id="user", menu_options=["manual", "bulk"])
+
+    async def async_step_manual(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
         errors: Dict[str, str] = {}
+        placeholders = {"unresolved": ""}
         if user_input is not None:
-            hotspots = _normalize_hotspots(user_input[CONF_HOTSPOTS])
-            if not hotspots:
-                errors["base"] = "invalid_hotspots"
-            else:
-                await self.async_set_unique_id(f"{DOMAIN}_{hotspots}")
-                self._abort_if_unique_id_configured()
-                return self.async_create_entry(
-                    title=f"Helium Hotspot(s) {hotspots}",
-                    data={CONF_HOTSPOTS: hotspots},
-                )
-        return self.async_show_form(step_id="user", data_schema=HOTSPOT_SCHEMA, errors=errors)
+            hotspots, invalid = split_hotspot_list(user_input[CONF_HOTSPOTS])
+            result = await self._async_validate_and_create(
+                hotspots, invalid, user_input.get(CONF_SKIP_UNRESOLVED, False), errors, placeholders
+            )
+            if result is not None:
+                return result
+        return self.async_show_form(
+            step_id="manual",
+            data_schema=self.add_suggested_values_to_schema(HOTSPOT_SCHEMA, user_input or {}),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
 
-    async def async_step_import(self, user_input: Dict[str, Any]) -> FlowResult:
-        return await self.async_step_user(user_input)
+    async def async_step_bulk(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
+        """Large lists: pasted text and/or an uploaded CSV, checked concurrently before the entry is made."""
+        errors: Dict[str, str] = {}
+        placeholders = {"unresolved": ""}
+        if user_input is not None:
+            hotspots, invalid = split_hotspot_list(user_input.get(CONF_HOTSPOT_LIST, ""))
+            if user_input.get(CONF_HOTSPOT_CSV):
+                text = await self.hass.async_add_executor_job(_read_upload, self.hass, user_input[CONF_HOTSPOT_CSV])
+                csv_ids, csv_invalid = read_hotspot_csv(text)
+                hotspots = list(dict.fromkeys(hotspots + csv_ids))
+                invalid = list(dict.fromkeys(invalid + csv_invalid))
+            result = await self._async_validate_and_create(
+                hotspots, invalid, user_input.get(CONF_SKIP_UNRESOLVED, False), errors, placeholders
+            )
+            if result is not None:
+                return result
+            # an uploaded file is consumed; keep the pasted text for the next try
+            user_input = {k: v for k, v in user_input.items() if k != CONF_HOTSPOT_CSV}
+        return self.async_show_form(
+            step_id="bulk",
+            data_schema=self.add_suggested_values_to_schema(BULK_SCHEMA, user_input or {}),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
 
-    async def async_step_options(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
-        return await self.async_step_init(user_input)
+    async def _async_validate_and_create(
+        self,
+        hotspots: List[str],
+        invalid: List[str],
+        skip_unresolved: bool,
+        errors: Dict[str, str],
+        placeholders: Dict[str, str],
+    ) -> FlowResult | None:
+        """Probe the hotspots and create the entry; on problems fill `errors`/`placeholders` and return None."""
+        if not hotspots:
+            errors["base"] = "invalid_hotspots"
+            return None
+        client_user = f"flow_{self.flow_id}"
+        client = await async_get_client(self.hass, client_user)
+        try:
+            unresolved = await async_validate_hotspots(client, hotspots, HOTSPOT_URL_TMPL)
+        finally:
+            await async_release_client(self.hass, client_user)
+        if len(unresolved) == len(hotspots) and NOT_FOUND not in unresolved.values():
+            errors["base"] = "cannot_connect"
+            return None
+        problems = {**{token: NOT_AN_ID for token in invalid}, **unresolved}
+        if problems and not skip_unresolved:
+            errors["base"] = "unresolved_hotspots"
+            placeholders["unresolved"] = describe_unresolved(problems)
+            return None
+        resolved = [h for h in hotspots if h not in unresolved]
+        if not resolved:
+            errors["base"] = "invalid_hotspots"
+            return None
+        return await self._async_create(resolved)
 
-    async def async_step_init(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
-        return self.async_show_form(step_id="init", data_schema=OPTIONS_SCHEMA)
+    async def _async_create(self, hotspots: List[str]) -> FlowResult:
+        joined = ",".join(hotspots)
+        await self.async_set_unique_id(f"{DOMAIN}_{joined}")
+        self._abort_if_unique_id_configured()
+        if len(hotspots) > _TITLE_MAX_HOTSPOTS:
+            title = f"Helium Hotspots ({len(hotspots)})"
+        else:
+            title = f"Helium Hotspot(s) {joined}"
+        return self.async_create_entry(title=title, data={CONF_HOTSPOTS: joined})
+
+    async def async_step_import(self, user_input: Dict[str, Any]) -> FlowResult:
+        # YAML import is not interactive: take the IDs as given, no network checks
+        hotspots = _normalize_hotspots(user_input[CONF_HOTSPOTS])
+        if not hotspots:
+            return self.async_abort(reason="invalid_hotspots")
+        return await self._async_create(hotspots.split(","))
 
 class HeliumOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, entry: config_entries.ConfigEntry) -> None:
@@ -60,13 +230,4 @@ class HeliumOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
-        schema = vol.Schema({
-            vol.Optional(
-                CONF_UPDATE_INTERVAL_MINUTES,
-                default=self._entry.options.get(CONF_UPDATE_INTERVAL_MINUTES, DEFAULT_UPDATE_INTERVAL_MINUTES)
-            ): vol.All(int, vol.Clamp(min=5, max=1440)),
-        })
-        return self.async_show_form(step_id="init", data_schema=schema)
-
-async def async_get_options_flow(config_entry):
-    return HeliumOptionsFlow(config_entry)
+        return self.async_show_form(step_id="init", data_schema=_options_schema(dict(self._entry.options)))
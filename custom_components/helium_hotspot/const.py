@@ -1,9 +1,44 @@
 DOMAIN = "helium_hotspot"
+DATA_CLIENT = f"{DOMAIN}_client"
+DATA_PROCESS_POOL = f"{DOMAIN}_process_pool"
+DATA_FETCH_HUB = f"{DOMAIN}_fetch_hub"
+DATA_PROFILE_LOCK = f"{DOMAIN}_profile_lock"
+STORAGE_VERSION = 1
 
 CONF_HOTSPOTS = "hotspots"
 CONF_UPDATE_INTERVAL_MINUTES = "update_interval_minutes"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUESTS_PER_SECOND = "requests_per_second"
+CONF_POLL_SHARDS = "poll_shards"
+CONF_STREAMING_FETCH = "streaming_fetch"
+CONF_PARSER_MODE = "parser_mode"
+CONF_HISTORY_DAYS = "history_days"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_UPDATE_INTERVAL_MINUTES = "min_update_interval_minutes"
+CONF_MAX_UPDATE_INTERVAL_MINUTES = "max_update_interval_minutes"
+
+# config flow (bulk import) form fields, not stored in the entry
+CONF_HOTSPOT_LIST = "hotspot_list"
+CONF_HOTSPOT_CSV = "hotspot_csv"
+CONF_SKIP_UNRESOLVED = "skip_unresolved"
+
+PARSER_MODE_THREAD = "thread"
+PARSER_MODE_PROCESS = "process"
+PARSER_MODES = [PARSER_MODE_THREAD, PARSER_MODE_PROCESS]
 
 DEFAULT_UPDATE_INTERVAL_MINUTES = 60  # 1 hour
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_POLL_SHARDS = 1  # 1 = refresh every hotspot together
+DEFAULT_STREAMING_FETCH = False
+DEFAULT_PARSER_MODE = PARSER_MODE_THREAD
+DEFAULT_HISTORY_DAYS = 0  # 0 = no local history / rate sensors
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_UPDATE_INTERVAL_MINUTES = 15
+DEFAULT_MAX_UPDATE_INTERVAL_MINUTES = 360
+# hotspot checks while adding an entry: short partial GETs, so a higher rate than polling
+PROBE_MAX_CONCURRENT = 16
+PROBE_REQUESTS_PER_SECOND = 25.0
 USER_AGENT = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
@@ -19,3 +54,8 @@ SENSOR_TYPES = {
     "avg_daily_data": ("Avg Daily Data", None),
     "avg_daily_users": ("Avg Daily Users", None),
 }
+
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_TOP = "top"
+DEFAULT_PROFILE_TOP = 30
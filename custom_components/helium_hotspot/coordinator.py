@@ -2,24 +2,139 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta
-from typing import Dict, List
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
 
 import httpx
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, USER_AGENT, DEFAULT_UPDATE_INTERVAL_MINUTES
-from .parser import parse_hotspot_html
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUESTS_PER_SECOND,
+    CONF_POLL_SHARDS,
+    CONF_STREAMING_FETCH,
+    CONF_HISTORY_DAYS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_UPDATE_INTERVAL_MINUTES,
+    CONF_MAX_UPDATE_INTERVAL_MINUTES,
+    DEFAULT_UPDATE_INTERVAL_MINUTES,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_POLL_SHARDS,
+    DEFAULT_STREAMING_FETCH,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_UPDATE_INTERVAL_MINUTES,
+    DEFAULT_MAX_UPDATE_INTERVAL_MINUTES,
+)
+from .adaptive import AdaptivePolicy, values_changed
+from .aggregate import TOP_FIELD, TOP_KEY, FleetAggregate
+from .client import async_fetch_page
+from .fetcher import FetchHub, PageEntry
+from .history import HISTORY_FIELDS, HotspotHistory
+from .parse_pool import ParsePool
+from .parser import RESULT_FIELDS
+from .scheduler import FetchScheduler
 
-_HOTSPOT_URL_TMPL = "https://world.helium.com/en/network/mobile/hotspot/{hotspot}"
+HOTSPOT_URL_TMPL = "https://world.helium.com/en/network/mobile/hotspot/{hotspot}"
 _LOGGER = logging.getLogger(__name__)
 
 
+# failed hotspots retry on their own, shorter schedule: 1, 2, 4, ... minutes, capped at the interval
+_RETRY_BASE = timedelta(minutes=1)
+_MIN_TICK = timedelta(seconds=30)
+_DUE_SLACK = timedelta(seconds=5)  # timer jitter must not push a hotspot into the next tick
+_STORE_SAVE_DELAY = 30  # seconds; coalesces saves while shards complete
+# another entry's fetch of the same hotspot is reused if it is younger than this share of our interval
+_SHARE_FRACTION = 0.5
+
+
+# pseudo fields for listener contexts: instrumentation changes every refresh
+METRICS_FIELD = "_metrics"
+HISTORY_FIELD = "_history"
+FLEET_ID = "_fleet"
+_LATENCY_SAMPLES = 1000
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+def storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}"
+
+
+def history_path(hass: HomeAssistant, entry_id: str) -> Path:
+    # raw binary files: our own directory, not .storage (Home Assistant's Store JSON)
+    return Path(hass.config.path(DOMAIN, "history", entry_id))
+
+
+@dataclass
+class HotspotState:
+    """Per-hotspot slot of one entry: last good parse and retry bookkeeping (validators live in FetchHub)."""
+    parsed: Optional[dict] = None
+    updated_at: Optional[datetime] = None
+    next_due: Optional[datetime] = None
+    failures: int = 0
+    last_error: Optional[str] = None
+    shard: int = 0
+    metrics: Dict[str, Any] = field(default_factory=dict)  # last refresh: timings, bytes, parse stats
+
+    def is_due(self, now: datetime) -> bool:
+        return self.next_due is None or self.next_due <= now
+
+    def as_stored(self, page: Optional[PageEntry]) -> dict:
+        stored = {
+            "parsed": self.parsed,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+        # validators only describe the page our parse came from
+        if page is not None and page.parsed is self.parsed:
+            stored.update(
+                etag=page.etag,
+                last_modified=page.last_modified,
+                body_hash=page.body_hash.hex() if page.body_hash else None,
+                fields=sorted(page.fields) if page.fields is not None else None,
+                static_at=page.static_at.isoformat() if page.static_at else None,
+            )
+        else:
+            stored["fields"] = []  # unknown: refetch in full before reusing it
+        return stored
+
+    def restore(self, stored: dict) -> None:
+        self.parsed = stored.get("parsed")
+        self.updated_at = dt_util.parse_datetime(stored["updated_at"]) if stored.get("updated_at") else None
+
+
 class HeliumCoordinator(DataUpdateCoordinator[Dict[str, dict]]):
     """Fetch & parse data for one or more hotspots."""
 
-    def __init__(self, hass: HomeAssistant, hotspots: List[str], update_minutes: int | None):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: httpx.AsyncClient,
+        parse_pool: ParsePool,
+        hotspots: List[str],
+        update_minutes: int | None,
+        options: Mapping[str, Any] | None = None,
+        entry_id: str | None = None,
+        url_template: str = HOTSPOT_URL_TMPL,
+        fetch_hub: FetchHub | None = None,
+    ):
+        options = options or {}
         super().__init__(
             hass,
             _LOGGER,  # <-- use module logger
@@ -27,34 +142,342 @@ class HeliumCoordinator(DataUpdateCoordinator[Dict[str, dict]]):
             update_interval=timedelta(minutes=update_minutes or DEFAULT_UPDATE_INTERVAL_MINUTES),
         )
         self._hotspots = [h.strip() for h in hotspots if h.strip()]
-        self._client = httpx.AsyncClient(
-            headers={
-                "User-Agent": USER_AGENT,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            },
-            timeout=httpx.Timeout(20.0),
-            follow_redirects=True,
+        self._interval = timedelta(minutes=update_minutes or DEFAULT_UPDATE_INTERVAL_MINUTES)
+        # sharded polling: hotspot i refreshes at offset (i % shards) / shards inside every interval
+        self._shards = max(1, min(options.get(CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS), len(self._hotspots) or 1))
+        self._epoch = dt_util.utcnow()
+        self._states: Dict[str, HotspotState] = {
+            h: HotspotState(shard=i % self._shards) for i, h in enumerate(self._hotspots)
+        }
+        self._scheduler = FetchScheduler(
+            options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+            options.get(CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND),
         )
+        self._client = client  # shared across config entries, see client.py
+        self._entry_id = entry_id
+        self._fetch_hub = fetch_hub or FetchHub()  # shared across config entries, see fetcher.py
+        self._url_template = url_template  # overridden by benchmarks/bench_load.py
+        self._streaming = options.get(CONF_STREAMING_FETCH, DEFAULT_STREAMING_FETCH)
+        self._parse_pool = parse_pool  # keeps parsing off the event loop
+        # (hotspot, field) pairs that changed in the last refresh; None = notify everyone
+        self._changed: Optional[Set[Tuple[str, str]]] = None
+        self._notified_success = True
+        # parsed fields the subscribed entities read, per hotspot; None = recompute
+        self._wanted: Optional[Dict[str, Optional[FrozenSet[str]]]] = None
+        # our own record of each listener's context, for targeted notification
+        self._subscribers: Dict[object, Tuple[CALLBACK_TYPE, Any]] = {}
+        self._latencies: deque = deque(maxlen=_LATENCY_SAMPLES)
+        self._last_cycle: Dict[str, Any] = {}
+        self._aggregate = FleetAggregate()
+        self._store: Store | None = Store(hass, STORAGE_VERSION, storage_key(entry_id)) if entry_id else None
+        self._adaptive: AdaptivePolicy | None = None
+        if options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+            self._adaptive = AdaptivePolicy(
+                timedelta(minutes=options.get(CONF_MIN_UPDATE_INTERVAL_MINUTES, DEFAULT_MIN_UPDATE_INTERVAL_MINUTES)),
+                timedelta(minutes=options.get(CONF_MAX_UPDATE_INTERVAL_MINUTES, DEFAULT_MAX_UPDATE_INTERVAL_MINUTES)),
+                self._interval,
+                fleet_size=len(self._hotspots),
+            )
+        else:
+            # stagger from the start: only shard 0 is due on the first refresh, not the whole fleet
+            for state in self._states.values():
+                state.next_due = self._epoch + self._interval * state.shard / self._shards
+        self._share_age = (self._adaptive.min_interval if self._adaptive else self._interval) * _SHARE_FRACTION
+        self._force_fetch = False
+        history_days = options.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS)
+        self._history: HotspotHistory | None = (
+            HotspotHistory(history_path(hass, entry_id), history_days) if entry_id and history_days else None
+        )
+        # history files are written one batch at a time; the write in flight outlives a cancelled refresh
+        self._history_lock = asyncio.Lock()
+        self._history_write: Optional[asyncio.Future] = None
+        self._history_closed = False
+
+    @property
+    def hotspots(self) -> List[str]:
+        return self._hotspots
+
+    @property
+    def aggregate(self) -> FleetAggregate:
+        return self._aggregate
+
+    @property
+    def history(self) -> Optional[HotspotHistory]:
+        return self._history
+
+    @property
+    def adaptive(self) -> Optional[AdaptivePolicy]:
+        return self._adaptive
+
+    @property
+    def fetch_hub(self) -> FetchHub:
+        return self._fetch_hub
+
+    @property
+    def parse_pool(self) -> ParsePool:
+        return self._parse_pool
+
+    def hotspot_state(self, hotspot_id: str) -> Optional[HotspotState]:
+        return self._states.get(hotspot_id)
+
+    def mark_all_due(self) -> None:
+        """
+        Make every hotspot due on the next refresh, regardless of shard or retry backoff, and
+        fetch it then even if another entry has just done so.
+        """
+        for state in self._states.values():
+            state.next_due = None
+        self._force_fetch = True
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: Any = None) -> Callable[[], None]:
+        remove = super().async_add_listener(update_callback, context)
+        key = object()
+        self._subscribers[key] = (update_callback, context)
+        self._wanted = None
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            self._subscribers.pop(key, None)
+            self._wanted = None
+
+        return remove_listener
+
+    def _wanted_fields(self) -> Dict[str, Optional[FrozenSet[str]]]:
+        """
+        Parsed fields each hotspot's entities read, from their listener contexts (disabled
+        entities never subscribe), plus names for devices, fleet aggregates and local history.
+        None means all fields: before the entities are added, or for a listener without context.
+        """
+        contexts = list(self.async_contexts())  # leaves out listeners without a context
+        anonymous = any(context is None for _, context in self._subscribers.values())
+        if not contexts or anonymous or not all(isinstance(c, frozenset) for c in contexts):
+            return dict.fromkeys(self._hotspots)
+        common: Set[str] = {"hotspot_name"}
+        if self._history is not None:
+            common.update(HISTORY_FIELDS)
+        own: Dict[str, Set[str]] = {}
+        for context in contexts:
+            for hsid, key in context:
+                if hsid == FLEET_ID:
+                    common.add(TOP_FIELD if key == TOP_KEY else key)
+                else:
+                    own.setdefault(hsid, set()).add(key)
+        return {h: frozenset((common | own.get(h, set())) & set(RESULT_FIELDS)) for h in self._hotspots}
+
+    def hotspot_available(self, hotspot_id: str) -> bool:
+        """A hotspot is available while it has good data, even if its latest fetch failed."""
+        state = self._states.get(hotspot_id)
+        return state is not None and state.parsed is not None
+
+    async def async_restore(self) -> bool:
+        """
+        Load the last saved results so entities start with cached values.
+        Restored hotspots become due one interval after their saved timestamp.
+        Returns True if anything was restored.
+        """
+        if self._history is not None:
+            await self.hass.async_add_executor_job(self._history.load, self._hotspots)
+        if self._store is None:
+            return False
+        stored = await self._store.async_load()
+        if not stored:
+            return False
+        now = dt_util.utcnow()
+        if self._adaptive is not None and stored.get("adaptive"):
+            self._adaptive.restore(stored["adaptive"])
+        restored = 0
+        for hsid, item in (stored.get("hotspots") or {}).items():
+            state = self._states.get(hsid)
+            if state is None or not item.get("parsed"):
+                continue
+            state.restore(item)
+            self._fetch_hub.seed(hsid, item, state.updated_at)
+            if state.updated_at:
+                state.next_due = max(now, self._next_due(hsid, state, state.updated_at))
+            self._aggregate.update(hsid, state.parsed)
+            restored += 1
+        if not restored:
+            return False
+        self.data = {h: s.parsed for h, s in self._states.items() if s.parsed is not None}
+        _LOGGER.debug("Restored cached data for %s of %s hotspot(s)", restored, len(self._hotspots))
+        return True
+
+    def _stored_data(self) -> dict:
+        data = {"hotspots": {
+            h: s.as_stored(self._fetch_hub.page(h)) for h, s in self._states.items() if s.parsed is not None
+        }}
+        if self._adaptive is not None:
+            data["adaptive"] = self._adaptive.as_stored()
+        return data
+
+    def _next_due(self, hsid: str, state: HotspotState, now: datetime) -> datetime:
+        if self._adaptive is not None:
+            return self._adaptive.next_due(hsid, now)
+        return self._next_slot(state, now)
+
+    def _next_slot(self, state: HotspotState, now: datetime) -> datetime:
+        """
+        Next start of this hotspot's shard that is at least (1 - 1/shards), and at least half,
+        of an interval away, so shards keep their phase across retries without refreshing early.
+        """
+        offset = self._interval * state.shard / self._shards
+        earliest = now + self._interval * max(1 - 1 / self._shards, 0.5) + _DUE_SLACK
+        periods = max(0, math.ceil((earliest - self._epoch - offset) / self._interval))
+        return self._epoch + offset + self._interval * periods
+
+    def fleet_metrics(self) -> Dict[str, Any]:
+        latencies = list(self._latencies)
+        return {
+            "refresh_p50_ms": _percentile(latencies, 0.5),
+            "refresh_p95_ms": _percentile(latencies, 0.95),
+            "samples": len(latencies),
+            **self._last_cycle,
+        }
+
+    async def _async_fetch_one(self, hsid: str, metrics: Dict[str, Any]) -> datetime:
+        """Refresh one hotspot through the FetchHub; returns when its data was fetched."""
+        url = self._url_template.format(hotspot=hsid)
+        if self._wanted is None:
+            self._wanted = self._wanted_fields()
+        result = await self._fetch_hub.async_fetch(
+            hsid,
+            url,
+            lambda headers: self._scheduler.run(
+                lambda: async_fetch_page(self._client, url, headers, streaming=self._streaming)
+            ),
+            self._parse_pool.async_parse,
+            timedelta(0) if self._force_fetch else self._share_age,
+            self._entry_id,
+            self._wanted.get(hsid),
+        )
+        metrics.update(result.metrics)
+        self._states[hsid].parsed = result.parsed
+        return result.fetched_at
+
+    async def _async_refresh_one(self, hsid: str) -> bool:
+        state = self._states[hsid]
+        metrics: Dict[str, Any] = {}
+        previous, previous_at = state.parsed, state.updated_at
+        t0 = time.perf_counter()
+        try:
+            fetched_at = await self._async_fetch_one(hsid, metrics)
+        except Exception as err:  # one bad page must not take the others down
+            metrics["outcome"] = "error"
+            self._record_metrics(state, metrics, t0)
+            state.failures += 1
+            state.last_error = str(err) or type(err).__name__
+            state.next_due = dt_util.utcnow() + min(self._interval, _RETRY_BASE * (2 ** (state.failures - 1)))
+            _LOGGER.warning("Hotspot %s refresh failed (%s attempt(s)): %s; %s", hsid, state.failures,
+                            state.last_error, "keeping last data" if state.parsed else "no data yet")
+            return False
+        self._record_metrics(state, metrics, t0)
+        now = dt_util.utcnow()
+        # a result shared from another entry describes the page as of its fetch
+        state.updated_at = fetched_at
+        if self._adaptive is not None and previous is not None and previous_at is not None:
+            self._adaptive.observe(hsid, previous_at, fetched_at, values_changed(previous, state.parsed))
+        state.next_due = self._next_due(hsid, state, now)
+        state.failures = 0
+        state.last_error = None
+        return True
+
+    def _record_metrics(self, state: HotspotState, metrics: Dict[str, Any], t0: float) -> None:
+        metrics["refresh_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        metrics["at"] = dt_util.utcnow().isoformat()
+        state.metrics = metrics
+        self._latencies.append(metrics["refresh_ms"])
+
+    def _schedule_next_tick(self) -> None:
+        """Wake up when the earliest hotspot is due, so retries don't wait for the full interval."""
+        now = dt_util.utcnow()
+        due = [s.next_due for s in self._states.values() if s.next_due is not None]
+        longest = max(self._interval, self._adaptive.max_interval) if self._adaptive else self._interval
+        delay = min(due) - now if due else longest
+        self.update_interval = max(_MIN_TICK, min(longest, delay))
+
+    @staticmethod
+    def _diff(prev: Mapping[str, dict], new: Mapping[str, dict]) -> Set[Tuple[str, str]]:
+        changed: Set[Tuple[str, str]] = set()
+        for hsid in prev.keys() | new.keys():
+            old, cur = prev.get(hsid), new.get(hsid)
+            if old is cur:  # 304 / identical body: the same parse object is reused
+                continue
+            old, cur = old or {}, cur or {}
+            changed.update((hsid, k) for k in old.keys() | cur.keys() if old.get(k) != cur.get(k))
+        return changed
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Notify only listeners whose context shares a changed (hotspot, field) pair, in one pass.
+        Everyone is notified when availability flips or no diff is known.
+        """
+        changed, self._changed = self._changed, None
+        if changed is None or self.last_update_success != self._notified_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+        if not changed:
+            return
+        for update_callback, context in list(self._subscribers.values()):
+            if context is None or (isinstance(context, frozenset) and not context.isdisjoint(changed)):
+                update_callback()
+
+    async def _async_write_history(self) -> None:
+        async with self._history_lock:
+            if self._history_write is not None:
+                await asyncio.shield(self._history_write)
+            if self._history_closed:
+                return
+            batch = self._history.take_pending()
+            if batch:
+                self._history_write = self.hass.async_add_executor_job(self._history.write, batch)
+                await asyncio.shield(self._history_write)
+
+    async def async_close_history(self) -> None:
+        """Stop writing history and wait for the write in flight, so the files can be removed after unload."""
+        self._history_closed = True
+        if self._history_write is not None:
+            await asyncio.shield(self._history_write)
 
     async def _async_update_data(self) -> Dict[str, dict]:
+        self._changed = set()
+        now = dt_util.utcnow() + _DUE_SLACK
+        due = [h for h in self._hotspots if self._states[h].is_due(now)]
+        t0 = time.perf_counter()
         try:
-            results: Dict[str, dict] = {}
-
-            async def fetch_one(hsid: string):
-                url = _HOTSPOT_URL_TMPL.format(hotspot=hsid)
-                r = await self._client.get(url)
-                r.raise_for_status()
-                parsed = parse_hotspot_html(r.text)
-                _LOGGER.debug("Hotspot %s parsed name=%s location=%s", hsid, parsed.get("hotspot_name"),
-                              parsed.get("hotspot_location"))
-                parsed["hotspot"] = hsid
-                parsed["url"] = url
-                results[hsid] = parsed
-
-            await asyncio.gather(*(fetch_one(h) for h in self._hotspots))
-            return results
-        except Exception as err:
-            raise UpdateFailed(str(err)) from err
-
-    async def async_close(self):
-        await self._client.aclose()
+            ok = await asyncio.gather(*(self._async_refresh_one(h) for h in due))
+        finally:
+            self._force_fetch = False
+        if due:
+            self._last_cycle = {
+                "last_cycle_ms": round((time.perf_counter() - t0) * 1000, 1),
+                "last_cycle_hotspots": len(due),
+                "last_cycle_failed": len(due) - sum(ok),
+            }
+        self._schedule_next_tick()
+
+        results = {h: s.parsed for h, s in self._states.items() if s.parsed is not None}
+        self._changed = self._diff(self.data or {}, results)
+        # fleet aggregates only move for hotspots whose fields changed
+        for hsid in {h for h, _ in self._changed}:
+            self._changed.update((FLEET_ID, k) for k in self._aggregate.update(hsid, results.get(hsid)))
+        if self._history is not None:
+            # every successful poll is a sample, changed or not, so rates see how long a value held
+            for hsid, fetched in zip(due, ok):
+                if fetched and hsid in results:
+                    updated_at = self._states[hsid].updated_at or dt_util.utcnow()
+                    self._history.append(hsid, updated_at.timestamp(), results[hsid])
+            self._changed.update((h, HISTORY_FIELD) for h in due)
+            await self._async_write_history()
+        if due:
+            self._changed.update((h, METRICS_FIELD) for h in due)
+            self._changed.add((FLEET_ID, METRICS_FIELD))
+        if self._store is not None and any(ok):
+            self._store.async_delay_save(self._stored_data, _STORE_SAVE_DELAY)
+        if due and not any(ok) and not results:
+            errors = "; ".join(f"{h}: {self._states[h].last_error}" for h in due)
+            raise UpdateFailed(f"All hotspot refreshes failed: {errors}")
+        return results
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import HeliumCoordinator
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Per-hotspot fetch/parse instrumentation plus fleet refresh latency."""
+    coordinator: HeliumCoordinator = hass.data[DOMAIN][entry.entry_id]
+    hotspots: Dict[str, Any] = {}
+    for hsid in coordinator.hotspots:
+        state = coordinator.hotspot_state(hsid)
+        if state is None:
+            continue
+        page = coordinator.fetch_hub.page(hsid)
+        hotspots[hsid] = {
+            "updated_at": state.updated_at.isoformat() if state.updated_at else None,
+            "next_due": state.next_due.isoformat() if state.next_due else None,
+            "failures": state.failures,
+            "last_error": state.last_error,
+            "etag": page.etag if page else None,
+            "last_modified": page.last_modified if page else None,
+            "parsed_fields": sorted(page.fields) if page and page.fields is not None else "all",
+            "metrics": state.metrics,
+            "data": state.parsed,
+        }
+        if coordinator.adaptive is not None:
+            hotspots[hsid]["adaptive"] = coordinator.adaptive.describe(hsid)
+    return {
+        "options": dict(entry.options),
+        "update_interval": str(coordinator.update_interval),
+        "fleet": coordinator.fleet_metrics(),
+        "hotspots": hotspots,
+    }
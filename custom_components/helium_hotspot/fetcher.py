@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Mapping, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .client import FetchedPage
+from .const import DATA_FETCH_HUB
+from .parser import STATIC_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+# how the caller fetches (its scheduler, rate limit, streaming choice) and parses (its parse pool)
+FetchFn = Callable[[Dict[str, str]], Awaitable[FetchedPage]]
+ParseFn = Callable[[str, Optional[FrozenSet[str]]], Awaitable[Tuple[dict, dict]]]
+
+# name and location are carried over from the last parse and only re-extracted this often
+STATIC_FIELDS_MAX_AGE = timedelta(days=1)
+
+
+@dataclass
+class PageEntry:
+    """
+    Domain-wide state of one hotspot page: validators, the last parse, the fields it covers
+    (None = all), the fields each entry wants (None = all) and the fetch in flight.
+    """
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[bytes] = None
+    parsed: Optional[dict] = None
+    fields: Optional[FrozenSet[str]] = None
+    static_at: Optional[datetime] = None  # when STATIC_FIELDS were last extracted
+    fetched_at: Optional[datetime] = None
+    wanted: Dict[Optional[str], Optional[FrozenSet[str]]] = field(default_factory=dict)
+    inflight: Optional[asyncio.Future] = None
+
+    def parse_fields(self) -> Optional[FrozenSet[str]]:
+        """Union of the fields the entries polling this page want."""
+        if not self.wanted or any(f is None for f in self.wanted.values()):
+            return None
+        return frozenset().union(*self.wanted.values())
+
+    def covers(self, fields: Optional[FrozenSet[str]]) -> bool:
+        """True if the last parse has (at least) `fields`, so it can be shared or reused on 304."""
+        return self.parsed is not None and (self.fields is None or (fields is not None and fields <= self.fields))
+
+    def conditional_headers(self) -> Dict[str, str]:
+        if self.parsed is None:
+            return {}
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class FetchResult:
+    parsed: dict
+    fetched_at: datetime
+    metrics: Dict[str, Any] = field(default_factory=dict)  # status, bytes, timings, parse stats, outcome
+
+
+class FetchHub:
+    """
+    Fetches hotspot pages for every config entry. A hotspot shared by several entries
+    costs one request and one parse: callers that arrive while its fetch is in flight
+    wait for that fetch, and callers within `max_age` of the last one get its result.
+    Each entry says which fields it needs; the page is parsed for all of them.
+    """
+
+    def __init__(self):
+        self._pages: Dict[str, PageEntry] = {}
+        self.users: Set[str] = set()
+
+    def page(self, hotspot: str) -> Optional[PageEntry]:
+        return self._pages.get(hotspot)
+
+    def seed(self, hotspot: str, stored: Mapping[str, Any], updated_at: Optional[datetime]) -> None:
+        """Take validators and parse from an entry's startup cache, unless the hub already knows newer."""
+        page = self._pages.setdefault(hotspot, PageEntry())
+        if page.fetched_at is not None and (updated_at is None or updated_at <= page.fetched_at):
+            return
+        page.parsed = stored.get("parsed")
+        page.fetched_at = updated_at
+        # None: a full parse (also what caches from before field-selective parsing hold)
+        page.fields = frozenset(stored["fields"]) if stored.get("fields") is not None else None
+        page.static_at = dt_util.parse_datetime(stored["static_at"]) if stored.get("static_at") else None
+        page.etag = stored.get("etag")
+        page.last_modified = stored.get("last_modified")
+        page.body_hash = bytes.fromhex(stored["body_hash"]) if stored.get("body_hash") else None
+
+    def forget(self, consumer: Optional[str]) -> None:
+        """Drop the field wishes of an entry that is being unloaded."""
+        for page in self._pages.values():
+            page.wanted.pop(consumer, None)
+
+    async def async_fetch(
+        self,
+        hotspot: str,
+        url: str,
+        fetch: FetchFn,
+        parse: ParseFn,
+        max_age: timedelta,
+        consumer: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> FetchResult:
+        """Fetch and parse `hotspot` for `consumer` (an entry id), which needs `fields` (None = all)."""
+        page = self._pages.setdefault(hotspot, PageEntry())
+        page.wanted[consumer] = fields
+        while page.inflight is not None:
+            inflight = page.inflight
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # this caller was cancelled
+                continue  # the entry that started the fetch was unloaded; start our own
+            if page.covers(fields):
+                return replace(result, metrics={"outcome": "joined"})
+            # started before this entry asked for more fields; fetch again for all of them
+        if (page.covers(fields) and page.fetched_at is not None
+                and dt_util.utcnow() - page.fetched_at <= max_age):
+            return FetchResult(page.parsed, page.fetched_at, {"outcome": "shared"})
+
+        fut = asyncio.get_running_loop().create_future()
+        # joiners see the error themselves; don't log "exception never retrieved" when there are none
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        page.inflight = fut
+        try:
+            result = await self._async_fetch(hotspot, page, url, fetch, parse)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as err:
+            fut.set_exception(err)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            page.inflight = None
+
+    @staticmethod
+    async def _async_fetch(hotspot: str, page: PageEntry, url: str, fetch: FetchFn, parse: ParseFn) -> FetchResult:
+        metrics: Dict[str, Any] = {}
+        need = page.parse_fields()
+        # the last parse only stands in for the page (304, same body) if it has every needed field
+        reusable = page.covers(need)
+        response = await fetch(page.conditional_headers() if reusable else {})
+        metrics.update(
+            status=response.status_code, bytes=len(response.content), truncated=response.truncated,
+            fetch=response.timings,
+        )
+        now = dt_util.utcnow()
+        if response.status_code == 304 and reusable:
+            _LOGGER.debug("Hotspot %s not modified", hotspot)
+            metrics["outcome"] = "not_modified"
+            page.fetched_at = now
+            return FetchResult(page.parsed, now, metrics)
+        response.response.raise_for_status()
+        page.etag = response.headers.get("ETag")
+        page.last_modified = response.headers.get("Last-Modified")
+
+        # a truncated stream stops at the same place for identical pages, so the hash still works
+        body_hash = hashlib.blake2b(response.content, digest_size=16).digest()
+        # include what entries that joined during the download asked for
+        need = page.parse_fields()
+        if body_hash == page.body_hash and page.covers(need):
+            _LOGGER.debug("Hotspot %s page unchanged, reusing parse", hotspot)
+            metrics["outcome"] = "unchanged"
+            page.fetched_at = now
+            return FetchResult(page.parsed, now, metrics)
+
+        carried: Dict[str, Any] = {}
+        if (need is not None and page.parsed is not None and page.static_at is not None
+                and now - page.static_at < STATIC_FIELDS_MAX_AGE):
+            carried = {f: page.parsed[f] for f in STATIC_FIELDS if f in need and page.parsed.get(f) is not None}
+        parsed, metrics["parse"] = await parse(response.text, need - carried.keys() if need is not None else None)
+        metrics["outcome"] = "parsed"
+        parsed.update(carried)
+        _LOGGER.debug("Hotspot %s parsed name=%s location=%s", hotspot, parsed.get("hotspot_name"),
+                      parsed.get("hotspot_location"))
+        abandoned = metrics["parse"].get("abandoned_fields")
+        if abandoned:
+            _LOGGER.warning("Hotspot %s: gave up extracting %s (parse time budget exceeded)",
+                            hotspot, ", ".join(f"{name} ({fn})" for name, fn in sorted(abandoned.items())))
+            # the budget is wall time, so a busy executor can cause this on a fine page: keep no
+            # validators or body hash, so the next refresh downloads and parses the page again
+            page.etag = page.last_modified = None
+            body_hash = None
+        parsed["hotspot"] = hotspot
+        parsed["url"] = url
+        page.body_hash = body_hash
+        page.parsed = parsed
+        page.fields = need
+        if not carried:
+            page.static_at = now
+        page.fetched_at = dt_util.utcnow()
+        return FetchResult(parsed, page.fetched_at, metrics)
+
+
+@callback
+def async_get_fetch_hub(hass: HomeAssistant, entry_id: str) -> FetchHub:
+    """Return the domain-wide hub, creating it for the first config entry."""
+    hub: FetchHub | None = hass.data.get(DATA_FETCH_HUB)
+    if hub is None:
+        hub = hass.data[DATA_FETCH_HUB] = FetchHub()
+    hub.users.add(entry_id)
+    return hub
+
+
+@callback
+def async_release_fetch_hub(hass: HomeAssistant, entry_id: str) -> None:
+    hub: FetchHub | None = hass.data.get(DATA_FETCH_HUB)
+    if hub is None:
+        return
+    hub.users.discard(entry_id)
+    hub.forget(entry_id)
+    if not hub.users:
+        hass.data.pop(DATA_FETCH_HUB, None)
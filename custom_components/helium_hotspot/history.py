@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# one record = timestamp + these values, all float64 (NaN = not on the page)
+HISTORY_FIELDS = (
+    "tokens_earned_30d_hnt",
+    "proof_of_coverage_30d",
+    "data_transfer_30d",
+    "carrier_offload",  # bytes
+    "helium_mobile",  # bytes
+    "avg_daily_data",  # bytes
+    "avg_daily_users",
+)
+RECORD_LEN = 1 + len(HISTORY_FIELDS)
+_RECORD_BYTES = RECORD_LEN * 8
+_FIELD_INDEX = {name: i + 1 for i, name in enumerate(HISTORY_FIELDS)}
+
+_MAGIC = b"HHTS\x01\x00\x00\x00"  # format 1, little-endian float64 records
+_TRIM_SLACK = 64  # records past retention before the in-memory array is trimmed
+_COMPACT_FACTOR = 2  # rewrite a file once it holds this many times the retained records
+
+_UNIT_BYTES = {"b": 1, "kb": 1e3, "mb": 1e6, "gb": 1e9, "tb": 1e12}
+_AMOUNT_RE = re.compile(r"^\s*([0-9][0-9,]*(?:\.[0-9]+)?)\s*([kKmMgGtT]?B)?\s*$")
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def to_number(value: Any) -> float:
+    """Parsed field -> float; "824.06 MB" style amounts become bytes, missing values NaN."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return math.nan
+    m = _AMOUNT_RE.match(value)
+    if not m:
+        return math.nan
+    number = float(m.group(1).replace(",", ""))
+    return number * _UNIT_BYTES[m.group(2).lower()] if m.group(2) else number
+
+
+class _Series:
+    __slots__ = ("data", "on_disk", "pending")
+
+    def __init__(self):
+        self.data = array("d")  # flat records, oldest first
+        self.on_disk = 0  # records in the file, including ones trimmed from memory
+        self.pending = array("d")  # appended but not yet written
+
+    def __len__(self) -> int:
+        return len(self.data) // RECORD_LEN
+
+    def timestamp(self, i: int) -> float:
+        return self.data[i * RECORD_LEN]
+
+    def bisect(self, ts: float) -> int:
+        """Index of the first record newer than ts."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.data[mid * RECORD_LEN] <= ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class HotspotHistory:
+    """
+    Bounded, append-only per-hotspot series of polled values.
+    In memory every hotspot is one flat array('d'); on disk one file of raw float64 records,
+    appended to after each refresh and rewritten only when trimmed records pile up.
+    `load`, `write` and `remove_files` block; call them from an executor.
+    """
+
+    def __init__(self, directory: Path, retention_days: float):
+        self._dir = Path(directory)
+        self._retention = retention_days * 86400
+        self._series: Dict[str, _Series] = {}
+        self._io_lock = threading.Lock()
+
+    def _path(self, hotspot: str) -> Path:
+        return self._dir / f"{_SAFE_NAME_RE.sub('_', hotspot)}.bin"
+
+    def load(self, hotspots: Iterable[str]) -> int:
+        """Read the files of these hotspots; returns the number of records kept."""
+        cutoff = time.time() - self._retention
+        kept = 0
+        with self._io_lock:
+            for hotspot in hotspots:
+                series = self._series.setdefault(hotspot, _Series())
+                try:
+                    raw = self._path(hotspot).read_bytes()
+                except FileNotFoundError:
+                    continue
+                if not raw.startswith(_MAGIC):
+                    _LOGGER.warning("Ignoring unreadable history file for hotspot %s", hotspot)
+                    continue
+                body = raw[len(_MAGIC):]
+                torn = len(body) % _RECORD_BYTES  # an interrupted write
+                data = array("d", body[:len(body) - torn])
+                if sys.byteorder == "big":
+                    data.byteswap()
+                # appending after a torn tail would misalign every later record: rewrite instead
+                series.on_disk = 0 if torn else len(data) // RECORD_LEN
+                series.data = data
+                self._trim(series, cutoff, slack=0)
+                kept += len(series)
+        return kept
+
+    def append(self, hotspot: str, ts: float, values: Mapping[str, Any]) -> None:
+        """Record one poll in memory; `take_pending` + `write` persist it."""
+        series = self._series.setdefault(hotspot, _Series())
+        if len(series) and ts <= series.timestamp(len(series) - 1):
+            return  # restored/replayed data, already recorded
+        record = [ts] + [to_number(values.get(name)) for name in HISTORY_FIELDS]
+        series.data.extend(record)
+        series.pending.extend(record)
+        self._trim(series, ts - self._retention, slack=_TRIM_SLACK)
+
+    @staticmethod
+    def _trim(series: _Series, cutoff: float, slack: int) -> None:
+        if len(series) > slack and series.timestamp(slack) < cutoff:
+            del series.data[:series.bisect(cutoff) * RECORD_LEN]
+
+    def take_pending(self) -> List[Tuple[str, bytes, bool]]:
+        """
+        Hand over unwritten records as (hotspot, bytes, rewrite) for `write`. Called on the
+        event loop so appends never race the writer; `rewrite` replaces the file (new or compacted).
+        """
+        batch = []
+        for hotspot, series in self._series.items():
+            if not series.pending:
+                continue
+            count = len(series.pending) // RECORD_LEN
+            if not series.on_disk or series.on_disk + count > _COMPACT_FACTOR * max(len(series), _TRIM_SLACK):
+                batch.append((hotspot, self._bytes(series.data), True))
+                series.on_disk = len(series)
+            else:
+                batch.append((hotspot, self._bytes(series.pending), False))
+                series.on_disk += count
+            series.pending = array("d")
+        return batch
+
+    def write(self, batch: List[Tuple[str, bytes, bool]]) -> None:
+        with self._io_lock:
+            try:
+                self._dir.mkdir(parents=True, exist_ok=True)
+                for hotspot, payload, rewrite in batch:
+                    path = self._path(hotspot)
+                    if rewrite:
+                        tmp = path.with_suffix(".tmp")
+                        with tmp.open("wb") as fh:
+                            fh.write(_MAGIC)
+                            fh.write(payload)
+                        os.replace(tmp, path)
+                    else:
+                        with path.open("ab") as fh:
+                            fh.write(payload)
+            except OSError as err:
+                _LOGGER.warning("Could not write hotspot history to %s: %s", self._dir, err)
+
+    @staticmethod
+    def _bytes(data: array) -> bytes:
+        if sys.byteorder == "big":
+            data = array("d", data)
+            data.byteswap()
+        return data.tobytes()
+
+    def remove_files(self, prune_parents: int = 0) -> None:
+        """Delete the files and the directory, then up to `prune_parents` parent directories left empty."""
+        with self._io_lock:
+            for pattern in ("*.bin", "*.tmp"):
+                for path in self._dir.glob(pattern):
+                    path.unlink(missing_ok=True)
+            for directory in [self._dir, *self._dir.parents][:1 + prune_parents]:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+
+    # --- queries (event loop safe, in memory only) ---
+
+    def latest(self, hotspot: str, field: str) -> Optional[Tuple[float, float]]:
+        series = self._series.get(hotspot)
+        if not series:
+            return None
+        i = _FIELD_INDEX[field]
+        for n in range(len(series) - 1, -1, -1):
+            value = series.data[n * RECORD_LEN + i]
+            if not math.isnan(value):
+                return series.timestamp(n), value
+        return None
+
+    def value_at(self, hotspot: str, field: str, ts: float) -> Optional[float]:
+        """Last known value at or before ts; None if history does not reach back that far."""
+        series = self._series.get(hotspot)
+        if not series:
+            return None
+        i = _FIELD_INDEX[field]
+        for n in range(series.bisect(ts) - 1, -1, -1):
+            value = series.data[n * RECORD_LEN + i]
+            if not math.isnan(value):
+                return value
+        return None
+
+    def window(self, hotspot: str, field: str, since: float, until: Optional[float] = None) -> List[Tuple[float, float]]:
+        """(timestamp, value) samples in (since, until]."""
+        series = self._series.get(hotspot)
+        if not series:
+            return []
+        i = _FIELD_INDEX[field]
+        end = series.bisect(until) if until is not None else len(series)
+        out = []
+        for n in range(series.bisect(since), end):
+            value = series.data[n * RECORD_LEN + i]
+            if not math.isnan(value):
+                out.append((series.timestamp(n), value))
+        return out
+
+    def change(self, hotspot: str, field: str, seconds: float, now: Optional[float] = None) -> Optional[float]:
+        """Latest value minus the value `seconds` ago."""
+        latest = self.latest(hotspot, field)
+        if latest is None:
+            return None
+        before = self.value_at(hotspot, field, (now or time.time()) - seconds)
+        return None if before is None else latest[1] - before
+
+    def records(self, hotspot: str) -> int:
+        series = self._series.get(hotspot)
+        return len(series) if series else 0
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Collection, Iterator, List, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_PROCESS_POOL, PARSER_MODE_PROCESS
+from .parser import parse_batch
+
+_LOGGER = logging.getLogger(__name__)
+
+PARSE_BATCH_SIZE = 8
+PARSE_BATCH_WINDOW = 0.05  # seconds to wait for more pages before sending a partial batch
+
+# Worker processes get parser.py as a top-level module of its own: a function of this package
+# is pickled by reference, and unpickling it would import the package, whose __init__ imports
+# Home Assistant. The loader is run with exec() because anything else would be pickled by
+# reference to this package too.
+_WORKER_PARSER = "helium_hotspot_parser"
+_LOAD_WORKER_PARSER = (
+    "import importlib.util, sys\n"
+    "if name not in sys.modules:\n"
+    "    spec = importlib.util.spec_from_file_location(name, path)\n"
+    "    module = importlib.util.module_from_spec(spec)\n"
+    "    sys.modules[name] = module\n"
+    "    spec.loader.exec_module(module)\n"
+)
+
+
+def _worker_parser_names() -> dict:
+    return {"name": _WORKER_PARSER, "path": str(Path(__file__).with_name("parser.py"))}
+
+
+def _worker_parse_batch() -> Callable:
+    """parse_batch of the top-level parser module, loaded here too so it pickles under that name."""
+    exec(_LOAD_WORKER_PARSER, _worker_parser_names())
+    return sys.modules[_WORKER_PARSER].parse_batch
+
+
+@dataclass
+class _SharedProcessPool:
+    executor: ProcessPoolExecutor
+    users: Set[str] = field(default_factory=set)
+
+
+def _create_process_pool() -> ProcessPoolExecutor:
+    # spawn: forking the whole Home Assistant process (threads, sockets) is not safe
+    workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+    _worker_parse_batch()  # reads parser.py; done here, in the executor, not by ParsePool on the loop
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=exec, initargs=(_LOAD_WORKER_PARSER, _worker_parser_names()))
+
+
+async def async_get_parse_executor(hass: HomeAssistant, entry_id: str, mode: str) -> Optional[Executor]:
+    """Executor for the chosen parser mode; None means Home Assistant's default thread pool."""
+    if mode != PARSER_MODE_PROCESS:
+        return None
+    shared: _SharedProcessPool | None = hass.data.get(DATA_PROCESS_POOL)
+    if shared is None:
+        shared = _SharedProcessPool(await hass.async_add_executor_job(_create_process_pool))
+        hass.data[DATA_PROCESS_POOL] = shared
+        _LOGGER.debug("Started parser process pool")
+    shared.users.add(entry_id)
+    return shared.executor
+
+
+async def async_release_parse_executor(hass: HomeAssistant, entry_id: str) -> None:
+    shared: _SharedProcessPool | None = hass.data.get(DATA_PROCESS_POOL)
+    if shared is None:
+        return
+    shared.users.discard(entry_id)
+    if not shared.users:
+        hass.data.pop(DATA_PROCESS_POOL, None)
+        await hass.async_add_executor_job(shared.executor.shutdown)
+        _LOGGER.debug("Stopped parser process pool")
+
+
+class ParsePool:
+    """
+    Parses pages off the event loop. Pages arriving close together are sent to a worker
+    as one batch; each caller gets its result as soon as its own batch is done.
+    """
+
+    def __init__(self, hass: HomeAssistant, executor: Optional[Executor] = None,
+                 batch_size: int = PARSE_BATCH_SIZE):
+        self._hass = hass
+        self._executor = executor
+        self._batch_size = batch_size
+        self._pending: List[Tuple[str, Optional[Collection[str]], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inline = False
+        self._parse_batch = _worker_parse_batch() if isinstance(executor, ProcessPoolExecutor) else parse_batch
+
+    @contextmanager
+    def inline(self) -> Iterator[None]:
+        """Parse on the event loop while active, so a profiler running there sees the parser."""
+        self._inline = True
+        try:
+            yield
+        finally:
+            self._inline = False
+
+    async def async_parse(self, raw: str, fields: Optional[Collection[str]] = None) -> Tuple[dict, dict]:
+        """Return (parsed, stats) for one page; see parser.parse_hotspot_html for fields and stats."""
+        fut = self._hass.loop.create_future()
+        self._pending.append((raw, fields, fut))
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(PARSE_BATCH_WINDOW, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._hass.async_create_task(self._async_run(batch))
+
+    async def _async_run(self, batch: List[Tuple[str, Optional[Collection[str]], asyncio.Future]]) -> None:
+        pages, fields = [raw for raw, _, _ in batch], [fields for _, fields, _ in batch]
+        try:
+            if self._inline:
+                results = parse_batch(pages, fields)
+            else:
+                results = await self._hass.loop.run_in_executor(self._executor, self._parse_batch, pages, fields)
+        except Exception as err:
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(err)
+            return
+        for (_, _, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
@@ -1,6 +1,8 @@
 import html
+import json
 import re
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 NUM  = r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?'
 UNIT = r'(?:[KMGTP]?B)'
@@ -9,16 +11,28 @@ UNIT = r'(?:[KMGTP]?B)'
 POC_FLOAT_RE = re.compile(r'"label"\s*:\s*"Proof Of Coverage"\s*,\s*"value"\s*:\s*("?)(%s)\1' % NUM, re.S)
 DT_FLOAT_RE  = re.compile(r'"label"\s*:\s*"Data Transfer"\s*,\s*"value"\s*:\s*("?)(%s)\1'  % NUM, re.S)
 
-# Display fallback in “Tokens Earned” card
-TOKENS_DISPLAY_RE = re.compile(
-    r'"Tokens Earned".{0,6000}?"children"\s*:\s*\[\s*\[\s*"\$"\s*,\s*"svg"[^]]*?\]\s*,\s*"(%s)"' % NUM,
-    re.S,
-)
+# Display fallback in “Tokens Earned” card, found by the scan in _find_tokens_display
+TOKENS_ANCHOR = '"Tokens Earned"'
+TOKENS_WINDOW = 6000
+SVG_MARK = '"svg"'
+_SVG_PREFIX_MAX = 80
+SVG_PREFIX_RE = re.compile(r'"children"\s*:\s*\[\s*\[\s*"\$"\s*,\s*$')
+TOKENS_VALUE_RE = re.compile(r'\]\s*,\s*"(%s)"' % NUM)
+
+# Every pattern below has bounded repeats (or none that can overlap), so one search
+# costs at most O(page) and one match attempt O(bound); see benchmarks/fuzz_parser.py.
 
-# Data amounts in lineItems
-LINEITEMS_RE = re.compile(r'"lineItems"\s*:\s*\[(.*?)\]', re.S)
-PAIR_IN_BLOCK_RE = re.compile(r'\{\s*"label"\s*:\s*"(.*?)"\s*,\s*"value"\s*:\s*"(.*?)"\s*\}', re.S)
+# Data amounts in lineItems. _iter_lineitems finds the bodies from the heads and the
+# (remembered) next `]`, so dense unclosed heads stay cheap.
+LINEITEMS_HEAD_RE = re.compile(r'"lineItems"\s*:\s*\[')
+_LINEITEMS_MAX = 4000
+PAIR_IN_BLOCK_RE = re.compile(r'\{\s*"label"\s*:\s*"([^"]{0,200})"\s*,\s*"value"\s*:\s*"([^"]{0,200})"\s*\}')
 VALUE_WITH_UNITS_RE = re.compile(r'^\s*%s\s*%s\s*$' % (NUM, UNIT), re.I)
+# per-object fallback: head + tail, so the tail is only tried where it can match (_search_object)
+CO_HEAD_RE = re.compile(r'\{\s*"label"\s*:\s*"Carrier Offload"')
+HM_HEAD_RE = re.compile(r'\{\s*"label"\s*:\s*"Helium Mobile"')
+OBJ_VALUE_TAIL_RE = re.compile(r'[^}]{0,400}?"value"\s*:\s*"([^"]{0,200})"\s*\}')
+_OBJ_KEY_REACH = 400
 
 # Avg daily meta
 META_RE = re.compile(
@@ -26,83 +40,235 @@ META_RE = re.compile(
     re.I
 )
 
-# Hotspot friendly name (e.g., "Raspy Cedar Parakeet")
-HOTSPOT_NAME_RE = re.compile(
-    r'<div[^>]*class="[^"]*text-3xl[^"]*"[^>]*>(.*?)</div>', re.S
-)
+# Hotspot friendly name (e.g., "Raspy Cedar Parakeet"): the text of the large title div.
+# The whole-page name/location searches try these tag patterns only at the `<div`s that
+# can match (see _iter_div_tags), then look for the text after the tag.
+NAME_TAG_RE = re.compile(r'[^>]{0,300}?class="[^"]{0,300}?text-3xl[^"]{0,300}"[^>]{0,300}>')
+_NAME_MARK_REACH = 607  # text-3xl starts at most this far into the attributes
+_NAME_TEXT_MAX = 2000
+_DIV_TAG_MAX = 920  # first `>` of a matching tag is at most this far into the attributes
 
-# Hotspot name block (large title)
-HOTSPOT_NAME_DIV_RE = re.compile(
-    r'<div[^>]*class="[^"]*text-3xl[^"]*"[^>]*>(.*?)</div>',
-    re.S
-)
+# After the name div, the next short text-y div often contains "City, State[, Country]".
+# Candidates are any short tag-free div text; LOCATION_TEXT_RE decides on the stripped text.
+LOCATION_IN_WINDOW_RE = re.compile(r'<div[^>]{0,300}>([^<>]{3,160})</div>')
 
-# After the name div, the next short text-y div often contains "City, State[, Country]"
-# We grab a window right after the name and look for a simple comma-separated location.
-LOCATION_IN_WINDOW_RE = re.compile(
-    r'<div[^>]*>\s*([A-Za-z0-9\s\.\'\-\u00C0-\u024F]+,\s*[A-Za-z0-9\s\.\'\-\u00C0-\u024F]+(?:,\s*[A-Za-z0-9\s\.\'\-\u00C0-\u024F]+)?)\s*</div>',
-    re.S
-)
+# Fallback: any short-ish classed div anywhere that looks like "City, State[, Country]"
+LOCATION_TAG_RE = re.compile(r'[^>]{0,300}?class="[^"]{0,300}"[^>]{0,300}>')
+_LOCATION_MARK_REACH = 300
+LOCATION_TEXT_AFTER_RE = re.compile(r'([^<>]{3,160})</div>')
 
-# Fallback: any short-ish div anywhere that looks like "City, State[, Country]"
-LOCATION_GLOBAL_RE = re.compile(
-    r'<div[^>]*class="[^"]*"[^>]*>\s*([A-Za-z0-9\s\.\'\-\u00C0-\u024F]+,\s*[A-Za-z0-9\s\.\'\-\u00C0-\u024F]+(?:,\s*[A-Za-z0-9\s\.\'\-\u00C0-\u024F]+)?)\s*</div>',
-    re.S
-)
+LOCATION_CHARS = r"[A-Za-z0-9\s\.'\-\u00C0-\u024F]"
+LOCATION_TEXT_RE = re.compile(r"^%s+,\s*%s+(?:,\s*%s+)?$" % ((LOCATION_CHARS,) * 3))
 
 TAG_STRIP_RE = re.compile(r'<[^>]+>')
 
 
+class BudgetExceeded(Exception):
+    """An extractor ran past its time or step budget and gave up."""
+
+
+# per extractor call; generous for multi-MB pages, small enough that a hostile layout
+# cannot pin a core for long on every poll
+FIELD_BUDGET_MS = 250.0
+FIELD_BUDGET_STEPS = 20000
+
+
+class Budget:
+    """Time/step allowance for one extractor; `spend` raises BudgetExceeded once it is used up."""
+
+    __slots__ = ("deadline", "steps")
+
+    def __init__(self, ms: float = FIELD_BUDGET_MS, steps: int = FIELD_BUDGET_STEPS):
+        self.deadline = time.perf_counter() + ms / 1000
+        self.steps = steps
+
+    def spend(self, steps: int = 1) -> None:
+        self.steps -= steps
+        if self.steps < 0 or time.perf_counter() > self.deadline:
+            raise BudgetExceeded
+
+
+def _spend(budget: Optional[Budget], steps: int = 1) -> None:
+    if budget is not None:
+        budget.spend(steps)
+
+
 def _strip_tags(s: str) -> str:
     return TAG_STRIP_RE.sub('', s or '').strip()
 
 
-def extract_hotspot_name(corpora: List[str]) -> Optional[str]:
+def _location_text(candidate: str) -> Optional[str]:
+    loc = ' '.join(_strip_tags(html.unescape(candidate)).split())
+    if ',' in loc and 3 <= len(loc) <= 120 and LOCATION_TEXT_RE.match(loc):
+        return loc
+    return None
+
+
+def _iter_div_tags(
+    t: str, marker: str, reach: int, tag_re: "re.Pattern[str]", budget: Optional[Budget] = None
+) -> Iterator[int]:
+    """
+    End of every `tag_re` match right after a `<div`, in order. `tag_re` is only tried where
+    `marker` starts within `reach` and a `>` within _DIV_TAG_MAX; the next of each is
+    remembered across tags, so a page full of unclosed tags costs one pass, not one per tag.
+    """
+    gt = mark = 0
+    pos = t.find("<div")
+    while pos >= 0:
+        attrs = pos + 4
+        if gt < attrs:
+            gt = t.find(">", attrs)
+            if gt < 0:
+                return
+        if mark < attrs:
+            mark = t.find(marker, attrs)
+            if mark < 0:
+                return
+        if mark - attrs <= reach and gt - attrs <= _DIV_TAG_MAX:
+            _spend(budget, 0)
+            m = tag_re.match(t, attrs)
+            if m:
+                yield m.end()
+        pos = t.find("<div", attrs)
+
+
+def _find_name_div(t: str, budget: Optional[Budget] = None) -> Optional[Tuple[int, int]]:
+    """(start, end) of the text of the first name div (NAME_TAG_RE) closed within _NAME_TEXT_MAX."""
+    close = 0
+    for start in _iter_div_tags(t, "text-3xl", _NAME_MARK_REACH, NAME_TAG_RE, budget):
+        if 0 <= close < start:
+            close = t.find("</div>", start)
+        if close < 0:
+            return None
+        if close - start <= _NAME_TEXT_MAX:
+            return start, close
+    return None
+
+
+def extract_hotspot_name(corpora: Iterable[str], budget: Optional[Budget] = None) -> Optional[str]:
     for t in corpora:
-        m = HOTSPOT_NAME_DIV_RE.search(t)
-        if m:
-            return _strip_tags(html.unescape(m.group(1)))
+        _spend(budget)
+        span = _find_name_div(t, budget)
+        if span:
+            return _strip_tags(html.unescape(t[span[0]:span[1]]))
     return None
 
 
-def extract_hotspot_location(corpora: List[str]) -> Optional[str]:
+def extract_hotspot_location(corpora: Iterable[str], budget: Optional[Budget] = None) -> Optional[str]:
     # Try: find the name block and scan the next ~800 chars for a comma-separated location
     for t in corpora:
-        m = HOTSPOT_NAME_DIV_RE.search(t)
-        if not m:
+        _spend(budget)
+        span = _find_name_div(t, budget)
+        if not span:
             continue
-        start = m.end()
-        window = t[start:start+800]
-        m_loc = LOCATION_IN_WINDOW_RE.search(window)
-        if m_loc:
-            loc = _strip_tags(html.unescape(m_loc.group(1)))
-            # sanity checks: contains comma(s) and not too long
-            if ',' in loc and 3 <= len(loc) <= 120:
-                return ' '.join(loc.split())
+        end = span[1] + len("</div>")
+        for m_loc in LOCATION_IN_WINDOW_RE.finditer(t, end, end + 800):
+            _spend(budget)
+            loc = _location_text(m_loc.group(1))
+            if loc:
+                return loc
 
     # Fallback: search globally for a short comma-separated location-looking div
     for t in corpora:
-        for m in LOCATION_GLOBAL_RE.finditer(t):
-            loc = _strip_tags(html.unescape(m.group(1)))
-            if ',' in loc and 3 <= len(loc) <= 120:
-                return ' '.join(loc.split())
+        for start in _iter_div_tags(t, 'class="', _LOCATION_MARK_REACH, LOCATION_TAG_RE, budget):
+            m = LOCATION_TEXT_AFTER_RE.match(t, start)
+            if not m:
+                continue
+            _spend(budget)
+            loc = _location_text(m.group(1))
+            if loc:
+                return loc
 
     return None
 
-def build_corpus(raw: str) -> List[str]:
-    v1 = raw
-    v2 = html.unescape(raw)
-    v3 = (
-        v2.replace(r"\\n", " ")
-          .replace(r"\\t", " ")
-          .replace("\\/", "/")
-          .replace('\\"', '"')
+CORPUS_VARIANT_NAMES = ("raw", "unescaped", "deescaped")
+CORPUS_VARIANTS = len(CORPUS_VARIANT_NAMES)
+
+
+class Corpus:
+    """
+    The raw page plus its html-unescaped and de-escaped variants.
+    Variants are built the first time an iteration reaches them and cached for the rest of
+    the parse; a variant identical to the previous one is skipped instead of rescanned.
+    """
+
+    __slots__ = ("_variants", "position")
+
+    def __init__(self, raw: str):
+        self._variants: List[str] = [raw]
+        # index of the variant most recently handed out; extractors iterate lazily and return on
+        # a hit, so right after one it is the variant the match came from
+        self.position = 0
+
+    def _build(self, index: int) -> str:
+        prev = self._variants[index - 1]
+        if index == 1:
+            return html.unescape(prev)
+        return _deescape(prev)
+
+    def variant(self, index: int) -> str:
+        while len(self._variants) <= index:
+            self._variants.append(self._build(len(self._variants)))
+        return self._variants[index]
+
+    def __iter__(self) -> Iterator[str]:
+        prev = None
+        for i in range(CORPUS_VARIANTS):
+            t = self.variant(i)
+            if t is not prev:
+                self.position = i
+                yield t
+            prev = t
+
+
+def _deescape(s: str) -> str:
+    if "\\" not in s:
+        return s
+    return (
+        s.replace(r"\\n", " ")
+         .replace(r"\\t", " ")
+         .replace("\\/", "/")
+         .replace('\\"', '"')
     )
-    return [v1, v2, v3]
 
-def extract_tokens_hnt(corpora: List[str]) -> Tuple[Optional[float], Optional[float], Optional[float], str]:
+
+def build_corpus(raw: str) -> Corpus:
+    return Corpus(raw)
+
+def _find_tokens_display(t: str, budget: Optional[Budget] = None) -> Optional[str]:
+    """
+    The displayed total, in one linear scan: the first svg child within TOKENS_WINDOW of a
+    "Tokens Earned" whose closing `]` is followed by the number. Every svg and `]` is
+    looked at once, however many cards overlap.
+    """
+    checked = 0  # svg marks before this were already tried for an earlier card
+    pos = t.find(TOKENS_ANCHOR)
+    while pos >= 0:
+        start = pos + len(TOKENS_ANCHOR)
+        limit = start + TOKENS_WINDOW + _SVG_PREFIX_MAX
+        svg = t.find(SVG_MARK, max(start, checked))
+        while 0 <= svg < limit:
+            _spend(budget)
+            if SVG_PREFIX_RE.search(t, max(start, svg - _SVG_PREFIX_MAX), svg):
+                close = t.find("]", svg + len(SVG_MARK))
+                if close < 0:
+                    return None  # nothing after this can close an svg child either
+                m = TOKENS_VALUE_RE.match(t, close)
+                if m:
+                    return m.group(1)
+                # any later svg before `close` ends at the same `]`
+                svg = t.find(SVG_MARK, close)
+                continue
+            svg = t.find(SVG_MARK, svg + len(SVG_MARK))
+        checked = svg if svg >= 0 else len(t)
+        pos = t.find(TOKENS_ANCHOR, start)
+    return None
+
+
+def extract_tokens_hnt(corpora: Iterable[str], budget: Optional[Budget] = None) -> Tuple[Optional[float], Optional[float], Optional[float], str]:
     poc = dt = None
     for t in corpora:
+        _spend(budget)
         if poc is None:
             m = POC_FLOAT_RE.search(t)
             if m:
@@ -116,51 +282,681 @@ def extract_tokens_hnt(corpora: List[str]) -> Tuple[Optional[float], Optional[fl
         if poc is not None and dt is not None:
             return poc, dt, round(poc + dt, 3), "sum"
     for t in corpora:
-        m = TOKENS_DISPLAY_RE.search(t)
-        if m:
-            try: return poc, dt, round(float(m.group(1)), 3), "display"
+        value = _find_tokens_display(t, budget)
+        if value is not None:
+            try: return poc, dt, round(float(value), 3), "display"
             except: pass
     return poc, dt, None, "none"
 
-def extract_data_amounts(corpora: List[str]) -> Tuple[Optional[str], Optional[str]]:
+def _iter_lineitems(t: str, budget: Optional[Budget] = None) -> Iterator[str]:
+    """The bodies of `"lineItems": [...]` arrays up to _LINEITEMS_MAX long, in one pass over `t`."""
+    close = resume = 0
+    for m in LINEITEMS_HEAD_RE.finditer(t):
+        start = m.end()
+        if m.start() < resume:
+            continue  # inside the previous body
+        if 0 <= close < start:
+            close = t.find("]", start)
+        if close < 0:
+            return
+        if close - start <= _LINEITEMS_MAX:
+            _spend(budget)
+            yield t[start:close]
+            resume = close + 1
+
+
+def _search_object(head_re: "re.Pattern[str]", t: str, budget: Optional[Budget] = None) -> Optional["re.Match[str]"]:
+    """
+    First `{"label": <head>, ..., "value": "..."}` object (group 1 = value). The tail is
+    only tried after heads with a `"value"` key in reach before the next `}`; both positions
+    are remembered across heads.
+    """
+    brace = key = 0
+    for m in head_re.finditer(t):
+        after = m.end()
+        if 0 <= brace < after:
+            brace = t.find("}", after)
+        if 0 <= key < after:
+            key = t.find('"value"', after)
+        if brace < 0 or key < 0:
+            return None
+        if key < brace and key - after <= _OBJ_KEY_REACH:
+            _spend(budget, 0)
+            tail = OBJ_VALUE_TAIL_RE.match(t, after)
+            if tail:
+                return tail
+    return None
+
+
+def extract_data_amounts(corpora: Iterable[str], budget: Optional[Budget] = None) -> Tuple[Optional[str], Optional[str]]:
     for t in corpora:
-        for m in LINEITEMS_RE.finditer(t):
-            body = m.group(1)
+        for body in _iter_lineitems(t, budget):
             pairs = dict(PAIR_IN_BLOCK_RE.findall(body))
             co = pairs.get("Carrier Offload")
             hm = pairs.get("Helium Mobile")
             if co and hm and VALUE_WITH_UNITS_RE.match(co) and VALUE_WITH_UNITS_RE.match(hm):
                 return co.strip(), hm.strip()
     # fallback per-object
-    CO_OBJ_RE = re.compile(r'\{\s*"label"\s*:\s*"Carrier Offload"[^}]*"value"\s*:\s*"(.*?)"\s*\}', re.S)
-    HM_OBJ_RE = re.compile(r'\{\s*"label"\s*:\s*"Helium Mobile"[^}]*"value"\s*:\s*"(.*?)"\s*\}', re.S)
     for t in corpora:
-        co_m = CO_OBJ_RE.search(t)
-        hm_m = HM_OBJ_RE.search(t)
+        _spend(budget)
+        co_m = _search_object(CO_HEAD_RE, t, budget)
+        hm_m = _search_object(HM_HEAD_RE, t, budget)
         co = co_m.group(1).strip() if co_m else None
         hm = hm_m.group(1).strip() if hm_m else None
         if co and hm and VALUE_WITH_UNITS_RE.match(co) and VALUE_WITH_UNITS_RE.match(hm):
             return co, hm
     return None, None
 
-def extract_avg_daily(corpora: List[str]) -> Tuple[Optional[str], Optional[str]]:
+def extract_avg_daily(corpora: Iterable[str], budget: Optional[Budget] = None) -> Tuple[Optional[str], Optional[str]]:
     for t in corpora:
+        _spend(budget)
         m = META_RE.search(t)
         if m:
             return f"{m.group(1)} {m.group(2)}", m.group(3)
     return None, None
 
-def parse_hotspot_html(raw_html: str) -> Dict[str, Optional[str]]:
+# ==================== Flight payload (Next.js RSC) ====================
+# The page streams its React tree as `self.__next_f.push([1,"<rows>"])` script
+# chunks. Concatenated, the strings form rows of `<hex id>:<json>\n` (or
+# `<hex id>:T<hex len>,<text>` for long text). Decoding them gives us the same
+# label/value objects the regexes above dig out of the escaped markup. Rows are
+# read chunk by chunk, so only the row in progress is held, and the caller can
+# stop as soon as it has what it came for.
+
+FLIGHT_PUSH = "self.__next_f.push("
+FLIGHT_ROW_ID_RE = re.compile(r'[0-9a-fA-F]*')
+# JSON rows never hold a raw newline, so a newline followed by `<id>:T` is the next text row
+FLIGHT_TEXT_ROW_RE = re.compile(r'\n[0-9a-fA-F]*:T')
+NUM_FULL_RE = re.compile(r'^\s*%s\s*$' % NUM)
+# rows without any of these cannot hold a field we read
+FLIGHT_ROW_MARKERS = ('"label"', '"lineItems"', 'text-3xl', '"Tokens Earned"', 'og:description')
+
+_JSON = json.JSONDecoder()
+
+
+def iter_flight_chunks(raw: str) -> Iterator[str]:
+    """Yield the string payload of every `self.__next_f.push([1, "..."])` call."""
+    # Each call is decoded from its own slice (up to its </script> or the next call): a
+    # failed decode scans, and its JSONDecodeError counts lines, only up to the slice end.
+    script_end = 0
+    pos = raw.find(FLIGHT_PUSH)
+    while pos >= 0:
+        start = pos + len(FLIGHT_PUSH)
+        nxt = raw.find(FLIGHT_PUSH, start)
+        if 0 <= script_end < start:
+            script_end = raw.find("</script>", start)
+        end = len(raw) if nxt < 0 else nxt
+        if script_end >= 0:
+            end = min(end, script_end)
+        try:
+            chunk, _ = _JSON.raw_decode(raw[start:end])
+        except ValueError:
+            pass
+        else:
+            if isinstance(chunk, list) and len(chunk) >= 2 and chunk[0] == 1 and isinstance(chunk[1], str):
+                yield chunk[1]
+        pos = nxt
+
+
+def _utf8_skip(s: str, start: int, nbytes: int) -> Tuple[int, int]:
+    """
+    Skip `nbytes` UTF-8 bytes of `s` from `start` (T rows are byte-counted); returns the
+    index reached and the bytes still to skip when `s` ends first.
+    """
+    end = start + nbytes
+    if s[start:end].isascii():
+        return min(end, len(s)), max(0, end - len(s))
+    i = start
+    n = len(s)
+    while nbytes > 0 and i < n:
+        nbytes -= len(s[i].encode("utf-8", "surrogatepass"))
+        i += 1
+    return i, max(0, nbytes)
+
+
+def _scan_flight_rows(buf: str, markers: Tuple[str, ...], rows: List[Any]) -> Tuple[int, int]:
+    """
+    Append the decoded rows of `buf` (which starts at a row) to `rows`. Returns where the
+    unfinished row starts, and how many bytes of a text row run on past the end of `buf`.
+    """
+    needles = markers or ("",)  # no markers: every row
+    pos = 0
+    n = len(buf)
+    while pos < n:
+        colon = buf.find(":", pos)
+        if colon < 0:
+            return pos, 0
+        if buf.startswith("T", colon + 1) and FLIGHT_ROW_ID_RE.fullmatch(buf, pos, colon):
+            comma = buf.find(",", colon + 2)
+            if comma < 0:
+                return pos, 0
+            try:
+                length = int(buf[colon + 2:comma], 16)
+            except ValueError:
+                length = 0
+            pos, left = _utf8_skip(buf, comma + 1, length)
+            if left:
+                return n, left
+            continue
+        # up to the next text row every newline ends a row: decode only the rows around marker hits
+        text_row = FLIGHT_TEXT_ROW_RE.search(buf, pos)
+        stop = text_row.start() + 1 if text_row else buf.rfind("\n", pos) + 1
+        if stop <= pos:
+            return pos, 0
+        hits = [buf.find(m, pos, stop) for m in needles]
+        while pos < stop and max(hits) >= 0:
+            hit = min(h for h in hits if h >= 0)
+            row = buf.rfind("\n", pos, hit) + 1 or pos
+            nl = buf.find("\n", hit, stop)
+            colon = buf.find(":", row, nl)
+            if (colon >= 0 and FLIGHT_ROW_ID_RE.fullmatch(buf, row, colon)
+                    and buf[colon + 1:colon + 2] in ('[', '{', '"')):
+                try:
+                    rows.append(json.loads(buf[colon + 1:nl]))
+                except ValueError:
+                    pass
+            pos = nl + 1
+            # a marker is searched for again only once its last hit is behind us
+            hits = [h if h >= pos or h < 0 else buf.find(m, pos, stop) for h, m in zip(hits, needles)]
+        pos = stop
+    return pos, 0
+
+
+def iter_flight_rows(chunks: Iterable[str], markers: Tuple[str, ...] = ()) -> Iterator[Any]:
+    """
+    Yield decoded JSON rows of a flight stream, fed chunk by chunk; hints, imports and text
+    rows are skipped. With `markers`, rows containing none of them are skipped without being
+    decoded. Only the row in progress is buffered.
+    """
+    parts: List[str] = []
+    text_left = 0  # bytes of a text row that continue in the next chunks
+    for chunk in chunks:
+        if text_left:
+            end, text_left = _utf8_skip(chunk, 0, text_left)
+            chunk = chunk[end:]
+        parts.append(chunk)
+        if "\n" not in chunk:
+            continue  # no row ends here
+        buf = "".join(parts)
+        rows: List[Any] = []
+        pos, text_left = _scan_flight_rows(buf, markers, rows)
+        parts = [buf[pos:]] if pos < len(buf) else []
+        yield from rows
+    if parts:
+        rows = []
+        _scan_flight_rows("".join(parts) + "\n", markers, rows)
+        yield from rows
+
+
+def _is_element(node: Any, tag: Optional[str] = None) -> bool:
+    return (
+        isinstance(node, list) and len(node) >= 4 and node[0] == "$"
+        and isinstance(node[1], str) and isinstance(node[3], dict)
+        and (tag is None or node[1] == tag)
+    )
+
+
+def _element_text(node: Any) -> str:
+    """Concatenated text of a rendered node (strings inside element children)."""
+    parts: List[str] = []
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, str):
+            if not cur.startswith("$"):
+                parts.append(cur)
+        elif _is_element(cur):
+            stack.append(cur[3].get("children"))
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
+    return " ".join(" ".join(parts).split())
+
+
+def _find_location(siblings: List[Any]) -> Optional[str]:
+    for sib in siblings:
+        stack = [sib]
+        while stack:
+            cur = stack.pop()
+            if _is_element(cur, "div"):
+                children = cur[3].get("children")
+                if isinstance(children, str):
+                    loc = " ".join(children.split())
+                    if ',' in loc and 3 <= len(loc) <= 120 and LOCATION_TEXT_RE.match(loc):
+                        return loc
+                stack.append(children)
+            elif isinstance(cur, list):
+                stack.extend(reversed(cur))
+    return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and NUM_FULL_RE.match(value):
+        return float(value)
+    return None
+
+
+def extract_flight_fields(
+    raw: str,
+    wanted: Optional[Collection[str]] = None,
+    budget: Optional[Budget] = None,
+) -> Dict[str, Any]:
+    """
+    Decode the embedded flight payload and read the hotspot fields from the tree, stopping
+    at the first row after which every field in `wanted` (default: all) has been found.
+    Only fields that were found are returned; callers fall back to the regexes for the rest.
+    """
+    found: Dict[str, Any] = {}
+    tokens_card = False
+    for row in iter_flight_rows(iter_flight_chunks(raw), FLIGHT_ROW_MARKERS):
+        _spend(budget)
+        # iterative pre-order walk, document order
+        stack: List[Any] = [row]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                if node == "Tokens Earned":
+                    tokens_card = True
+                continue
+            if isinstance(node, dict):
+                label = node.get("label")
+                if label == "Proof Of Coverage" and "proof_of_coverage_30d" not in found:
+                    poc = _to_float(node.get("value"))
+                    if poc is not None:
+                        found["proof_of_coverage_30d"] = poc
+                elif label == "Data Transfer" and "data_transfer_30d" not in found:
+                    dt = _to_float(node.get("value"))
+                    if dt is not None:
+                        found["data_transfer_30d"] = dt
+                items = node.get("lineItems")
+                if isinstance(items, list) and "carrier_offload" not in found:
+                    pairs = {
+                        i.get("label"): i.get("value") for i in items
+                        if isinstance(i, dict) and isinstance(i.get("value"), str)
+                    }
+                    co = pairs.get("Carrier Offload")
+                    hm = pairs.get("Helium Mobile")
+                    if co and hm and VALUE_WITH_UNITS_RE.match(co) and VALUE_WITH_UNITS_RE.match(hm):
+                        found["carrier_offload"] = co.strip()
+                        found["helium_mobile"] = hm.strip()
+                stack.extend(reversed(list(node.values())))
+                continue
+            if not isinstance(node, list):
+                continue
+            if _is_element(node):
+                props = node[3]
+                if node[1] == "meta" and props.get("property") == "og:description" and "avg_daily_data" not in found:
+                    m = META_RE.search('property="og:description" content="%s"' % props.get("content", ""))
+                    if m:
+                        found["avg_daily_data"] = f"{m.group(1)} {m.group(2)}"
+                        found["avg_daily_users"] = m.group(3)
+                children = props.get("children")
+                if (
+                    tokens_card and "tokens_display" not in found and isinstance(children, list)
+                    and len(children) >= 2 and _is_element(children[0], "svg")
+                ):
+                    total = _to_float(children[1])
+                    if total is not None:
+                        found["tokens_display"] = total
+                stack.extend(reversed(node))
+                continue
+            # plain list: look for the big title followed by its location line
+            if "hotspot_name" not in found:
+                for i, child in enumerate(node):
+                    if _is_element(child, "div") and "text-3xl" in str(child[3].get("className", "")):
+                        name = _element_text(child[3].get("children"))
+                        if name:
+                            found["hotspot_name"] = name
+                            location = _find_location(node[i + 1:])
+                            if location:
+                                found["hotspot_location"] = location
+                            break
+            stack.extend(reversed(node))
+        if wanted is not None and all(f in found for f in wanted):
+            break
+    return found
+
+
+# ==================== Anchor-indexed extraction ====================
+# Anchors are label texts that read the same in the server-rendered markup, the JSON
+# flight rows and their escaped copies. They are located with plain substring search
+# (str.find, much faster than a regex alternation on large pages), lazily: the search
+# for a field stops at the first anchor whose window yields a value. Each field's regex
+# only runs on that small window, normalized (html- and backslash-unescaped) first, so
+# the cost follows the anchors, not fields x page size x escaping variants.
+# Add a field by adding a row to ANCHOR_FIELDS.
+
+AMOUNT_OBJ_RE = re.compile(r'"label"\s*:\s*"(Carrier Offload|Helium Mobile)"\s*,\s*"value"\s*:\s*"([^"]{1,40})"')
+
+
+class AnchorField(NamedTuple):
+    fields: Tuple[str, ...]  # keys the extractor may return
+    anchors: Tuple[str, ...]
+    before: int  # window size (chars of the raw page) around an anchor hit
+    after: int
+    extract: Callable[[str], Optional[Dict[str, Any]]]  # normalized window -> fields, or None
+
+
+def _normalize(window: str) -> str:
+    return _deescape(html.unescape(window))
+
+
+def _anchor_float(regex: "re.Pattern[str]", field: str) -> Callable[[str], Optional[Dict[str, Any]]]:
+    def extract(window: str) -> Optional[Dict[str, Any]]:
+        m = regex.search(window)
+        value = _to_float(m.group(2)) if m else None
+        return {field: value} if value is not None else None
+    return extract
+
+
+def _anchor_amount(label: str, field: str) -> Callable[[str], Optional[Dict[str, Any]]]:
+    def extract(window: str) -> Optional[Dict[str, Any]]:
+        for m in AMOUNT_OBJ_RE.finditer(window):
+            if m.group(1) == label and VALUE_WITH_UNITS_RE.match(m.group(2)):
+                return {field: m.group(2).strip()}
+        return None
+    return extract
+
+
+def _anchor_meta(window: str) -> Optional[Dict[str, Any]]:
+    m = META_RE.search(window)
+    return {"avg_daily_data": f"{m.group(1)} {m.group(2)}", "avg_daily_users": m.group(3)} if m else None
+
+
+def _anchor_title(window: str) -> Optional[Dict[str, Any]]:
+    span = _find_name_div(window)
+    name = _strip_tags(window[span[0]:span[1]]) if span else None
+    if not name:
+        return None
+    out: Dict[str, Any] = {"hotspot_name": name}
+    end = span[1] + len("</div>")
+    for m_loc in LOCATION_IN_WINDOW_RE.finditer(window, end, end + 800):
+        loc = _location_text(m_loc.group(1))
+        if loc:
+            out["hotspot_location"] = loc
+            break
+    return out
+
+
+def _anchor_tokens_display(window: str) -> Optional[Dict[str, Any]]:
+    value = _to_float(_find_tokens_display(window))
+    return {"tokens_display": value} if value is not None else None
+
+
+ANCHOR_FIELDS: Tuple[AnchorField, ...] = (
+    AnchorField(("proof_of_coverage_30d",), ("Proof Of Coverage",), 48, 200,
+                _anchor_float(POC_FLOAT_RE, "proof_of_coverage_30d")),
+    AnchorField(("data_transfer_30d",), ("Data Transfer",), 48, 200,
+                _anchor_float(DT_FLOAT_RE, "data_transfer_30d")),
+    AnchorField(("carrier_offload",), ("Carrier Offload",), 48, 200,
+                _anchor_amount("Carrier Offload", "carrier_offload")),
+    AnchorField(("helium_mobile",), ("Helium Mobile",), 48, 200,
+                _anchor_amount("Helium Mobile", "helium_mobile")),
+    AnchorField(("avg_daily_data", "avg_daily_users"), ("og:description",), 48, 300, _anchor_meta),
+    AnchorField(("hotspot_name", "hotspot_location"), ("text-3xl",), 300, 1400, _anchor_title),
+    AnchorField(("tokens_display",), ("Tokens Earned",), 8, 6200, _anchor_tokens_display),
+)
+
+
+def iter_anchor_hits(raw: str, anchors: Iterable[str]) -> Iterator[int]:
+    for anchor in anchors:
+        pos = raw.find(anchor)
+        while pos >= 0:
+            yield pos
+            pos = raw.find(anchor, pos + len(anchor))
+
+
+_SPAN_WINDOWS = 8  # overlapping windows are merged into spans of at most this many window sizes
+
+
+def iter_anchor_spans(raw: str, spec: AnchorField) -> Iterator[Tuple[int, int]]:
+    """
+    (start, end) of the windows around the anchor hits of one row, overlapping windows
+    merged, so a page dense with anchors is normalized and searched about once, not once
+    per hit.
+    """
+    limit = _SPAN_WINDOWS * (spec.before + spec.after)
+    lo = hi = -1
+    for pos in iter_anchor_hits(raw, spec.anchors):
+        start, end = max(0, pos - spec.before), pos + spec.after
+        if lo >= 0 and start <= hi and max(hi, end) - min(lo, start) <= limit:
+            lo, hi = min(lo, start), max(hi, end)
+            continue
+        if lo >= 0:
+            yield lo, hi
+        lo, hi = start, end
+    if lo >= 0:
+        yield lo, hi
+
+
+def extract_anchored_fields(
+    raw: str,
+    wanted: Optional[Collection[str]] = None,
+    abandoned: Optional[Dict[str, str]] = None,
+    budget_ms: float = FIELD_BUDGET_MS,
+) -> Dict[str, Any]:
+    """
+    Run the extractor of every ANCHOR_FIELDS row that covers a `wanted` field (default: all)
+    on the windows around its anchors until one succeeds. Only found fields are returned.
+    All rows share one Budget; the fields of rows it runs out on are noted in `abandoned`.
+    """
+    found: Dict[str, Any] = {}
+    budget = Budget(budget_ms)
+    for spec in ANCHOR_FIELDS:
+        if wanted is not None and not any(f in wanted for f in spec.fields):
+            continue
+        if all(f in found for f in spec.fields):
+            continue
+        try:
+            for start, end in iter_anchor_spans(raw, spec):
+                budget.spend()
+                out = spec.extract(_normalize(raw[start:end]))
+                if out:
+                    for key, value in out.items():
+                        found.setdefault(key, value)
+                    break
+        except BudgetExceeded:
+            if abandoned is not None:
+                for field in spec.fields:
+                    abandoned.setdefault(field, "extract_anchored_fields")
+    return found
+
+
+# ==================== Streaming ====================
+# Markers (alternatives per field, as they appear in the raw page) whose presence means
+# the data for that field has been streamed. The JSON forms are used on purpose: the
+# server-rendered markup shows the same labels long before the flight payload arrives.
+STREAM_MARKERS: Tuple[Tuple[str, ...], ...] = (
+    ('\\"Proof Of Coverage\\"', '"label":"Proof Of Coverage"'),
+    ('\\"Data Transfer\\"', '"label":"Data Transfer"'),
+    ('\\"Carrier Offload\\"', '"label":"Carrier Offload"'),
+    ('og:description',),
+    ('text-3xl',),
+)
+# keep reading this much past the last marker so the values and their chunk are complete
+STREAM_MARGIN = 16 * 1024
+# labels only a hotspot's own page carries (the site's generic and not-found pages have none);
+# adding hotspots checks for them instead of downloading and parsing every page
+HOTSPOT_PAGE_MARKERS = ("Avg Daily Stats", "Proof Of Coverage", "Tokens Earned", "Carrier Offload")
+
+
+def has_hotspot_data(text: str) -> bool:
+    return any(marker in text for marker in HOTSPOT_PAGE_MARKERS)
+
+
+class StreamScanner:
+    """Incrementally scans streamed page bytes and reports when every marker has been seen."""
+
+    def __init__(self, markers: Iterable[Iterable[str]] = STREAM_MARKERS, margin: int = STREAM_MARGIN):
+        self._pending = [tuple(m.encode() for m in alts) for alts in markers]
+        self._overlap = max((len(m) for alts in self._pending for m in alts), default=1) - 1
+        self._margin = margin
+        self._tail = b""
+        self._size = 0
+        self._done_at: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> bool:
+        self._size += len(chunk)
+        if self._pending:
+            window = self._tail + chunk
+            self._pending = [alts for alts in self._pending if not any(m in window for m in alts)]
+            self._tail = window[-self._overlap:] if self._overlap else b""
+            if not self._pending:
+                self._done_at = self._size
+        return self._done_at is not None and self._size - self._done_at >= self._margin
+
+
+def _timed(stats: Optional[dict], name: str, fn, *args):
+    if stats is None:
+        return fn(*args)
+    t0 = time.perf_counter()
+    out = fn(*args)
+    stats["parse_ms"][name] = round((time.perf_counter() - t0) * 1000, 3)
+    return out
+
+
+def _budgeted(stats: Optional[dict], abandoned: Dict[str, str], budget_ms: float, name: str,
+              fields: Tuple[str, ...], default: Any, fn, *args):
+    """Run one extractor under its own Budget; if it gives up, note `fields` and return `default`."""
+    t0 = time.perf_counter()
+    try:
+        out = fn(*args, Budget(budget_ms))
+    except BudgetExceeded:
+        out = default
+        for field in fields:
+            abandoned.setdefault(field, name)
+    if stats is not None:
+        stats["parse_ms"][name] = round((time.perf_counter() - t0) * 1000, 3)
+    return out
+
+
+def _record_path(stats: Optional[dict], corpora: Corpus, found: bool, *fields: str) -> None:
+    if stats is not None:
+        path = "corpus:" + CORPUS_VARIANT_NAMES[corpora.position] if found else "none"
+        for field in fields:
+            stats["paths"][field] = path
+
+
+# fields that, once found, make later extraction stages unnecessary
+PAGE_FIELDS = (
+    "proof_of_coverage_30d",
+    "data_transfer_30d",
+    "carrier_offload",
+    "helium_mobile",
+    "avg_daily_data",
+    "avg_daily_users",
+    "hotspot_name",
+    "hotspot_location",
+)
+# fields parse_hotspot_html can be asked for (`fields=`); hnt_source comes with the HNT total
+RESULT_FIELDS = PAGE_FIELDS[:2] + ("tokens_earned_30d_hnt",) + PAGE_FIELDS[2:]
+# the HNT total is the sum of the first two, or else the displayed total
+_TOTAL_SOURCES = ("proof_of_coverage_30d", "data_transfer_30d", "tokens_display")
+# fields that do not change between polls of the same hotspot
+STATIC_FIELDS = ("hotspot_name", "hotspot_location")
+
+
+def parse_hotspot_html(
+    raw_html: str,
+    stats: Optional[dict] = None,
+    budget_ms: float = FIELD_BUDGET_MS,
+    fields: Optional[Collection[str]] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Parse one hotspot page: anchored windows first, the flight payload for whatever is
+    still missing, then the whole-page regexes. Every extractor runs under a Budget of
+    `budget_ms` (and FIELD_BUDGET_STEPS) and leaves its fields empty if it runs out.
+    With `fields` (a subset of RESULT_FIELDS), extractors for other fields are skipped
+    and those fields are left out of the result.
+    Pass a dict as `stats` to get per-extractor timings (`parse_ms`), where each field
+    came from (`paths`: anchor, flight, corpus:<variant> or none) and the fields left
+    empty because an extractor gave up (`abandoned_fields`: field -> extractor).
+    """
+    if stats is not None:
+        stats.setdefault("parse_ms", {})
+        stats.setdefault("paths", {})
+        t_start = time.perf_counter()
+    wanted: Optional[Set[str]] = None
+    if fields is not None:
+        wanted = set(fields)
+        if "tokens_earned_30d_hnt" in wanted:
+            wanted.update(_TOTAL_SOURCES)
+
+    def want(*names: str) -> bool:
+        return wanted is None or any(n in wanted for n in names)
+
+    abandoned: Dict[str, str] = {}
+    found = _timed(stats, "extract_anchored_fields", extract_anchored_fields, raw_html, wanted, abandoned, budget_ms)
+    if stats is not None:
+        stats["paths"].update({k: "anchor" for k in found})
+    missing = tuple(f for f in PAGE_FIELDS if f not in found and want(f))
+    if missing:
+        flight = _budgeted(stats, abandoned, budget_ms, "extract_flight_fields", missing, {},
+                           extract_flight_fields, raw_html, missing)
+        for key, value in flight.items():
+            if key not in found:
+                found[key] = value
+                if stats is not None:
+                    stats["paths"][key] = "flight"
     corpora = build_corpus(raw_html)
-    poc, dt, total, source = extract_tokens_hnt(corpora)
-    co, hm = extract_data_amounts(corpora)
-    avg_data, avg_users = extract_avg_daily(corpora)
 
-    # NEW:
-    name = extract_hotspot_name(corpora)
-    location = extract_hotspot_location(corpora)
+    poc = found.get("proof_of_coverage_30d")
+    dt = found.get("data_transfer_30d")
+    total, source = None, None
+    if not want(*_TOTAL_SOURCES):
+        pass
+    elif poc is not None and dt is not None:
+        total, source = round(poc + dt, 3), "sum"
+        if stats is not None:
+            stats["paths"]["tokens_earned_30d_hnt"] = stats["paths"]["proof_of_coverage_30d"]
+    elif "tokens_display" in found:
+        # the card's own total is already here; the whole-page scan would only look for it again
+        total, source = round(found["tokens_display"], 3), "display"
+        if stats is not None:
+            stats["paths"]["tokens_earned_30d_hnt"] = stats["paths"]["tokens_display"]
+    else:
+        f_poc, f_dt, total, source = _budgeted(
+            stats, abandoned, budget_ms, "extract_tokens_hnt",
+            ("proof_of_coverage_30d", "data_transfer_30d", "tokens_earned_30d_hnt"),
+            (None, None, None, "none"), extract_tokens_hnt, corpora,
+        )
+        _record_path(stats, corpora, total is not None, "tokens_earned_30d_hnt")
+        poc = poc if poc is not None else f_poc
+        dt = dt if dt is not None else f_dt
+    if stats is not None and source is not None:
+        stats["hnt_source"] = source
+
+    co, hm = found.get("carrier_offload"), found.get("helium_mobile")
+    if (co is None and want("carrier_offload")) or (hm is None and want("helium_mobile")):
+        f_co, f_hm = _budgeted(stats, abandoned, budget_ms, "extract_data_amounts",
+                               ("carrier_offload", "helium_mobile"), (None, None), extract_data_amounts, corpora)
+        _record_path(stats, corpora, f_co is not None, *(
+            f for f, v in (("carrier_offload", co), ("helium_mobile", hm)) if v is None
+        ))
+        co = co if co is not None else f_co
+        hm = hm if hm is not None else f_hm
 
-    return {
+    avg_data, avg_users = found.get("avg_daily_data"), found.get("avg_daily_users")
+    if avg_data is None and want("avg_daily_data", "avg_daily_users"):
+        avg_data, avg_users = _budgeted(stats, abandoned, budget_ms, "extract_avg_daily",
+                                        ("avg_daily_data", "avg_daily_users"), (None, None), extract_avg_daily, corpora)
+        _record_path(stats, corpora, avg_data is not None, "avg_daily_data", "avg_daily_users")
+
+    name = found.get("hotspot_name")
+    if not name and want("hotspot_name"):
+        name = _budgeted(stats, abandoned, budget_ms, "extract_hotspot_name", ("hotspot_name",), None,
+                         extract_hotspot_name, corpora)
+        _record_path(stats, corpora, name is not None, "hotspot_name")
+    location = found.get("hotspot_location")
+    if not location and want("hotspot_location"):
+        location = _budgeted(stats, abandoned, budget_ms, "extract_hotspot_location", ("hotspot_location",), None,
+                             extract_hotspot_location, corpora)
+        _record_path(stats, corpora, location is not None, "hotspot_location")
+
+    result = {
         "proof_of_coverage_30d": poc,
         "data_transfer_30d": dt,
         "tokens_earned_30d_hnt": total,
@@ -172,3 +968,30 @@ def parse_hotspot_html(raw_html: str) -> Dict[str, Optional[str]]:
         "hotspot_name": name,          # NEW
         "hotspot_location": location,  # NEW
     }
+    if fields is not None:
+        # some extractors find neighbouring fields as well; return only what was asked for, so a
+        # field that was not parsed is missing rather than looking like a value that went away
+        for key in RESULT_FIELDS:
+            if key not in fields:
+                del result[key]
+        if "tokens_earned_30d_hnt" not in fields:
+            del result["hnt_source"]
+    if stats is not None:
+        # a later stage may still have found what an earlier one gave up on
+        stats["abandoned_fields"] = {f: name for f, name in abandoned.items() if result.get(f) is None}
+        stats["total_ms"] = round((time.perf_counter() - t_start) * 1000, 3)
+    return result
+
+
+def parse_batch(
+    pages: List[str], fields: Optional[List[Optional[Collection[str]]]] = None
+) -> List[Tuple[Dict[str, Optional[str]], dict]]:
+    """
+    Parse several pages in one call (with stats); the unit of work handed to pool workers.
+    `fields` optionally gives each page's wanted fields (see parse_hotspot_html).
+    """
+    out = []
+    for i, raw in enumerate(pages):
+        stats: dict = {}
+        out.append((parse_hotspot_html(raw, stats, fields=fields[i] if fields else None), stats))
+    return out
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import HeliumCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_TRACEMALLOC_FRAMES = 10
+# our own frames and the import machinery say nothing about a refresh
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+)
+
+
+def _report_path(hass: HomeAssistant, entry_id: str, started: float) -> Path:
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started))
+    return Path(hass.config.path(f"{DOMAIN}_profile_{entry_id}_{stamp}.txt"))
+
+
+async def async_profile_refresh(hass: HomeAssistant, coordinator: HeliumCoordinator, title: str,
+                                entry_id: str, top: int) -> Path:
+    """
+    Run one full refresh cycle of `coordinator` (every hotspot, fetched even if recently shared)
+    under cProfile and tracemalloc and write a report to the config directory.
+    Pages are parsed on the event loop for the duration, so the parser shows up in the profile;
+    anything else the loop runs meanwhile (other integrations) does too.
+    Returns the report path; the raw profile is saved next to it as .prof (for snakeviz, pstats).
+    """
+    started = time.time()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(_TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    coordinator.mark_all_due()
+    t0 = time.perf_counter()
+    try:
+        with coordinator.parse_pool.inline():
+            profiler.enable()
+            try:
+                await coordinator.async_refresh()
+            finally:
+                profiler.disable()
+        cycle_ms = (time.perf_counter() - t0) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    path = _report_path(hass, entry_id, started)
+    states = {h: coordinator.hotspot_state(h) for h in coordinator.hotspots}
+    hotspots = {h: state.metrics for h, state in states.items() if state is not None}
+    header = {
+        "entry": f"{title} ({entry_id})",
+        "started": dt_util.utc_from_timestamp(started).isoformat(),
+        "hotspots": len(hotspots),
+        "cycle_ms": round(cycle_ms, 1),
+        "last_update_success": coordinator.last_update_success,
+        "traced_peak_kib": round(peak / 1024, 1),
+    }
+    await hass.async_add_executor_job(_write_report, path, header, hotspots, profiler, before, after, top)
+    _LOGGER.info("Profiled a refresh of %s hotspot(s) in %.0f ms; report written to %s",
+                 len(hotspots), cycle_ms, path)
+    return path
+
+
+def _num(value: Optional[float], digits: int = 1) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def _hotspot_rows(hotspots: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Per-hotspot wall time, split into fetch, parse and the rest (waiting for the scheduler, sharing)."""
+    rows = [f"{'hotspot':<14} {'outcome':<12} {'status':>6} {'KiB':>8} {'wall_ms':>9} {'fetch_ms':>9} "
+            f"{'ttfb_ms':>8} {'parse_ms':>9} {'other_ms':>9}  slowest extractor"]
+    for hsid, m in sorted(hotspots.items(), key=lambda item: item[1].get("refresh_ms") or 0.0, reverse=True):
+        fetch = m.get("fetch") or {}
+        parse = m.get("parse") or {}
+        fetch_ms, parse_ms = fetch.get("total_ms"), parse.get("total_ms")
+        other = (m.get("refresh_ms") or 0.0) - (fetch_ms or 0.0) - (parse_ms or 0.0)
+        kib = m["bytes"] / 1024 if m.get("bytes") is not None else None
+        slowest = max((parse.get("parse_ms") or {}).items(), key=lambda kv: kv[1], default=None)
+        rows.append(
+            f"{hsid:<14} {m.get('outcome') or '-':<12} {m.get('status') or '-':>6} {_num(kib):>8} "
+            f"{_num(m.get('refresh_ms')):>9} {_num(fetch_ms):>9} {_num(fetch.get('ttfb_ms')):>8} "
+            f"{_num(parse_ms, 2):>9} {_num(other):>9}  "
+            + (f"{slowest[0]} {slowest[1]:.2f} ms" if slowest else "-")
+        )
+    return rows
+
+
+def _write_report(path: Path, header: Dict[str, Any], hotspots: Dict[str, Dict[str, Any]],
+                  profiler: cProfile.Profile, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+                  top: int) -> None:
+    out = io.StringIO()
+    out.write("Helium Hotspot refresh profile\n")
+    for key, value in header.items():
+        out.write(f"  {key}: {value}\n")
+
+    out.write("\n== Per-hotspot wall time (slowest first) ==\n")
+    out.write("\n".join(_hotspot_rows(hotspots)) + "\n")
+
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs()
+    out.write(f"\n== Hot functions by cumulative time (top {top}) ==\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    out.write(f"\n== Hot functions by own time (top {top}) ==\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+
+    before, after = before.filter_traces(_IGNORED_TRACES), after.filter_traces(_IGNORED_TRACES)
+    out.write(f"\n== Allocation sites: memory held after the cycle vs before (top {top}) ==\n")
+    for stat in [s for s in after.compare_to(before, "lineno") if s.size_diff > 0][:top]:
+        out.write(f"  {stat}\n")
+    stacks = min(top, 10)
+    out.write(f"\n== The same by call stack (top {stacks}) ==\n")
+    for stat in [s for s in after.compare_to(before, "traceback") if s.size_diff > 0][:stacks]:
+        out.write(f"  {stat.size_diff / 1024:.1f} KiB in {stat.count_diff} block(s)\n")
+        for line in stat.traceback.format(limit=_TRACEMALLOC_FRAMES, most_recent_first=True):
+            out.write(f"    {line}\n")
+
+    path.write_text(out.getvalue(), encoding="utf-8")
+    profiler.dump_stats(str(path.with_suffix(".prof")))
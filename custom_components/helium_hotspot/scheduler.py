@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+_LOGGER = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 503)
+MAX_RETRY_AFTER = 300.0  # never park the whole refresh longer than this on one header
+
+_R = TypeVar("_R")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class TokenBucket:
+    """Requests-per-second cap; `rate` can be lowered while throttled and recovers on success."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # reserve a token under the lock (the balance may go negative) and sleep outside it,
+        # so waiters are spaced 1/rate apart instead of queueing behind one sleeper
+        async with self._lock:
+            self._refill()
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._tokens += 1.0  # unused reservation
+                raise
+
+    def throttled(self) -> None:
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+
+    def succeeded(self) -> None:
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class FetchScheduler:
+    """
+    Runs fetches with a bounded number in flight and a token-bucket rate cap.
+    429/503 answers pause every request until Retry-After has passed (or a jittered
+    exponential backoff when the header is missing); transport errors are retried the same way.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        requests_per_second: float,
+        max_retries: int = 3,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        self._bucket = TokenBucket(requests_per_second)
+        self._max_retries = max_retries
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._paused_until = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": uniform over the exponential window
+        return random.uniform(0, min(self._max_backoff, self._base_backoff * (2 ** attempt)))
+
+    async def _wait_if_paused(self) -> None:
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def run(self, fetch: Callable[[], Awaitable[_R]]) -> _R:
+        """
+        Call `fetch` inside a concurrency slot; its result must expose `status_code`
+        and `headers` like an httpx.Response. The last response is returned once retries run out.
+        """
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._wait_if_paused()
+                await self._bucket.acquire()
+                try:
+                    result = await fetch()
+                except httpx.TransportError as err:
+                    if attempt >= self._max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    _LOGGER.debug("Fetch failed (%s), retrying in %.1fs", err, delay)
+                else:
+                    status = getattr(result, "status_code", None)
+                    if status not in RETRY_STATUSES:
+                        self._bucket.succeeded()
+                        return result
+                    self._bucket.throttled()
+                    if attempt >= self._max_retries:
+                        return result
+                    retry_after = parse_retry_after(result.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        delay = min(retry_after, MAX_RETRY_AFTER) + random.uniform(0, self._base_backoff)
+                    else:
+                        delay = self._backoff(attempt)
+                    # the host is throttling us, not just this page: hold everyone back
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                    _LOGGER.debug("Throttled with HTTP %s, backing off %.1fs", status, delay)
+            attempt += 1
+            await asyncio.sleep(delay)
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, SENSOR_TYPES
-from .coordinator import HeliumCoordinator
+from .aggregate import TOP_FIELD, TOP_KEY
+from .coordinator import FLEET_ID, HISTORY_FIELD, METRICS_FIELD, HeliumCoordinator, HotspotState
+from .history import HotspotHistory
 
 # Add this mapping (Material Design Icons):
 ICON_MAP = {
@@ -22,12 +27,119 @@ ICON_MAP = {
     "avg_daily_users":       "mdi:account-group-outline",    # users
 }
 
+# data keys shown as attributes; an entity is only rewritten when one of its keys changes
+SHARED_ATTR_KEYS = ("hotspot", "url", "hotspot_name", "hotspot_location")
+TOKENS_ATTR_KEYS = ("hnt_source", "proof_of_coverage_30d", "data_transfer_30d")
+
 @dataclass
 class HeliumDesc:
     key: str
     name: str
     unit: str | None
 
+@dataclass
+class HeliumMetricDesc:
+    key: str
+    name: str
+    unit: str | None
+    icon: str
+    value_fn: Callable[[Dict[str, Any]], Optional[float]]
+
+# diagnostic sensors (disabled by default); value_fn gets HotspotState.metrics / fleet_metrics()
+HOTSPOT_METRICS = [
+    HeliumMetricDesc("refresh_time", "Refresh Time", UnitOfTime.MILLISECONDS, "mdi:timer-outline",
+                     lambda m: m.get("refresh_ms")),
+    HeliumMetricDesc("parse_time", "Parse Time", UnitOfTime.MILLISECONDS, "mdi:code-braces",
+                     lambda m: (m.get("parse") or {}).get("total_ms")),
+    HeliumMetricDesc("bytes_received", "Bytes Received", UnitOfInformation.BYTES, "mdi:download-network-outline",
+                     lambda m: m.get("bytes")),
+]
+FLEET_METRICS = [
+    HeliumMetricDesc("refresh_p50", "Refresh Latency p50", UnitOfTime.MILLISECONDS, "mdi:timer-outline",
+                     lambda m: m.get("refresh_p50_ms")),
+    HeliumMetricDesc("refresh_p95", "Refresh Latency p95", UnitOfTime.MILLISECONDS, "mdi:timer-alert-outline",
+                     lambda m: m.get("refresh_p95_ms")),
+    HeliumMetricDesc("cycle_time", "Last Refresh Cycle", UnitOfTime.MILLISECONDS, "mdi:timer-sync-outline",
+                     lambda m: m.get("last_cycle_ms")),
+]
+
+@dataclass
+class HeliumFleetDesc:
+    key: str
+    name: str
+    unit: str | None
+    icon: str
+    field: str  # aggregate field, or TOP_KEY
+    kind: str  # "total", "mean" or "top"
+
+FLEET_AGGREGATES = [
+    HeliumFleetDesc("fleet_tokens_earned_30d_hnt", "HNT (30D) Total", "HNT", "mdi:alpha-h-circle-outline",
+                    "tokens_earned_30d_hnt", "total"),
+    HeliumFleetDesc("fleet_proof_of_coverage_30d", "PoC (30D) Total", "HNT", "mdi:shield-check-outline",
+                    "proof_of_coverage_30d", "total"),
+    HeliumFleetDesc("fleet_data_transfer_30d", "Data Transfer (30D HNT) Total", "HNT",
+                    "mdi:database-arrow-right-outline", "data_transfer_30d", "total"),
+    HeliumFleetDesc("fleet_avg_daily_users", "Avg Daily Users Total", None, "mdi:account-group-outline",
+                    "avg_daily_users", "total"),
+    HeliumFleetDesc("fleet_tokens_earned_30d_hnt_mean", "HNT (30D) Mean", "HNT", "mdi:alpha-h-circle-outline",
+                    "tokens_earned_30d_hnt", "mean"),
+    HeliumFleetDesc("fleet_proof_of_coverage_30d_mean", "PoC (30D) Mean", "HNT", "mdi:shield-check-outline",
+                    "proof_of_coverage_30d", "mean"),
+    HeliumFleetDesc("fleet_data_transfer_30d_mean", "Data Transfer (30D HNT) Mean", "HNT",
+                    "mdi:database-arrow-right-outline", "data_transfer_30d", "mean"),
+    HeliumFleetDesc("fleet_avg_daily_users_mean", "Avg Daily Users Mean", None, "mdi:account-group-outline",
+                    "avg_daily_users", "mean"),
+    HeliumFleetDesc("fleet_top_earner", "Top Earner", None, "mdi:trophy-outline", TOP_KEY, "top"),
+]
+
+@dataclass
+class HeliumHistoryDesc:
+    key: str
+    name: str
+    unit: str | None
+    icon: str
+    value_fn: Callable[[HotspotHistory, str, float], Optional[float]]
+
+_DAY = 86400.0
+
+def _hnt_per_day(history: HotspotHistory, hotspot: str, now: float) -> Optional[float]:
+    # the page only has rolling 30-day totals; average them over the last week, each weighted by
+    # how long it held (polls bunch up in reward windows, or stop while the site is down)
+    since = now - 7 * _DAY
+    samples = history.window(hotspot, "tokens_earned_30d_hnt", since, now)
+    held = history.value_at(hotspot, "tokens_earned_30d_hnt", since)
+    if held is not None:
+        samples.insert(0, (since, held))
+    if not samples:
+        return None
+    span = now - samples[0][0]
+    if span <= 0:
+        return round(samples[-1][1] / 30, 4)
+    ends = [ts for ts, _ in samples[1:]] + [now]
+    return round(sum(v * (end - ts) for (ts, v), end in zip(samples, ends)) / span / 30, 4)
+
+def _change_24h(field: str, scale: float = 1.0, digits: int = 3):
+    def value(history: HotspotHistory, hotspot: str, now: float) -> Optional[float]:
+        delta = history.change(hotspot, field, _DAY, now)
+        return round(delta / scale, digits) if delta is not None else None
+    return value
+
+# built on the local history store (history.py); only created when history_days > 0
+HISTORY_SENSORS = [
+    HeliumHistoryDesc("hnt_per_day", "HNT/day", "HNT/d", "mdi:cash-clock", _hnt_per_day),
+    HeliumHistoryDesc("hnt_change_24h", "HNT (30D) 24h Change", "HNT", "mdi:delta",
+                      _change_24h("tokens_earned_30d_hnt")),
+    HeliumHistoryDesc("carrier_offload_change_24h", "Carrier Offload (30D) 24h Change", UnitOfInformation.MEGABYTES,
+                      "mdi:swap-vertical", _change_24h("carrier_offload", 1e6, 2)),
+]
+
+def fleet_device_info(entry_id: str) -> Dict[str, Any]:
+    return {
+        "identifiers": {(DOMAIN, f"fleet_{entry_id}")},
+        "name": "Helium Hotspot Fleet",
+        "manufacturer": "Helium Mobile (community)",
+    }
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     coordinator: HeliumCoordinator = hass.data[DOMAIN][entry.entry_id]
 
@@ -36,17 +148,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     ]
 
     entities: List[SensorEntity] = []
-    for hotspot_id in coordinator._hotspots:
+    for hotspot_id in coordinator.hotspots:
         for desc in descs:
             entities.append(HeliumSensor(coordinator, hotspot_id, desc, entry.entry_id))
+        if coordinator.history is not None:
+            for hdesc in HISTORY_SENSORS:
+                entities.append(HeliumHistorySensor(coordinator, hotspot_id, hdesc, entry.entry_id))
+        for mdesc in HOTSPOT_METRICS:
+            entities.append(HeliumMetricSensor(coordinator, hotspot_id, mdesc, entry.entry_id))
+    if len(coordinator.hotspots) > 1:
+        for fdesc in FLEET_AGGREGATES:
+            entities.append(HeliumFleetSensor(coordinator, fdesc, entry.entry_id))
+    for mdesc in FLEET_METRICS:
+        entities.append(HeliumMetricSensor(coordinator, None, mdesc, entry.entry_id))
 
-    async_add_entities(entities, True)
+    # data is already there (first refresh or restored cache); no update-before-add
+    async_add_entities(entities)
 
-class HeliumSensor(SensorEntity):
+class HeliumSensor(CoordinatorEntity[HeliumCoordinator], SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator: HeliumCoordinator, hotspot_id: str, desc, entry_id: str):
-        self.coordinator = coordinator
+        keys = {desc.key, *SHARED_ATTR_KEYS}
+        if desc.key == "tokens_earned_30d_hnt":
+            keys.update(TOKENS_ATTR_KEYS)
+        super().__init__(coordinator, context=frozenset((hotspot_id, k) for k in keys))
         self._hotspot_id = hotspot_id
         self._desc = desc
         self._entry_id = entry_id
@@ -61,9 +187,14 @@ class HeliumSensor(SensorEntity):
         # NEW: per-sensor icon
         self._attr_icon = ICON_MAP.get(desc.key, "mdi:alpha-h-circle-outline")
 
+    @property
+    def available(self) -> bool:
+        # per hotspot: stays available on its last good data while other hotspots fail
+        return super().available and self.coordinator.hotspot_available(self._hotspot_id)
+
     @property
     def device_info(self):
-        data = self.coordinator.data.get(self._hotspot_id) or {}
+        data = (self.coordinator.data or {}).get(self._hotspot_id) or {}
         title = data.get("hotspot_name") or f"Helium Hotspot {self._hotspot_id}"
         return {
             "identifiers": {(DOMAIN, self._hotspot_id)},
@@ -75,12 +206,12 @@ class HeliumSensor(SensorEntity):
 
     @property
     def native_value(self):
-        data: Dict[str, Any] = self.coordinator.data.get(self._hotspot_id) or {}
+        data: Dict[str, Any] = (self.coordinator.data or {}).get(self._hotspot_id) or {}
         return data.get(self._desc.key)
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data.get(self._hotspot_id) or {}
+        data = (self.coordinator.data or {}).get(self._hotspot_id) or {}
         base = {
             "hotspot": self._hotspot_id,
             "url": data.get("url"),
@@ -95,12 +226,117 @@ class HeliumSensor(SensorEntity):
             })
         return base
 
-    async def async_update(self):
-        await self.coordinator.async_request_refresh()
+class HeliumHistorySensor(CoordinatorEntity[HeliumCoordinator], SensorEntity):
+    """Rate/change values derived from the hotspot's local history instead of recorder queries."""
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: HeliumCoordinator, hotspot_id: str, desc: HeliumHistoryDesc, entry_id: str):
+        super().__init__(coordinator, context=frozenset({(hotspot_id, HISTORY_FIELD)}))
+        self._hotspot_id = hotspot_id
+        self._desc = desc
+        self._attr_unique_id = f"{entry_id}_{hotspot_id}_{desc.key}"
+        self._attr_name = f"{hotspot_id} {desc.name}"
+        self._attr_device_info = {"identifiers": {(DOMAIN, hotspot_id)}}
+        self._attr_native_unit_of_measurement = desc.unit
+        self._attr_icon = desc.icon
 
     @property
-    def should_poll(self) -> bool:
-        return False
+    def available(self) -> bool:
+        return super().available and self.coordinator.hotspot_available(self._hotspot_id)
 
-    async def async_added_to_hass(self) -> None:
-        self.async_on_remove(self.coordinator.async_add_listener(self.async_write_ha_state))
+    @property
+    def native_value(self):
+        return self._desc.value_fn(self.coordinator.history, self._hotspot_id, dt_util.utcnow().timestamp())
+
+    @property
+    def extra_state_attributes(self):
+        return {"history_records": self.coordinator.history.records(self._hotspot_id)}
+
+class HeliumFleetSensor(CoordinatorEntity[HeliumCoordinator], SensorEntity):
+    """Fleet total, mean or top earners; the coordinator keeps these incrementally (aggregate.py)."""
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: HeliumCoordinator, desc: HeliumFleetDesc, entry_id: str):
+        super().__init__(coordinator, context=frozenset({(FLEET_ID, desc.field)}))
+        self._desc = desc
+        self._attr_unique_id = f"{entry_id}_{desc.key}"
+        self._attr_name = desc.name
+        self._attr_device_info = fleet_device_info(entry_id)
+        self._attr_icon = desc.icon
+        if desc.kind != "top":
+            self._attr_native_unit_of_measurement = desc.unit
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        agg = self.coordinator.aggregate
+        if self._desc.kind == "top":
+            top = agg.top(1)
+            return self._hotspot_name(top[0][0]) if top else None
+        if self._desc.kind == "mean":
+            return agg.mean(self._desc.field)
+        return agg.total(self._desc.field)
+
+    def _hotspot_name(self, hotspot_id: str) -> str:
+        data = (self.coordinator.data or {}).get(hotspot_id) or {}
+        return data.get("hotspot_name") or hotspot_id
+
+    @property
+    def extra_state_attributes(self):
+        agg = self.coordinator.aggregate
+        if self._desc.kind == "top":
+            return {"top": [
+                {"hotspot": h, "hotspot_name": self._hotspot_name(h), TOP_FIELD: value}
+                for h, value in agg.top()
+            ]}
+        return {"hotspots": agg.count(self._desc.field)}
+
+class HeliumMetricSensor(CoordinatorEntity[HeliumCoordinator], SensorEntity):
+    """Refresh instrumentation for one hotspot, or for the whole entry when hotspot_id is None."""
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: HeliumCoordinator, hotspot_id: str | None, desc: HeliumMetricDesc,
+                 entry_id: str):
+        super().__init__(coordinator, context=frozenset({(hotspot_id or FLEET_ID, METRICS_FIELD)}))
+        self._hotspot_id = hotspot_id
+        self._desc = desc
+        self._entry_id = entry_id
+        if hotspot_id is None:
+            self._attr_unique_id = f"{entry_id}_fleet_{desc.key}"
+            self._attr_name = desc.name
+            self._attr_device_info = fleet_device_info(entry_id)
+        else:
+            self._attr_unique_id = f"{entry_id}_{hotspot_id}_{desc.key}"
+            self._attr_name = f"{hotspot_id} {desc.name}"
+            self._attr_device_info = {"identifiers": {(DOMAIN, hotspot_id)}}
+        self._attr_native_unit_of_measurement = desc.unit
+        self._attr_icon = desc.icon
+
+    def _metrics(self) -> Dict[str, Any]:
+        if self._hotspot_id is None:
+            return self.coordinator.fleet_metrics()
+        state: HotspotState | None = self.coordinator.hotspot_state(self._hotspot_id)
+        return state.metrics if state else {}
+
+    @property
+    def native_value(self):
+        return self._desc.value_fn(self._metrics())
+
+    @property
+    def extra_state_attributes(self):
+        m = self._metrics()
+        if self._hotspot_id is None:
+            return {"samples": m.get("samples"), "last_cycle_hotspots": m.get("last_cycle_hotspots"),
+                    "last_cycle_failed": m.get("last_cycle_failed")}
+        parse = m.get("parse") or {}
+        return {
+            "outcome": m.get("outcome"),
+            **(m.get("fetch") or {}),
+            "parse_ms": parse.get("parse_ms"),
+            "paths": parse.get("paths"),
+            "hnt_source": parse.get("hnt_source"),
+        }
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    DATA_PROFILE_LOCK,
+    SERVICE_PROFILE_REFRESH,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_TOP,
+    DEFAULT_PROFILE_TOP,
+)
+from .profiling import async_profile_refresh as async_profile
+
+PROFILE_REFRESH_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): vol.All(vol.Coerce(int), vol.Range(min=5, max=200)),
+})
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    async def async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+        """One profiled refresh per entry; profiling hooks exist only while this runs."""
+        coordinators = hass.data.get(DOMAIN) or {}
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None and entry_id not in coordinators:
+            raise ServiceValidationError(f"No loaded Helium Hotspot entry with id {entry_id}")
+        lock: asyncio.Lock = hass.data.setdefault(DATA_PROFILE_LOCK, asyncio.Lock())
+        if lock.locked():
+            raise HomeAssistantError("A Helium Hotspot refresh is already being profiled")
+        reports = []
+        async with lock:
+            for eid in [entry_id] if entry_id else list(coordinators):
+                entry = hass.config_entries.async_get_entry(eid)
+                path = await async_profile(hass, coordinators[eid], entry.title if entry else eid, eid, call.data[ATTR_TOP])
+                reports.append(str(path))
+        return {"reports": reports}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE_REFRESH, async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
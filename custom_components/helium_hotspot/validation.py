@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import logging
+import re
+from typing import Dict, Iterable, List, Tuple
+
+import httpx
+
+from .client import async_probe_page
+from .const import PROBE_MAX_CONCURRENT, PROBE_REQUESTS_PER_SECOND
+from .scheduler import FetchScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+_SEPARATORS_RE = re.compile(r"[\s,;]+")
+_ID_COLUMNS = ("hotspot", "hotspot_id", "hotspot id", "id", "number")
+
+NOT_FOUND = "not found"
+NOT_AN_ID = "not a number"
+
+
+def _dedupe(ids: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(ids))
+
+
+def split_hotspot_list(text: str) -> Tuple[List[str], List[str]]:
+    """IDs from pasted text (comma, semicolon, space or newline separated) and the tokens that are not IDs."""
+    tokens = [t for t in _SEPARATORS_RE.split(text or "") if t]
+    return _dedupe(t for t in tokens if t.isdigit()), _dedupe(t for t in tokens if not t.isdigit())
+
+
+def read_hotspot_csv(text: str) -> Tuple[List[str], List[str]]:
+    """
+    IDs from a CSV export: the column named like "hotspot"/"id" if the first row is a header,
+    otherwise the first column. Returns (ids, cells that are not IDs).
+    """
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    rows = [row for row in csv.reader(io.StringIO(text), dialect) if any(c.strip() for c in row)]
+    column = 0
+    if rows:
+        header = [c.strip().lower() for c in rows[0]]
+        named = [i for i, c in enumerate(header) if c in _ID_COLUMNS]
+        if named:
+            column = named[0]
+        if named or not any(ch.isdigit() for ch in header[column]):  # a header, not a mistyped ID
+            rows = rows[1:]
+    cells = [row[column].strip() for row in rows if len(row) > column and row[column].strip()]
+    return _dedupe(c for c in cells if c.isdigit()), _dedupe(c for c in cells if not c.isdigit())
+
+
+def _probe_failure(status: int, has_data: bool) -> str | None:
+    if status in (404, 410):
+        return NOT_FOUND
+    if status != 200:
+        return f"HTTP {status}"
+    # an unknown hotspot gets the site's generic page (possibly after a redirect), which has no stats
+    if not has_data:
+        return NOT_FOUND
+    return None
+
+
+async def async_validate_hotspots(
+    client: httpx.AsyncClient,
+    hotspots: Iterable[str],
+    url_template: str,
+    max_concurrent: int = PROBE_MAX_CONCURRENT,
+    requests_per_second: float = PROBE_REQUESTS_PER_SECOND,
+) -> Dict[str, str]:
+    """
+    Probe every hotspot page concurrently (see client.async_probe_page) under a FetchScheduler,
+    so a large list is checked in seconds without hammering the site.
+    Returns {hotspot: reason} for the ones that did not resolve; empty if all did.
+    """
+    scheduler = FetchScheduler(max_concurrent, requests_per_second, max_retries=1)
+
+    async def probe(hotspot: str) -> Tuple[str, str | None]:
+        url = url_template.format(hotspot=hotspot)
+        try:
+            result = await scheduler.run(lambda: async_probe_page(client, url))
+        except httpx.HTTPError as err:
+            return hotspot, f"no response ({type(err).__name__})"
+        return hotspot, _probe_failure(result.status_code, result.has_data)
+
+    results = await asyncio.gather(*(probe(h) for h in hotspots))
+    unresolved = {hotspot: reason for hotspot, reason in results if reason}
+    _LOGGER.debug("Probed %s hotspot(s), %s unresolved", len(results), len(unresolved))
+    return unresolved
+
+
+def describe_unresolved(unresolved: Dict[str, str], limit: int = 20) -> str:
+    """Short "123 (not found), 456 (HTTP 500), ... and 12 more" text for the config form."""
+    items = [f"{hotspot} ({reason})" for hotspot, reason in list(unresolved.items())[:limit]]
+    if len(unresolved) > limit:
+        items.append(f"and {len(unresolved) - limit} more")
+    return ", ".join(items)
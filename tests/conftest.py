@@ -0,0 +1,44 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = ROOT / "custom_components" / "helium_hotspot"
+sys.path.insert(0, str(ROOT / "benchmarks"))  # pages.py: synthetic page builders
+sys.path.insert(0, str(ROOT))  # custom_components, for the tests that need Home Assistant
+FIXTURE = ROOT / "benchmarks" / "fixtures" / "synthetic_9982.html"
+
+
+def load_module(name: str):
+    """Load a Home Assistant-free module of the integration without importing the package."""
+    spec = importlib.util.spec_from_file_location(f"helium_hotspot_{name}", PACKAGE / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def parser():
+    return load_module("parser")
+
+
+@pytest.fixture(scope="session")
+def history():
+    return load_module("history")
+
+
+@pytest.fixture(scope="session")
+def aggregate():
+    return load_module("aggregate")
+
+
+@pytest.fixture(scope="session")
+def scheduler():
+    return load_module("scheduler")
+
+
+@pytest.fixture(scope="session")
+def adaptive():
+    return load_module("adaptive")
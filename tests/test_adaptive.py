@@ -0,0 +1,94 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+HNT = "tokens_earned_30d_hnt"
+
+
+@pytest.mark.parametrize("old, new, changed", [
+    ({HNT: 1.0}, {HNT: 1.0}, False),
+    ({HNT: 1.0}, {HNT: 1.5}, True),
+    ({HNT: 1.0}, {HNT: 1.0, "hotspot_location": "Houston, Texas"}, False),  # an entity was enabled
+    ({HNT: 1.0, "carrier_offload": "3 MB"}, {HNT: 1.0}, False),  # ... or disabled
+    ({HNT: 1.0, "carrier_offload": "3 MB"}, {HNT: 1.0, "carrier_offload": None}, True),
+    (None, {HNT: 1.0}, False),
+])
+def test_values_changed(adaptive, old, new, changed):
+    assert adaptive.values_changed(old, new) is changed
+
+
+def _simulate(adaptive, polled_adaptively, days=30, toggle_field=False):
+    """
+    One hotspot whose value changes once a day in the reward epoch (02:00-02:50 UTC).
+    Returns (polls, minutes from each change to the poll that saw it, policy).
+    """
+    policy = adaptive.AdaptivePolicy(timedelta(minutes=15), timedelta(hours=6), timedelta(hours=1))
+    rnd = random.Random(2)
+    changes = [START + timedelta(days=day, hours=2, minutes=rnd.randint(0, 50)) for day in range(days)]
+    now, polls, lags = START, 0, []
+    previous = previous_at = None
+    while now < changes[-1]:
+        polls += 1
+        value = sum(1 for c in changes if c <= now)
+        page = {HNT: value}
+        if toggle_field and now.hour >= 14:
+            page["hotspot_location"] = "Houston, Texas"  # an entity enabled every afternoon
+        if previous is not None:
+            if value != previous[HNT]:
+                lags.append((now - changes[value - 1]) / timedelta(minutes=1))
+            policy.observe("9982", previous_at, now, adaptive.values_changed(previous, page))
+        previous, previous_at = page, now
+        now = policy.next_due("9982", now) if polled_adaptively else now + timedelta(hours=1)
+    return polls, lags, policy
+
+
+def test_adaptive_polling_learns_the_reward_epoch(adaptive):
+    fixed_polls, fixed_lags, _ = _simulate(adaptive, polled_adaptively=False)
+    polls, lags, policy = _simulate(adaptive, polled_adaptively=True)
+    assert fixed_polls == 699
+    assert polls == 238  # a third of the hourly polls
+    assert len(lags) == len(fixed_lags) == 29  # every change before the last poll is seen
+    assert max(lags[-10:]) <= 15  # once learned, within one min_interval
+    assert policy.describe("9982")["model"] == "hotspot"
+    assert policy.describe("9982")["hot_hours_utc"] == [2]
+
+
+def test_wanted_fields_changing_is_not_a_value_change(adaptive):
+    polls, _, policy = _simulate(adaptive, polled_adaptively=True, toggle_field=True)
+    assert policy.describe("9982")["hot_hours_utc"] == [2]
+    assert polls == 238
+
+
+def test_next_due_without_history_uses_the_base_interval(adaptive):
+    policy = adaptive.AdaptivePolicy(timedelta(minutes=15), timedelta(hours=6), timedelta(hours=1))
+    assert policy.next_due("9982", START) == START + timedelta(hours=1)
+    assert policy.describe("9982")["model"] == "none"
+
+
+def test_fleet_counts_one_epoch_once(adaptive):
+    size = 200
+    policy = adaptive.AdaptivePolicy(timedelta(minutes=15), timedelta(hours=6), timedelta(hours=1), fleet_size=size)
+    for day in range(4):
+        epoch = START + timedelta(days=day, hours=2)
+        for i in range(size):
+            policy.observe(str(i), epoch, epoch + timedelta(hours=1), True)
+        if day < 2:
+            assert not policy.fleet.confident  # 200 hotspots in one epoch are not 200 epochs
+    assert policy.fleet.confident
+    assert policy.fleet.changes == pytest.approx(1 + 0.97 + 0.97 ** 2 + 0.97 ** 3)
+    assert policy.fleet.hot_hours() == {2}
+    # a hotspot without its own history follows the fleet: wait for the next epoch
+    now = START + timedelta(days=4, hours=10)
+    assert policy.describe("new")["model"] == "fleet"
+    assert policy.next_due("new", now) == now + timedelta(hours=6)
+
+
+def test_stored_policy_round_trip(adaptive):
+    _, _, policy = _simulate(adaptive, polled_adaptively=True, days=10)
+    restored = adaptive.AdaptivePolicy(timedelta(minutes=15), timedelta(hours=6), timedelta(hours=1))
+    restored.restore(policy.as_stored())
+    assert restored.as_stored() == policy.as_stored()
+    now = START + timedelta(days=10, hours=1)
+    assert restored.next_due("9982", now) == policy.next_due("9982", now)
@@ -0,0 +1,70 @@
+import pytest
+
+HNT = "tokens_earned_30d_hnt"
+
+
+def _page(hnt, users="4", poc=None):
+    return {HNT: hnt, "avg_daily_users": users, "proof_of_coverage_30d": poc}
+
+
+def test_add_updates_totals_means_and_ranking(aggregate):
+    fleet = aggregate.FleetAggregate(top_n=2)
+    assert fleet.update("1", _page(10.0)) == {HNT, "avg_daily_users", aggregate.TOP_KEY}
+    fleet.update("2", _page(30.5, users="1,200"))
+    changed = fleet.update("3", _page(20.25))
+    assert aggregate.TOP_KEY in changed  # 3 pushes 1 out of the top two
+    assert fleet.total(HNT) == 60.75
+    assert fleet.mean(HNT) == 20.25
+    assert fleet.total("avg_daily_users") == 1208
+    assert fleet.count(HNT) == 3
+    assert fleet.top() == [("2", 30.5), ("3", 20.25)]
+    assert fleet.top(5) == [("2", 30.5), ("3", 20.25), ("1", 10.0)]
+    assert fleet.total("proof_of_coverage_30d") is None
+    assert fleet.mean("proof_of_coverage_30d") is None
+
+
+def test_replace_moves_the_hotspot(aggregate):
+    fleet = aggregate.FleetAggregate(top_n=2)
+    for hotspot, hnt in (("1", 10.0), ("2", 30.5), ("3", 20.25)):
+        fleet.update(hotspot, _page(hnt))
+    assert fleet.update("3", _page(20.25)) == set()
+    assert fleet.update("1", _page(11.0)) == {HNT}  # still third: top two unchanged
+    assert fleet.update("1", _page(40.0)) == {HNT, aggregate.TOP_KEY}
+    assert fleet.top() == [("1", 40.0), ("2", 30.5)]
+    assert fleet.total(HNT) == 90.75
+    assert fleet.count(HNT) == 3
+
+
+def test_remove_and_missing_values(aggregate):
+    fleet = aggregate.FleetAggregate()
+    fleet.update("1", _page(10.0))
+    fleet.update("2", _page(5.0))
+    assert fleet.update("2", _page(None)) == {HNT, aggregate.TOP_KEY}  # field gone from the page
+    assert fleet.count(HNT) == 1
+    assert fleet.count("avg_daily_users") == 2
+    assert fleet.remove("1") == {HNT, "avg_daily_users", aggregate.TOP_KEY}
+    assert fleet.total(HNT) is None
+    assert fleet.top() == []
+    assert fleet.remove("unknown") == set()
+
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), "-inf", "NaN", "n/a"])
+def test_non_finite_values_are_ignored(aggregate, bad):
+    fleet = aggregate.FleetAggregate()
+    fleet.update("1", _page(10.0))
+    fleet.update("2", _page(bad))
+    assert fleet.total(HNT) == 10.0
+    assert fleet.count(HNT) == 1
+    assert fleet.top() == [("1", 10.0)]
+    fleet.update("2", _page(2.5))
+    fleet.remove("1")
+    assert fleet.total(HNT) == 2.5
+    assert fleet.mean(HNT) == 2.5
+
+
+def test_running_sums_do_not_drift(aggregate):
+    fleet = aggregate.FleetAggregate()
+    for i in range(1000):
+        fleet.update(str(i % 50), _page(round(i * 0.001, 3)))
+    expected = sum(round(i * 0.001, 3) for i in range(950, 1000))
+    assert fleet.total(HNT) == round(expected, 6)
@@ -0,0 +1,270 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+httpx = pytest.importorskip("httpx")
+
+from custom_components.helium_hotspot import fetcher  # noqa: E402
+from custom_components.helium_hotspot.client import FetchedPage  # noqa: E402
+
+URL = "https://world.helium.com/en/network/mobile/hotspot/9982"
+HNT = "tokens_earned_30d_hnt"
+PAGE = {
+    HNT: 20.4,
+    "carrier_offload": "175.18 MB",
+    "hotspot_name": "Fuzzy Birch Badger",
+    "hotspot_location": "Québec, Québec, United States",
+}
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeSite:
+    """
+    Serves one page with an ETag. Each body is a version number; its parse is PAGE with the
+    version as the HNT total. `gate`, when set, holds every download until it is opened.
+    """
+
+    def __init__(self):
+        self.version = 1
+        self.fetches = []  # conditional headers of each request
+        self.parses = []  # fields asked of each parse (None = all)
+        self.abandon = ()  # fields the next parses give up on
+        self.gate = None
+
+    async def fetch(self, headers):
+        self.fetches.append(dict(headers))
+        if self.gate is not None:
+            await self.gate.wait()
+        etag = f'"v{self.version}"'
+        status = 304 if headers.get("If-None-Match") == etag else 200
+        response = httpx.Response(status, headers={"ETag": etag}, request=httpx.Request("GET", URL))
+        return FetchedPage(response, b"" if status == 304 else str(self.version).encode())
+
+    async def parse(self, text, fields):
+        self.parses.append(fields)
+        page = {**PAGE, HNT: float(text)}
+        parsed = {k: v for k, v in page.items() if fields is None or k in fields}
+        stats = {"abandoned_fields": {f: "flight" for f in self.abandon}} if self.abandon else {}
+        return parsed, stats
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [START]
+    monkeypatch.setattr(fetcher.dt_util, "utcnow", lambda: now[0])
+    return now
+
+
+def _get(hub, site, consumer=None, fields=None, max_age=timedelta(0)):
+    return hub.async_fetch("9982", URL, site.fetch, site.parse, max_age, consumer,
+                           frozenset(fields) if fields is not None else None)
+
+
+def test_callers_share_the_fetch_in_flight(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        site.gate = asyncio.Event()
+        first = asyncio.create_task(_get(hub, site, "a", [HNT]))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_get(hub, site, "b", [HNT]))
+        await asyncio.sleep(0)
+        site.gate.set()
+        return await first, await second
+
+    first, second = asyncio.run(main())
+    assert len(site.fetches) == len(site.parses) == 1
+    assert first.metrics["outcome"] == "parsed"
+    assert second.metrics["outcome"] == "joined"
+    assert second.parsed is first.parsed
+
+
+def test_recent_result_is_shared_within_max_age(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        await _get(hub, site, "a")
+        clock[0] += timedelta(minutes=5)
+        return await _get(hub, site, "b", max_age=timedelta(minutes=10))
+
+    assert asyncio.run(main()).metrics["outcome"] == "shared"
+    assert len(site.fetches) == 1
+
+
+def test_cancelled_joiner_leaves_the_fetch_running(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        site.gate = asyncio.Event()
+        first = asyncio.create_task(_get(hub, site, "a"))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(_get(hub, site, "b"))
+        await asyncio.sleep(0)
+        joiner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await joiner
+        site.gate.set()
+        return await first
+
+    assert asyncio.run(main()).metrics["outcome"] == "parsed"
+    assert len(site.fetches) == 1
+
+
+def test_joiner_fetches_itself_when_the_starter_is_cancelled(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        site.gate = asyncio.Event()
+        first = asyncio.create_task(_get(hub, site, "a"))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(_get(hub, site, "b"))
+        await asyncio.sleep(0)
+        first.cancel()  # e.g. its entry was unloaded
+        await asyncio.sleep(0)
+        site.gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await joiner
+
+    assert asyncio.run(main()).metrics["outcome"] == "parsed"
+    assert len(site.fetches) == 2
+    assert len(site.parses) == 1
+
+
+def test_fetch_in_flight_parses_for_fields_asked_meanwhile(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        site.gate = asyncio.Event()
+        first = asyncio.create_task(_get(hub, site, "a", [HNT]))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_get(hub, site, "b", ["carrier_offload"]))
+        await asyncio.sleep(0)
+        site.gate.set()
+        return await first, await second
+
+    first, second = asyncio.run(main())
+    # the first parse started before "b" asked, but the download finished after: it covers both
+    assert site.parses == [frozenset({HNT, "carrier_offload"})]
+    assert second.metrics["outcome"] == "joined"
+
+
+def test_not_modified_reuses_the_last_parse(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        first = await _get(hub, site, "a", [HNT])
+        clock[0] += timedelta(hours=1)
+        return first, await _get(hub, site, "a", [HNT])
+
+    first, second = asyncio.run(main())
+    assert site.fetches == [{}, {"If-None-Match": '"v1"'}]
+    assert len(site.parses) == 1
+    assert second.metrics["outcome"] == "not_modified"
+    assert second.parsed is first.parsed
+    assert second.fetched_at == START + timedelta(hours=1)
+
+
+def test_no_validators_when_the_last_parse_lacks_a_wanted_field(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        await _get(hub, site, "a", [HNT])
+        # an entity was enabled: the cached parse can't stand in for the page on 304
+        return await _get(hub, site, "a", [HNT, "carrier_offload"])
+
+    result = asyncio.run(main())
+    assert site.fetches == [{}, {}]
+    assert result.metrics["outcome"] == "parsed"
+    assert result.parsed["carrier_offload"] == PAGE["carrier_offload"]
+
+
+def test_static_fields_are_carried_for_a_day(clock):
+    site = FakeSite()
+    wanted = [HNT, "hotspot_name"]
+
+    async def main():
+        hub = fetcher.FetchHub()
+        await _get(hub, site, "a", wanted)
+        site.version = 2
+        clock[0] += timedelta(hours=23)
+        carried = await _get(hub, site, "a", wanted)
+        site.version = 3
+        clock[0] += timedelta(hours=1)
+        return carried, await _get(hub, site, "a", wanted)
+
+    carried, refreshed = asyncio.run(main())
+    assert site.parses == [frozenset(wanted), frozenset({HNT}), frozenset(wanted)]
+    assert carried.parsed[HNT] == 2.0
+    assert carried.parsed["hotspot_name"] == refreshed.parsed["hotspot_name"] == PAGE["hotspot_name"]
+
+
+def test_abandoned_fields_drop_the_validators(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        site.abandon = ("hotspot_location",)
+        await _get(hub, site, "a")
+        page = hub.page("9982")
+        dropped = (page.etag, page.last_modified, page.body_hash)
+        site.abandon = ()
+        clock[0] += timedelta(hours=1)
+        return dropped, await _get(hub, site, "a")
+
+    dropped, second = asyncio.run(main())
+    assert dropped == (None, None, None)
+    # same page, but neither a 304 nor an unchanged body hash may reuse the incomplete parse
+    assert site.fetches == [{}, {}]
+    assert len(site.parses) == 2
+    assert second.metrics["outcome"] == "parsed"
+
+
+def test_unchanged_body_reuses_the_parse_without_validators(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        await _get(hub, site, "a")
+        hub.page("9982").etag = None  # a host that sends no validators
+        clock[0] += timedelta(hours=1)
+        return await _get(hub, site, "a")
+
+    assert asyncio.run(main()).metrics["outcome"] == "unchanged"
+    assert len(site.parses) == 1
+
+
+def test_seed_keeps_newer_hub_state(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        await _get(hub, site, "a")
+        hub.seed("9982", {"parsed": {HNT: 99.0}, "etag": '"old"'}, START - timedelta(hours=1))
+        return hub.page("9982")
+
+    page = asyncio.run(main())
+    assert page.etag == '"v1"'
+    assert page.parsed[HNT] == 1.0 and "hotspot_name" in page.parsed
+
+
+def test_forget_drops_an_entrys_fields(clock):
+    site = FakeSite()
+
+    async def main():
+        hub = fetcher.FetchHub()
+        await _get(hub, site, "a", [HNT])
+        await _get(hub, site, "b", ["carrier_offload"])
+        hub.forget("b")
+        return hub.page("9982").parse_fields()
+
+    assert asyncio.run(main()) == frozenset({HNT})
@@ -0,0 +1,104 @@
+import math
+import time
+
+import pytest
+
+NOW = time.time()
+HNT = "tokens_earned_30d_hnt"
+
+
+def _poll(hnt, offload="824.06 MB"):
+    return {HNT: hnt, "carrier_offload": offload, "avg_daily_users": "12"}
+
+
+def _write(store):
+    store.write(store.take_pending())
+
+
+def test_round_trip(history, tmp_path):
+    store = history.HotspotHistory(tmp_path, 30)
+    store.append("9982", NOW - 120, _poll(1.5))
+    store.append("9982", NOW - 60, _poll(2.25, offload=None))
+    store.append("77", NOW - 60, _poll(7.0))
+    _write(store)
+
+    loaded = history.HotspotHistory(tmp_path, 30)
+    assert loaded.load(["9982", "77", "404"]) == 3
+    assert loaded.window("9982", HNT, NOW - 3600) == [(NOW - 120, 1.5), (NOW - 60, 2.25)]
+    assert loaded.latest("9982", "carrier_offload") == (NOW - 120, 824.06e6)  # the newer poll had no value
+    assert loaded.value_at("9982", "avg_daily_users", NOW) == 12.0
+    assert loaded.latest("77", HNT) == (NOW - 60, 7.0)
+    assert loaded.records("404") == 0
+
+
+def test_writes_only_append_new_records(history, tmp_path):
+    store = history.HotspotHistory(tmp_path, 30)
+    store.append("9982", NOW - 120, _poll(1.0))
+    _write(store)
+    path = tmp_path / "9982.bin"
+    size = path.stat().st_size
+    store.append("9982", NOW - 60, _poll(2.0))
+    store.append("9982", NOW - 90, _poll(9.0))  # older than the last record: ignored
+    batch = store.take_pending()
+    assert [(hotspot, rewrite) for hotspot, _, rewrite in batch] == [("9982", False)]
+    store.write(batch)
+    assert path.stat().st_size == size + history.RECORD_LEN * 8
+    assert store.take_pending() == []
+
+
+@pytest.mark.parametrize("tail", [b"\x01", b"\x00" * 63], ids=["1 byte", "63 bytes"])  # a record is 64 bytes
+def test_torn_tail_is_dropped_and_rewritten(history, tmp_path, tail):
+    store = history.HotspotHistory(tmp_path, 30)
+    for i in range(3):
+        store.append("9982", NOW - 300 + i, _poll(float(i)))
+    _write(store)
+    with (tmp_path / "9982.bin").open("ab") as fh:
+        fh.write(tail)
+
+    loaded = history.HotspotHistory(tmp_path, 30)
+    assert loaded.load(["9982"]) == 3
+    loaded.append("9982", NOW, _poll(9.0))
+    batch = loaded.take_pending()
+    assert batch[0][2]  # rewritten, not appended after the torn bytes
+    loaded.write(batch)
+
+    again = history.HotspotHistory(tmp_path, 30)
+    assert again.load(["9982"]) == 4
+    assert [v for _, v in again.window("9982", HNT, 0)] == [0.0, 1.0, 2.0, 9.0]
+
+
+def test_unreadable_file_is_ignored_and_replaced(history, tmp_path):
+    (tmp_path / "9982.bin").write_bytes(b"not a history file")
+    store = history.HotspotHistory(tmp_path, 30)
+    assert store.load(["9982"]) == 0
+    store.append("9982", NOW, _poll(3.0))
+    _write(store)
+    assert history.HotspotHistory(tmp_path, 30).load(["9982"]) == 1
+
+
+def test_load_drops_records_past_retention(history, tmp_path):
+    store = history.HotspotHistory(tmp_path, 30)
+    store.append("9982", NOW - 40 * 86400, _poll(1.0))
+    store.append("9982", NOW - 86400, _poll(2.0))
+    _write(store)
+    loaded = history.HotspotHistory(tmp_path, 30)
+    assert loaded.load(["9982"]) == 1
+    assert loaded.change("9982", HNT, 86400 * 2, NOW) is None  # nothing that old is kept
+    assert loaded.latest("9982", HNT) == (NOW - 86400, 2.0)
+
+
+def test_to_number(history):
+    assert history.to_number("1,234.5 kB") == 1234.5e3
+    assert history.to_number(4) == 4.0
+    assert math.isnan(history.to_number("n/a"))
+    assert math.isnan(history.to_number(None))
+
+
+def test_remove_files(history, tmp_path):
+    directory = tmp_path / "helium_hotspot" / "history" / "entry"
+    store = history.HotspotHistory(directory, 30)
+    store.append("9982", NOW, _poll(1.0))
+    _write(store)
+    (directory / "9982.tmp").write_bytes(b"")
+    history.HotspotHistory(directory, 0).remove_files(2)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,97 @@
+import re
+
+import pytest
+
+from conftest import FIXTURE
+from pages import hotspot_page, hotspot_values
+
+NAME_DIV = '<div class="text-3xl font-semibold">Raspy Cedar Parakeet</div>'
+
+
+@pytest.mark.parametrize("after_name", [
+    '<div>Last seen: 3h ago, online</div><div>Houston, Texas</div>',
+    '<div class="text-sm">Houston, Texas</div>',
+])
+def test_location_skips_non_location_divs(parser, after_name):
+    raw = f"<html><body>{NAME_DIV}{after_name}</body></html>"
+    assert parser.extract_anchored_fields(raw)["hotspot_location"] == "Houston, Texas"
+    assert parser.parse_hotspot_html(raw)["hotspot_location"] == "Houston, Texas"
+
+
+def test_corpus_path_names_the_variant_that_matched(parser):
+    # values too far from their labels for the anchor windows, no flight payload: found by the
+    # whole-page regexes in the raw page, while the escapes give the page three distinct variants
+    gap = " " * 400
+    raw = (
+        '<p>Fish &amp; Chips</p><script>var s = "a\\\\"b";</script>'
+        f'{{"label":"Proof Of Coverage",{gap}"value":"1.5"}}'
+        f'{{"label":"Data Transfer",{gap}"value":"0.25"}}'
+    )
+    stats = {}
+    parsed = parser.parse_hotspot_html(raw, stats)
+    assert parsed["tokens_earned_30d_hnt"] == 1.75
+    assert stats["paths"]["tokens_earned_30d_hnt"] == "corpus:raw"
+    assert stats["paths"]["hotspot_name"] == "none"
+
+
+def test_corpus_variants_are_built_lazily(parser):
+    corpus = parser.build_corpus('<p>Fish &amp; Chips</p>')
+    assert parser.extract_tokens_hnt(corpus) == (None, None, None, "none")
+    corpus = parser.build_corpus('{"label":"Proof Of Coverage","value":"1"}{"label":"Data Transfer","value":"2"}&amp;')
+    assert parser.extract_tokens_hnt(corpus)[3] == "sum"
+    assert len(corpus._variants) == 1
+
+
+def test_hotspot_page_markers(parser):
+    page = FIXTURE.read_text(encoding="utf-8")
+    assert parser.has_hotspot_data(page)
+    # the title format is not what makes a hotspot page
+    assert parser.has_hotspot_data(re.sub(r"<title>[^<]*</title>", "<title>Helium World</title>", page))
+    assert not parser.has_hotspot_data("<html><head><title>Helium World</title></head><body>Hotspot not found</body></html>")
+
+
+def test_anchored_tokens_display_skips_the_whole_page_scan(parser):
+    values = hotspot_values("9982")
+    raw = hotspot_page("9982", values=values).replace("Proof Of Coverage", "Coverage Rewards")
+    stats = {}
+    result = parser.parse_hotspot_html(raw, stats)
+    assert result["proof_of_coverage_30d"] is None
+    assert result["tokens_earned_30d_hnt"] == values["tokens_earned_30d_hnt"]
+    assert stats["hnt_source"] == "display"
+    assert "extract_tokens_hnt" not in stats["parse_ms"]
+
+
+FLIGHT_STREAM = (
+    '1:HL["/app.css","style"]\n'
+    '2:T19,Québec\n3:{"label":"x"}\n\n'  # 25 bytes of text that look like a row
+    '4:{"label":"Proof Of Coverage","value":"1.5"}\n'
+    '5:["$","span",null,{"children":"Übersicht"}]\n'
+    '6:{"label":"Data Transfer","value":"0.25"}'
+)
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 17, len(FLIGHT_STREAM)])
+def test_flight_rows_span_chunks(parser, size):
+    chunks = [FLIGHT_STREAM[i:i + size] for i in range(0, len(FLIGHT_STREAM), size)]
+    assert list(parser.iter_flight_rows(chunks, parser.FLIGHT_ROW_MARKERS)) == [
+        {"label": "Proof Of Coverage", "value": "1.5"},
+        {"label": "Data Transfer", "value": "0.25"},
+    ]
+    assert len(list(parser.iter_flight_rows(chunks))) == 3
+
+
+def test_flight_scan_stops_once_wanted_fields_are_found(parser, monkeypatch):
+    raw = hotspot_page("9982", pad_bytes=64 * 1024)
+    chunks = list(parser.iter_flight_chunks(raw))
+    read = []
+
+    def counted(_raw):
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    monkeypatch.setattr(parser, "iter_flight_chunks", counted)
+    found = parser.extract_flight_fields(raw, ("avg_daily_data", "avg_daily_users"))
+    # the og:description row leads the stream; the rendered tree comes after the padding
+    assert set(found) == {"avg_daily_data", "avg_daily_users"}
+    assert len(read) < len(chunks) / 10
@@ -0,0 +1,102 @@
+"""Every extraction path (anchors, flight payload, whole-page fallbacks) must give the same results."""
+import re
+
+import pytest
+
+from conftest import FIXTURE
+from pages import hotspot_page
+
+HNT = "tokens_earned_30d_hnt"
+PAGE_77 = hotspot_page("77")
+
+EXPECTED_9982 = {
+    "proof_of_coverage_30d": 16.543,
+    "data_transfer_30d": 3.857,
+    "tokens_earned_30d_hnt": 20.4,
+    "hnt_source": "sum",
+    "carrier_offload": "175.18 MB",
+    "helium_mobile": "887.61 kB",
+    "avg_daily_data": "7.18 GB",
+    "avg_daily_users": "22",
+    "hotspot_name": "Fuzzy Birch Badger",
+    "hotspot_location": "Québec, Québec, United States",
+}
+EXPECTED_77 = {
+    "proof_of_coverage_30d": 11.128,
+    "data_transfer_30d": 0.333,
+    "tokens_earned_30d_hnt": 11.461,
+    "hnt_source": "sum",
+    "carrier_offload": "378.83 MB",
+    "helium_mobile": "698.45 kB",
+    "avg_daily_data": "3.03 GB",
+    "avg_daily_users": "90",
+    "hotspot_name": "Fuzzy Aspen Otter",
+    "hotspot_location": "Seattle, Washington, United States",
+}
+EXPECTED_5 = {
+    "proof_of_coverage_30d": 10.774,
+    "data_transfer_30d": 4.656,
+    "tokens_earned_30d_hnt": 15.43,
+    "hnt_source": "sum",
+    "carrier_offload": "711.69 MB",
+    "helium_mobile": "573.22 kB",
+    "avg_daily_data": "1.02 GB",
+    "avg_daily_users": "74",
+    "hotspot_name": "Raspy Willow Gecko",
+    "hotspot_location": "Miami, Florida, United States",
+}
+
+
+def _without_ssr(page: str) -> str:
+    return re.sub(r"<main>.*?</main>", "<main></main>", page)
+
+
+def _unescaped_flight(page: str) -> str:
+    # flight rows inlined as plain JSON instead of escaped inside the push() strings
+    return page.replace('\\"', '"')
+
+
+CASES = {
+    "fixture": (FIXTURE.read_text(encoding="utf-8"), EXPECTED_9982),
+    "synthetic": (PAGE_77, EXPECTED_77),
+    "synthetic_padded": (hotspot_page("5", pad_bytes=256 * 1024), EXPECTED_5),
+    # name and location only in the flight payload
+    "no_ssr": (_without_ssr(PAGE_77), EXPECTED_77),
+    "unescaped_flight": (_unescaped_flight(PAGE_77), EXPECTED_77),
+    "html_escaped_flight": (PAGE_77.replace('\\"', "&quot;"), EXPECTED_77),
+    # neither server-rendered markup nor a decodable payload names the hotspot
+    "unescaped_flight_no_ssr": (_without_ssr(_unescaped_flight(PAGE_77)),
+                                {**EXPECTED_77, "hotspot_name": None, "hotspot_location": None}),
+    # no Data Transferred line items; the avg stats still come from the flight copy of the og:description
+    "missing_fields": (
+        re.sub(r'<meta property="og:description"[^>]*>', "", PAGE_77)
+        .replace("Carrier Offload", "Backhaul").replace("Helium Mobile", "Cellular"),
+        {**EXPECTED_77, "carrier_offload": None, "helium_mobile": None},
+    ),
+}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_parse_matches_pinned_result(parser, name):
+    raw, expected = CASES[name]
+    assert parser.parse_hotspot_html(raw) == expected
+    assert parser.parse_batch([raw])[0][0] == expected
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_flight_payload_agrees_with_result(parser, name):
+    raw, expected = CASES[name]
+    flight = parser.extract_flight_fields(raw)
+    assert {k: v for k, v in flight.items() if k in expected} == {k: expected[k] for k in flight if k in expected}
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("fields", [
+    ("tokens_earned_30d_hnt",),
+    ("carrier_offload", "helium_mobile"),
+    ("avg_daily_users", "hotspot_location"),
+])
+def test_field_subset_matches_full_parse(parser, name, fields):
+    raw, expected = CASES[name]
+    result = parser.parse_hotspot_html(raw, fields=fields)
+    assert result == {f: expected[f] for f in expected if f in fields or f == "hnt_source" and HNT in fields}
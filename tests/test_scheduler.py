@@ -0,0 +1,173 @@
+import asyncio
+import selectors
+import types
+
+import httpx
+import pytest
+
+
+class _JumpingSelector(selectors.DefaultSelector):
+    def __init__(self, loop):
+        super().__init__()
+        self._loop = loop
+
+    def select(self, timeout=None):
+        # nothing is ready before the next timer: jump to it instead of waiting
+        if timeout:
+            self._loop.now += timeout
+        return super().select(0)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop on a fake clock: asyncio.sleep() returns at once, with the clock moved on."""
+
+    def __init__(self):
+        self.now = 0.0
+        super().__init__(_JumpingSelector(self))
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def run(scheduler, monkeypatch):
+    """Run a coroutine on the fake clock, with the scheduler's time and jitter following it."""
+    loop = VirtualTimeLoop()
+    monkeypatch.setattr(scheduler, "time", types.SimpleNamespace(monotonic=loop.time, time=lambda: 1e9 + loop.time()))
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: high)
+    yield loop.run_until_complete
+    loop.close()
+
+
+class FakeSite:
+    """Answers fetches from a script of responses (an int status, a (status, headers) pair or an exception)."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = []
+
+    def fetch(self, name="page"):
+        async def fetch():
+            self.calls.append((name, round(asyncio.get_running_loop().time(), 6)))
+            answer = self.script.pop(0) if self.script else 200
+            if isinstance(answer, Exception):
+                raise answer
+            status, headers = answer if isinstance(answer, tuple) else (answer, {})
+            return httpx.Response(status, headers=headers)
+        return fetch
+
+
+def test_bucket_paces_waiters_without_holding_the_lock(scheduler, run):
+    async def main():
+        bucket = scheduler.TokenBucket(rate=2, burst=1)
+        loop = asyncio.get_running_loop()
+        done = []
+
+        async def take(i):
+            await bucket.acquire()
+            done.append((i, loop.time()))
+
+        tasks = [asyncio.create_task(take(i)) for i in range(5)]
+        await asyncio.sleep(0.1)
+        assert not bucket._lock.locked()  # the waiters sleep outside it
+        await asyncio.gather(*tasks)
+        return done
+
+    assert run(main()) == [(0, 0.0), (1, 0.5), (2, 1.0), (3, 1.5), (4, 2.0)]
+
+
+def test_cancelled_waiter_returns_its_token(scheduler, run):
+    async def main():
+        bucket = scheduler.TokenBucket(rate=1, burst=1)
+        await bucket.acquire()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.5)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await bucket.acquire()
+        return asyncio.get_running_loop().time()
+
+    assert run(main()) == 1.0  # not 2.0: the cancelled reservation was handed back
+
+
+def test_retry_after_is_honoured(scheduler, run):
+    site = FakeSite((429, {"Retry-After": "7"}), 200)
+
+    async def main():
+        fetcher = scheduler.FetchScheduler(4, 1000, base_backoff=0.5)
+        return await fetcher.run(site.fetch())
+
+    assert run(main()).status_code == 200
+    assert site.calls == [("page", 0.0), ("page", 7.5)]  # Retry-After plus at most base_backoff of jitter
+
+
+def test_throttling_pauses_every_request(scheduler, run):
+    site = FakeSite((503, {"Retry-After": "5"}), 200, 200)
+
+    async def main():
+        fetcher = scheduler.FetchScheduler(4, 1000, base_backoff=0)
+
+        async def later():
+            await asyncio.sleep(1)
+            return await fetcher.run(site.fetch("other"))
+
+        return await asyncio.gather(fetcher.run(site.fetch("throttled")), later())
+
+    assert [r.status_code for r in run(main())] == [200, 200]
+    # "other" arrived during the pause and waited for it too
+    assert sorted(site.calls, key=lambda call: (call[1], call[0])) == [
+        ("throttled", 0.0), ("other", 5.0), ("throttled", 5.0)]
+
+
+def test_gives_up_with_the_last_response(scheduler, run):
+    site = FakeSite(429, 429, 503)
+
+    async def main():
+        fetcher = scheduler.FetchScheduler(1, 8, max_retries=2, base_backoff=1.0)
+        result = await fetcher.run(site.fetch())
+        return result, fetcher._bucket.rate
+
+    result, rate = run(main())
+    assert result.status_code == 503
+    # no Retry-After: exponential backoff (1 s, then 2 s) after each throttled answer
+    assert [t for _, t in site.calls] == [0.0, 1.0, 3.0]
+    assert rate == 1.0  # halved three times
+
+
+def test_transport_errors_are_retried_then_raised(scheduler, run):
+    site = FakeSite(*[httpx.ConnectError("refused")] * 3)
+
+    async def main():
+        fetcher = scheduler.FetchScheduler(1, 1000, max_retries=2, base_backoff=1.0)
+        await fetcher.run(site.fetch())
+
+    with pytest.raises(httpx.ConnectError):
+        run(main())
+    assert len(site.calls) == 3
+
+
+def test_rate_recovers_after_success(scheduler, run):
+    site = FakeSite(429, *[200] * 10)
+
+    async def main():
+        fetcher = scheduler.FetchScheduler(1, 10, base_backoff=0)
+        rates = []
+        for _ in range(6):
+            await fetcher.run(site.fetch())
+            rates.append(fetcher._bucket.rate)
+        return rates
+
+    assert run(main()) == [6.0, 7.0, 8.0, 9.0, 10.0, 10.0]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("120", 120.0),
+    (" 1.5 ", 1.5),
+    ("-3", 0.0),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),  # already past
+    ("soon", None),
+    (None, None),
+])
+def test_parse_retry_after(scheduler, value, expected):
+    assert scheduler.parse_retry_after(value) == expected
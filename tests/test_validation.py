@@ -0,0 +1,35 @@
+import asyncio
+import re
+
+import pytest
+
+pytest.importorskip("homeassistant")
+httpx = pytest.importorskip("httpx")
+
+from conftest import FIXTURE  # noqa: E402
+from custom_components.helium_hotspot.validation import NOT_FOUND, async_validate_hotspots  # noqa: E402
+
+GENERIC_PAGE = "<html><head><title>Helium World</title></head><body>Hotspot not found</body></html>"
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    hotspot = request.url.path.rsplit("/", 1)[-1]
+    if hotspot == "9982":
+        # a recorded-style page whose title does not carry the ID
+        page = re.sub(r"<title>[^<]*</title>", "<title>Fuzzy Birch Badger</title>", FIXTURE.read_text(encoding="utf-8"))
+        return httpx.Response(200, text=page)
+    if hotspot == "404":
+        return httpx.Response(404)
+    if hotspot == "moved":
+        return httpx.Response(302, headers={"location": "/not-found"})
+    return httpx.Response(200, text=GENERIC_PAGE)
+
+
+def test_probe_accepts_hotspot_pages_and_rejects_the_rest():
+    async def run():
+        transport = httpx.MockTransport(_handler)
+        async with httpx.AsyncClient(transport=transport, follow_redirects=True) as client:
+            return await async_validate_hotspots(client, ["9982", "404", "moved", "1234"],
+                                                 "https://world.test/hotspot/{hotspot}")
+
+    assert asyncio.run(run()) == {"404": NOT_FOUND, "moved": NOT_FOUND, "1234": NOT_FOUND}